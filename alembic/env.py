@@ -1,5 +1,4 @@
 from logging.config import fileConfig
-import os
 
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
@@ -8,9 +7,15 @@ from alembic import context
 
 from dotenv import load_dotenv
 
+from app.core.config import settings
 from app.database.base import Base
+from app.database.pool import build_database_url
 
+from app.models.task_action_rollup_model import TaskActionRollup
+from app.models.task_archive_model import TaskArchive
+from app.models.task_counter_model import TaskCounter
 from app.models.task_model import Task
+from app.models.task_statistics_archive_model import TaskStatisticsArchive
 from app.models.task_statistics_model import TaskStatistic
 
 
@@ -26,14 +31,7 @@ if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
 # Set the SQLAlchemy URL dynamically from environment variables
-db_url = (
-    f"mysql+pymysql://{os.getenv('MYSQL_USER', 'user')}:"
-    f"{os.getenv('MYSQL_PASSWORD', 'password')}@"
-    f"{os.getenv('DB_HOST', 'localhost')}/"
-    f"{os.getenv('MYSQL_DATABASE', 'mydb')}"
-)
-
-print(db_url)
+db_url = build_database_url(settings)
 
 # Override the sqlalchemy.url in the alembic.ini
 config.set_main_option('sqlalchemy.url', db_url)
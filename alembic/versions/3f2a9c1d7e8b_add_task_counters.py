@@ -0,0 +1,46 @@
+"""Add task counters summary table
+
+Revision ID: 3f2a9c1d7e8b
+Revises: b4d60b0e524c
+Create Date: 2026-10-18 09:12:41.417356
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2a9c1d7e8b'
+down_revision: Union[str, None] = 'b4d60b0e524c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('task_counters',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('total_tasks', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('completed_tasks', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('modified_tasks', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('deleted_tasks', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('reconciled_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    # seed the summary row from the existing data
+    op.execute("""
+        INSERT INTO task_counters (id, total_tasks, completed_tasks, modified_tasks, deleted_tasks, reconciled_at)
+        SELECT
+            1,
+            (SELECT COUNT(*) FROM tasks WHERE is_deleted = false),
+            (SELECT COUNT(*) FROM tasks WHERE is_deleted = false AND status = 'completed'),
+            (SELECT COUNT(*) FROM task_statistics WHERE action = 'modified'),
+            (SELECT COUNT(*) FROM task_statistics WHERE action = 'deleted'),
+            CURRENT_TIMESTAMP
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('task_counters')
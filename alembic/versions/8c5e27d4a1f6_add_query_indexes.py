@@ -0,0 +1,41 @@
+"""Add indexes matching the list, count and actions queries
+
+Revision ID: 8c5e27d4a1f6
+Revises: 3f2a9c1d7e8b
+Create Date: 2026-10-18 11:40:05.118230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c5e27d4a1f6'
+down_revision: Union[str, None] = '3f2a9c1d7e8b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_tasks_is_deleted_id', 'tasks', ['is_deleted', 'id'], unique=False)
+    op.create_index('ix_tasks_is_deleted_status', 'tasks', ['is_deleted', 'status'], unique=False)
+    op.create_index('ix_task_statistics_action_at', 'task_statistics', ['action_at'], unique=False)
+    op.create_index('ix_task_statistics_action_action_at', 'task_statistics', ['action', 'action_at'], unique=False)
+    op.create_index('ix_task_statistics_task_id_action_at', 'task_statistics', ['task_id', 'action_at'], unique=False)
+
+    # the primary keys are already indexed
+    op.drop_index('ix_tasks_id', table_name='tasks')
+    op.drop_index('ix_task_statistics_id', table_name='task_statistics')
+
+
+def downgrade() -> None:
+    op.create_index('ix_task_statistics_id', 'task_statistics', ['id'], unique=False)
+    op.create_index('ix_tasks_id', 'tasks', ['id'], unique=False)
+
+    op.drop_index('ix_task_statistics_task_id_action_at', table_name='task_statistics')
+    op.drop_index('ix_task_statistics_action_action_at', table_name='task_statistics')
+    op.drop_index('ix_task_statistics_action_at', table_name='task_statistics')
+    op.drop_index('ix_tasks_is_deleted_status', table_name='tasks')
+    op.drop_index('ix_tasks_is_deleted_id', table_name='tasks')
@@ -0,0 +1,29 @@
+"""Add change sequence to tasks for incremental sync
+
+Revision ID: a9d3f6c1b274
+Revises: e5b8c2f7a913
+Create Date: 2026-10-18 22:10:37.551903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d3f6c1b274'
+down_revision: Union[str, None] = 'e5b8c2f7a913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # existing tasks start at 0 and are all returned by a first sync
+    op.add_column('tasks', sa.Column('change_seq', sa.BigInteger(), server_default='0', nullable=False))
+    op.create_index('ix_tasks_change_seq_id', 'tasks', ['change_seq', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_change_seq_id', table_name='tasks')
+    op.drop_column('tasks', 'change_seq')
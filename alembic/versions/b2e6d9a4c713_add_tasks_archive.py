@@ -0,0 +1,43 @@
+"""Add the tasks_archive table and the purge watermark of the task counters
+
+Revision ID: b2e6d9a4c713
+Revises: f3b8a2d6c415
+Create Date: 2026-10-19 02:14:36.509127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2e6d9a4c713'
+down_revision: Union[str, None] = 'f3b8a2d6c415'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('tasks_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('status', sa.Enum('pending', 'completed', name='taskstatusenum'), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('is_deleted', sa.Boolean(), nullable=False),
+    sa.Column('change_seq', sa.BigInteger(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_tasks_archive_archived_at', 'tasks_archive', ['archived_at'], unique=False)
+
+    op.add_column('task_counters', sa.Column('purged_change_seq', sa.BigInteger(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('task_counters', 'purged_change_seq')
+
+    op.drop_index('ix_tasks_archive_archived_at', table_name='tasks_archive')
+    op.drop_table('tasks_archive')
@@ -0,0 +1,35 @@
+"""Add hourly and daily task action rollups
+
+Revision ID: c7e1d4a8b592
+Revises: a9d3f6c1b274
+Create Date: 2026-10-18 23:41:08.204517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e1d4a8b592'
+down_revision: Union[str, None] = 'a9d3f6c1b274'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # filled from the existing actions by `python -m app.jobs.backfill_rollups`
+    op.create_table('task_action_rollups',
+    sa.Column('bucket', sa.Enum('hour', 'day', name='rollupbucketenum'), nullable=False),
+    sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('created', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('modified', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('deleted', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('completed', sa.Integer(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('bucket', 'bucket_start')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('task_action_rollups')
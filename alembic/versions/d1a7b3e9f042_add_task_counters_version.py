@@ -0,0 +1,26 @@
+"""Add write version to task counters
+
+Revision ID: d1a7b3e9f042
+Revises: 8c5e27d4a1f6
+Create Date: 2026-10-18 13:05:52.640117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1a7b3e9f042'
+down_revision: Union[str, None] = '8c5e27d4a1f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('task_counters', sa.Column('version', sa.BigInteger(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('task_counters', 'version')
@@ -0,0 +1,30 @@
+"""Add indexes for the task list filters, date sorting and full-text search
+
+Revision ID: e5b8c2f7a913
+Revises: d1a7b3e9f042
+Create Date: 2026-10-18 21:05:12.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b8c2f7a913'
+down_revision: Union[str, None] = 'd1a7b3e9f042'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_tasks_is_deleted_created_at', 'tasks', ['is_deleted', 'created_at'], unique=False)
+    op.create_index('ix_tasks_is_deleted_updated_at', 'tasks', ['is_deleted', 'updated_at'], unique=False)
+    op.create_index('ix_tasks_title_description', 'tasks', ['title', 'description'], unique=False, mysql_prefix='FULLTEXT')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_title_description', table_name='tasks')
+    op.drop_index('ix_tasks_is_deleted_updated_at', table_name='tasks')
+    op.drop_index('ix_tasks_is_deleted_created_at', table_name='tasks')
@@ -0,0 +1,99 @@
+"""Partition task_statistics by month and add the archives table
+
+Revision ID: f3b8a2d6c415
+Revises: c7e1d4a8b592
+Create Date: 2026-10-19 00:37:52.118094
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8a2d6c415'
+down_revision: Union[str, None] = 'c7e1d4a8b592'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Months partitioned ahead of the current one, app.jobs.maintain_partitions creates the next ones
+FUTURE_MONTHS = 3
+
+
+def _add_months(value: datetime, months: int) -> datetime:
+    month = value.month - 1 + months
+    return value.replace(year=value.year + month // 12, month=month % 12 + 1)
+
+
+def _monthly_partitions() -> str:
+    current = datetime.now(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+
+    # one partition per month since the oldest action (the current month when generating SQL offline)
+    month = current
+    if not context.is_offline_mode():
+        oldest = op.get_bind().execute(sa.text("SELECT MIN(action_at) FROM task_statistics")).scalar()
+        if oldest is not None:
+            month = min(oldest.replace(day=1, hour=0, minute=0, second=0, microsecond=0), current)
+
+    definitions = []
+    while month < _add_months(current, FUTURE_MONTHS + 1):
+        upper_bound = _add_months(month, 1)
+        definitions.append(f"PARTITION p{month:%Y%m} VALUES LESS THAN ('{upper_bound:%Y-%m-%d %H:%M:%S}')")
+        month = upper_bound
+    definitions.append("PARTITION p_future VALUES LESS THAN (MAXVALUE)")
+
+    return ",\n            ".join(definitions)
+
+
+def upgrade() -> None:
+    op.create_table('task_statistics_archives',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('partition_name', sa.String(length=64), nullable=False),
+    sa.Column('range_start', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('range_end', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('row_count', sa.Integer(), nullable=False),
+    sa.Column('created_count', sa.Integer(), nullable=False),
+    sa.Column('modified_count', sa.Integer(), nullable=False),
+    sa.Column('deleted_count', sa.Integer(), nullable=False),
+    sa.Column('path', sa.String(length=1024), nullable=False),
+    sa.Column('format', sa.String(length=16), nullable=False),
+    sa.Column('archived_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('partition_name')
+    )
+
+    if context.get_context().dialect.name != "mysql":
+        return
+
+    # partitioned tables cannot have foreign keys, and the partitioning column
+    # must be part of every unique key, the primary key included
+    op.drop_constraint('task_statistics_ibfk_1', 'task_statistics', type_='foreignkey')
+    op.execute("UPDATE task_statistics SET action_at = CURRENT_TIMESTAMP WHERE action_at IS NULL")
+    op.alter_column('task_statistics', 'action_at',
+               existing_type=sa.DateTime(timezone=True),
+               nullable=False,
+               existing_server_default=sa.text('CURRENT_TIMESTAMP'))
+    op.execute("ALTER TABLE task_statistics DROP PRIMARY KEY, ADD PRIMARY KEY (id, action_at)")
+
+    # rebuilds the table, plan for the copy time on large tables
+    op.execute(f"""
+        ALTER TABLE task_statistics PARTITION BY RANGE COLUMNS(action_at) (
+            {_monthly_partitions()}
+        )
+    """)
+
+
+def downgrade() -> None:
+    if context.get_context().dialect.name == "mysql":
+        # archived actions are not restored
+        op.execute("ALTER TABLE task_statistics REMOVE PARTITIONING")
+        op.execute("ALTER TABLE task_statistics DROP PRIMARY KEY, ADD PRIMARY KEY (id)")
+        op.alter_column('task_statistics', 'action_at',
+                   existing_type=sa.DateTime(timezone=True),
+                   nullable=True,
+                   existing_server_default=sa.text('CURRENT_TIMESTAMP'))
+        op.create_foreign_key('task_statistics_ibfk_1', 'task_statistics', 'tasks', ['task_id'], ['id'])
+
+    op.drop_table('task_statistics_archives')
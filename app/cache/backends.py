@@ -0,0 +1,252 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+class CacheBackend:
+    """
+    Interface of the key/value stores behind the read-through caches
+    """
+
+    def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any):
+        raise NotImplementedError
+
+    def delete(self, keys: Iterable[str]):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def get_versioned(self, key: str) -> Tuple[Optional[Any], Optional[int]]:
+        """
+        Value stored with `set_versioned` and the version to store it again
+        with, None for the stores private to the process which need none
+        """
+        return self.get(key), None
+
+    def set_versioned(self, key: str, value: Any, version: Optional[int]):
+        """
+        Store a value read under `version`, it is not returned by
+        `get_versioned` if the key was deleted since that version was read
+        """
+        self.set(key, value)
+
+
+class NullCacheBackend(CacheBackend):
+    """
+    Backend that stores nothing, used to disable a cache
+    """
+
+    def get(self, key: str) -> Optional[Any]:
+        return None
+
+    def set(self, key: str, value: Any):
+        pass
+
+    def delete(self, keys: Iterable[str]):
+        pass
+
+    def clear(self):
+        pass
+
+
+class LRUCacheBackend(CacheBackend):
+    """
+    In-process LRU cache bounded by number of entries and entry age
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 30.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, keys: Iterable[str]):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Cache shared by all worker processes, stored in Redis as JSON.
+
+    Works with any client exposing the `get`/`mget`/`set(ex=)`/`delete`/
+    `incr`/`expire`/`scan_iter`/`pipeline` subset of the redis-py API, such
+    as `FakeRedis` below for local runs.
+
+    Deleting a key also increments its version. Versioned entries hold the
+    version read before their value was loaded, and are ignored once the
+    current version differs, so a worker whose load overlapped a write on
+    another worker cannot put the old value back for everyone. Versions are
+    kept `VERSION_TTL_FACTOR` times longer than the entries.
+    """
+
+    VERSION_TTL_FACTOR = 10
+
+    def __init__(self, client, ttl: float = 30.0, prefix: str = "tasks-backend:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _version_key(self, key: str) -> str:
+        return f"{self.prefix}version:{key}"
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any):
+        self.client.set(self.prefix + key, json.dumps(value, default=str), ex=max(1, int(self.ttl)))
+
+    def delete(self, keys: Iterable[str]):
+        keys = list(keys)
+        if not keys:
+            return
+
+        version_ttl = max(1, int(self.ttl)) * self.VERSION_TTL_FACTOR
+        pipeline = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipeline.incr(self._version_key(key))
+            pipeline.expire(self._version_key(key), version_ttl)
+        pipeline.delete(*(self.prefix + key for key in keys))
+        pipeline.execute()
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+    def get_versioned(self, key: str) -> Tuple[Optional[Any], Optional[int]]:
+        raw_version, raw = self.client.mget(self._version_key(key), self.prefix + key)
+        version = int(raw_version) if raw_version is not None else 0
+        if raw is None:
+            return None, version
+
+        entry = json.loads(raw)
+        if entry['version'] != version:
+            return None, version
+        return entry['value'], version
+
+    def set_versioned(self, key: str, value: Any, version: Optional[int]):
+        self.set(key, {'version': version, 'value': value})
+
+
+class FakeRedis:
+    """
+    Minimal in-memory stand-in for a redis-py client
+    """
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[Optional[float], bytes]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+
+            return value
+
+    def mget(self, *keys: str) -> List[Optional[bytes]]:
+        return [self.get(key) for key in keys]
+
+    def set(self, key: str, value, ex: Optional[int] = None):
+        if isinstance(value, str):
+            value = value.encode()
+
+        with self._lock:
+            self._data[key] = (time.monotonic() + ex if ex else None, value)
+        return True
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            return sum(1 for key in keys if self._data.pop(key, None) is not None)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            expires_at, value = self._data.get(key, (None, b"0"))
+            if expires_at is not None and expires_at <= time.monotonic():
+                expires_at, value = None, b"0"
+
+            value = str(int(value) + 1).encode()
+            self._data[key] = (expires_at, value)
+            return int(value)
+
+    def expire(self, key: str, seconds: int) -> bool:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False
+
+            self._data[key] = (time.monotonic() + seconds, entry[1])
+            return True
+
+    def pipeline(self, transaction: bool = True) -> "FakePipeline":
+        return FakePipeline(self)
+
+    def scan_iter(self, match: str = "*"):
+        prefix = match.rstrip("*")
+        with self._lock:
+            keys = [key for key in self._data if key.startswith(prefix)]
+        return iter(keys)
+
+
+class FakePipeline:
+    """
+    Commands queued on a `FakeRedis` and run by `execute`
+    """
+
+    def __init__(self, client: FakeRedis):
+        self.client = client
+        self._commands: List[Tuple[str, tuple]] = []
+
+    def __getattr__(self, name: str):
+        def queue(*args):
+            self._commands.append((name, args))
+            return self
+        return queue
+
+    def execute(self) -> List[Any]:
+        commands, self._commands = self._commands, []
+        return [getattr(self.client, name)(*args) for name, args in commands]
@@ -0,0 +1,48 @@
+import threading
+import time
+from typing import Callable, Dict, Tuple
+
+from app.core.config import settings
+
+
+class CountCache:
+    """
+    Thread-safe cache of row counts with a TTL.
+
+    Writes invalidate the whole cache. A count loaded while an invalidation
+    happens is returned to its caller but not stored, so a stale value never
+    outlives the write that made it stale. Other worker processes keep their
+    cached counts until the TTL expires.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[float, int]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key: str, loader: Callable[[], int]) -> int:
+        if self.ttl <= 0:
+            return loader()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+            generation = self._generation
+
+        value = loader()
+
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = (time.monotonic() + self.ttl, value)
+
+        return value
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+
+count_cache = CountCache(ttl=settings.COUNT_CACHE_TTL)
@@ -0,0 +1,107 @@
+import asyncio
+from typing import Any, Dict, Optional, Tuple
+
+from app.cache.backends import CacheBackend, FakeRedis, LRUCacheBackend, NullCacheBackend, RedisCacheBackend
+from app.core.config import Settings, settings
+
+
+class IdempotencyKeyConflictError(Exception):
+    """
+    Raised when an Idempotency-Key is sent again with a different request
+    """
+
+
+class IdempotencyKeyInProgressError(Exception):
+    """
+    Raised when the request holding an Idempotency-Key does not finish in time
+    """
+
+
+class IdempotencyStore:
+    """
+    Responses of the requests sent with an Idempotency-Key, and the requests
+    still in flight in this process.
+
+    Responses are kept in a bounded backend with a TTL, together with a
+    fingerprint of their request so a key reused for another request is
+    rejected. A duplicate arriving while the first request runs waits for
+    its response instead of executing again. Only the event loop uses the
+    in-flight table, so it needs no lock.
+    """
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self._in_flight: Dict[str, Tuple[str, asyncio.Future]] = {}
+
+    @staticmethod
+    def _key(idempotency_key: str) -> str:
+        return f"idempotency:{idempotency_key}"
+
+    async def begin(self, idempotency_key: str, fingerprint: str, timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        Get the response to replay for the key, or None when the caller has
+        to execute the request and then call `finish`
+
+        Raises:
+            IdempotencyKeyConflictError: if the key was used for a different request
+            IdempotencyKeyInProgressError: if the request in flight takes longer than `timeout` seconds
+        """
+        while True:
+            in_flight = self._in_flight.get(idempotency_key)
+            if in_flight is None:
+                stored = self.backend.get(self._key(idempotency_key))
+                if stored is not None:
+                    if stored['fingerprint'] != fingerprint:
+                        raise IdempotencyKeyConflictError("Idempotency-Key already used for a different request")
+                    return stored
+
+                self._in_flight[idempotency_key] = (fingerprint, asyncio.get_running_loop().create_future())
+                return None
+
+            in_flight_fingerprint, future = in_flight
+            if in_flight_fingerprint != fingerprint:
+                raise IdempotencyKeyConflictError("Idempotency-Key already used for a different request")
+
+            try:
+                response = await asyncio.wait_for(asyncio.shield(future), timeout)
+            except asyncio.TimeoutError as e:
+                raise IdempotencyKeyInProgressError("A request with this Idempotency-Key is still in progress") from e
+
+            # without a response the first request failed, the next waiter executes it
+            if response is not None:
+                return response
+
+    def finish(self, idempotency_key: str, response: Optional[Dict[str, Any]], store: bool = True):
+        """
+        Hand the response over to the waiting duplicates and keep it for the
+        later ones when `store` is set. None releases the key without a response.
+        """
+        _, future = self._in_flight.pop(idempotency_key)
+
+        if response is not None and store:
+            self.backend.set(self._key(idempotency_key), response)
+        future.set_result(response)
+
+    def is_in_flight(self, idempotency_key: str) -> bool:
+        return idempotency_key in self._in_flight
+
+
+def create_idempotency_backend(settings: Settings) -> CacheBackend:
+    if settings.IDEMPOTENCY_BACKEND == "lru":
+        return LRUCacheBackend(max_size=settings.IDEMPOTENCY_MAX_KEYS, ttl=settings.IDEMPOTENCY_TTL)
+
+    if settings.IDEMPOTENCY_BACKEND == "redis":
+        # optional dependency, only needed with the redis backend
+        import redis
+        return RedisCacheBackend(redis.Redis.from_url(settings.REDIS_URL), ttl=settings.IDEMPOTENCY_TTL)
+
+    if settings.IDEMPOTENCY_BACKEND == "fakeredis":
+        return RedisCacheBackend(FakeRedis(), ttl=settings.IDEMPOTENCY_TTL)
+
+    if settings.IDEMPOTENCY_BACKEND == "none":
+        return NullCacheBackend()
+
+    raise ValueError(f"Unknown IDEMPOTENCY_BACKEND: {settings.IDEMPOTENCY_BACKEND}")
+
+
+idempotency_store = IdempotencyStore(create_idempotency_backend(settings))
@@ -0,0 +1,155 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+from app.core.config import settings
+from app.metrics.collectors import single_flight_calls
+
+T = TypeVar("T")
+
+
+class _FlightAbandoned(Exception):
+    """
+    Set on a flight whose leader was cancelled, its followers start over
+    """
+
+
+def _on_event_loop_thread() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent reads: the first caller of a key executes
+    the load, callers arriving while it runs wait for it and get the same
+    result (or exception) instead of querying the database again.
+
+    Flights are futures in a thread-safe table, so sync callers (threadpool
+    routes, background threads) and async callers (event loop) share them.
+    A caller arriving after a committed write never joins a flight started
+    before it: `invalidate` bumps a generation, and older flights are only
+    finished for the callers already waiting on them.
+
+    Only results and exceptions are shared. When the leader is cancelled
+    (its client disconnected) the key is released and the followers start
+    over, one of them executing the load.
+
+    Results are shared between requests, they must not be bound to a session
+    (rows, schemas and counts are fine, ORM instances are not).
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._flights: Dict[Hashable, Tuple[int, Future]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _join(self, key: Tuple[Hashable, ...], lead_only: bool = False) -> Tuple[bool, Optional[Future]]:
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None and flight[0] == self._generation:
+                if lead_only:
+                    return False, None
+                single_flight_calls.inc(1, key[0], "shared")
+                return False, flight[1]
+
+            future = Future()
+            # running futures cannot be cancelled, a follower giving up leaves the flight alone
+            future.set_running_or_notify_cancel()
+            self._flights[key] = (self._generation, future)
+            single_flight_calls.inc(1, key[0], "executed")
+            return True, future
+
+    def _land(self, key: Tuple[Hashable, ...], future: Future):
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None and flight[1] is future:
+                del self._flights[key]
+
+    def _abandon(self, key: Tuple[Hashable, ...], future: Future):
+        self._land(key, future)
+        future.set_exception(_FlightAbandoned())
+
+    def do(self, key: Tuple[Hashable, ...], load: Callable[[], T]) -> T:
+        """
+        Execute `load`, or wait for the flight of the same key in progress.
+        The first element of the key names the load in the metrics.
+
+        On an event loop thread (sync code run by `AsyncSession.run_sync`)
+        blocking would stall the flight being waited for, so the load is
+        executed directly when another flight is in progress.
+        """
+        if not self.enabled:
+            return load()
+
+        while True:
+            leader, future = self._join(key, lead_only=_on_event_loop_thread())
+            if future is None:
+                return load()
+            if leader:
+                break
+
+            try:
+                return future.result()
+            except _FlightAbandoned:
+                continue
+
+        try:
+            result = load()
+        except Exception as e:
+            self._land(key, future)
+            future.set_exception(e)
+            raise
+        except BaseException:
+            self._abandon(key, future)
+            raise
+
+        self._land(key, future)
+        future.set_result(result)
+        return result
+
+    async def do_async(self, key: Tuple[Hashable, ...], load: Callable[[], Awaitable[T]]) -> T:
+        """
+        Async counterpart of `do`, `load` returning the awaitable to execute
+        """
+        if not self.enabled:
+            return await load()
+
+        while True:
+            leader, future = self._join(key)
+            if leader:
+                break
+
+            try:
+                return await asyncio.wrap_future(future)
+            except _FlightAbandoned:
+                continue
+
+        try:
+            result = await load()
+        except Exception as e:
+            self._land(key, future)
+            future.set_exception(e)
+            raise
+        except BaseException:
+            self._abandon(key, future)
+            raise
+
+        self._land(key, future)
+        future.set_result(result)
+        return result
+
+    def invalidate(self):
+        """
+        Start new flights for the callers arriving from now on, called once a write is committed
+        """
+        with self._lock:
+            self._generation += 1
+
+
+single_flight = SingleFlight(enabled=settings.SINGLE_FLIGHT_ENABLED)
@@ -0,0 +1,120 @@
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from app.cache.backends import CacheBackend, FakeRedis, LRUCacheBackend, NullCacheBackend, RedisCacheBackend
+from app.core.config import Settings, settings
+
+
+class _Loads:
+    """
+    Loads of one task in flight, and the invalidations seen while they run
+    """
+    __slots__ = ('count', 'generation')
+
+    def __init__(self):
+        self.count = 0
+        self.generation = 0
+
+
+class TaskCache:
+    """
+    Read-through cache of single tasks keyed by id, with hit/miss counters.
+
+    Values are the JSON-compatible task payloads. A value loaded while the
+    same task is invalidated is not stored, so an in-flight read never puts
+    back the data a write just replaced. Within the process the loads in
+    flight are tracked per task and forgotten once they end, across workers
+    the shared backends version their entries (see `CacheBackend.set_versioned`).
+    """
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self._loads: Dict[int, _Loads] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _key(task_id: int) -> str:
+        return f"task:{task_id}"
+
+    def get_or_load(self, task_id: int, loader: Callable[[], Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        key = self._key(task_id)
+        value, version = self.backend.get_versioned(key)
+
+        with self._lock:
+            if value is not None:
+                self.hits += 1
+                return value
+
+            self.misses += 1
+            loads = self._loads.setdefault(task_id, _Loads())
+            loads.count += 1
+            generation = loads.generation
+
+        value = None
+        try:
+            value = loader()
+        finally:
+            with self._lock:
+                loads.count -= 1
+                if loads.count == 0:
+                    del self._loads[task_id]
+
+                # missing tasks are not cached, creating a task needs no invalidation
+                if value is not None and generation == loads.generation:
+                    self.backend.set_versioned(key, value, version)
+
+        return value
+
+    def invalidate(self, task_ids: Iterable[int]):
+        task_ids = list(task_ids)
+
+        with self._lock:
+            # only the loads in flight need to know, the others start after the write
+            for task_id in task_ids:
+                loads = self._loads.get(task_id)
+                if loads is not None:
+                    loads.generation += 1
+            self.invalidations += len(task_ids)
+
+        self.backend.delete(self._key(task_id) for task_id in task_ids)
+
+    def clear(self):
+        with self._lock:
+            for loads in self._loads.values():
+                loads.generation += 1
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'backend': type(self.backend).__name__,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'invalidations': self.invalidations,
+            }
+
+
+def create_cache_backend(settings: Settings) -> CacheBackend:
+    if settings.TASK_CACHE_BACKEND == "lru":
+        return LRUCacheBackend(max_size=settings.TASK_CACHE_MAX_SIZE, ttl=settings.TASK_CACHE_TTL)
+
+    if settings.TASK_CACHE_BACKEND == "redis":
+        # optional dependency, only needed with the redis backend
+        import redis
+        return RedisCacheBackend(redis.Redis.from_url(settings.REDIS_URL), ttl=settings.TASK_CACHE_TTL)
+
+    if settings.TASK_CACHE_BACKEND == "fakeredis":
+        return RedisCacheBackend(FakeRedis(), ttl=settings.TASK_CACHE_TTL)
+
+    if settings.TASK_CACHE_BACKEND == "none":
+        return NullCacheBackend()
+
+    raise ValueError(f"Unknown TASK_CACHE_BACKEND: {settings.TASK_CACHE_BACKEND}")
+
+
+task_cache = TaskCache(create_cache_backend(settings))
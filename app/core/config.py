@@ -0,0 +1,141 @@
+from dotenv.main import load_dotenv
+import os
+
+
+load_dotenv()
+
+
+def _get_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _get_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def _get_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+class Settings:
+    """
+    Application settings read from environment variables (and the `.env` file)
+    """
+
+    # Database connection
+    MYSQL_USER: str = os.getenv('MYSQL_USER', 'user')
+    MYSQL_PASSWORD: str = os.getenv('MYSQL_PASSWORD', 'password')
+    DB_HOST: str = os.getenv('DB_HOST', 'localhost')
+    MYSQL_DATABASE: str = os.getenv('MYSQL_DATABASE', 'mydb')
+
+    # Full SQLAlchemy URL, takes precedence over the MySQL variables above when set
+    DATABASE_URL: str = os.getenv('DATABASE_URL', '')
+
+    # "sync" serves requests from the threadpool with `get_db`, "async" uses `get_async_db` end to end
+    APP_DB_MODE: str = os.getenv('APP_DB_MODE', 'sync')
+
+    # Connection pool
+    # "queue" keeps a pool of connections per worker process, "null" opens one per checkout
+    DB_POOL_MODE: str = os.getenv('DB_POOL_MODE', 'queue')
+    DB_POOL_SIZE: int = _get_int('DB_POOL_SIZE', 10)
+    DB_MAX_OVERFLOW: int = _get_int('DB_MAX_OVERFLOW', 20)
+    DB_POOL_TIMEOUT: float = _get_float('DB_POOL_TIMEOUT', 30.0)
+    # Recycle connections before MySQL's wait_timeout closes them on the server side
+    DB_POOL_RECYCLE: int = _get_int('DB_POOL_RECYCLE', 1800)
+    DB_POOL_PRE_PING: bool = _get_bool('DB_POOL_PRE_PING', False)
+
+    # Maximum number of ids handled by a single statement in bulk operations
+    BULK_CHUNK_SIZE: int = _get_int('BULK_CHUNK_SIZE', 1000)
+
+
+    # Maximum number of tasks accepted by a single bulk create request
+    BULK_CREATE_MAX_ITEMS: int = _get_int('BULK_CREATE_MAX_ITEMS', 50000)
+
+    # Buffer task_statistics inserts across requests and write them in batches
+    AUDIT_BUFFER_ENABLED: bool = _get_bool('AUDIT_BUFFER_ENABLED', False)
+    AUDIT_BUFFER_MAX_SIZE: int = _get_int('AUDIT_BUFFER_MAX_SIZE', 500)
+    AUDIT_BUFFER_MAX_AGE: float = _get_float('AUDIT_BUFFER_MAX_AGE', 1.0)
+    # Actions kept while the database is unavailable, the oldest are dropped beyond it
+    AUDIT_BUFFER_MAX_PENDING: int = _get_int('AUDIT_BUFFER_MAX_PENDING', 50000)
+
+
+    # Seconds the total counts used for pagination are cached, 0 disables the cache
+    COUNT_CACHE_TTL: float = _get_float('COUNT_CACHE_TTL', 5.0)
+
+    # Share one execution of the statistics, task count and task page reads between identical concurrent requests
+    SINGLE_FLIGHT_ENABLED: bool = _get_bool('SINGLE_FLIGHT_ENABLED', True)
+
+
+    # Read-through cache of single tasks: "lru", "redis", "fakeredis" (in-memory Redis stand-in) or "none"
+    TASK_CACHE_BACKEND: str = os.getenv('TASK_CACHE_BACKEND', 'lru')
+    TASK_CACHE_MAX_SIZE: int = _get_int('TASK_CACHE_MAX_SIZE', 10000)
+    TASK_CACHE_TTL: float = _get_float('TASK_CACHE_TTL', 30.0)
+    REDIS_URL: str = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+
+
+    # Rows fetched from the server-side cursor (and serialized per chunk) by the export endpoints
+    EXPORT_BATCH_SIZE: int = _get_int('EXPORT_BATCH_SIZE', 1000)
+
+
+    # Encode success responses straight to bytes with orjson, skipping response_model validation
+    FAST_RESPONSES: bool = _get_bool('FAST_RESPONSES', False)
+
+
+    # Event stream: queued events per subscriber before it is dropped as too slow, maximum number
+    # of subscribers, seconds between statistics broadcasts and between heartbeats of idle streams
+    EVENTS_QUEUE_SIZE: int = _get_int('EVENTS_QUEUE_SIZE', 100)
+    EVENTS_MAX_SUBSCRIBERS: int = _get_int('EVENTS_MAX_SUBSCRIBERS', 10000)
+    EVENTS_STATISTICS_INTERVAL: float = _get_float('EVENTS_STATISTICS_INTERVAL', 1.0)
+    EVENTS_HEARTBEAT_INTERVAL: float = _get_float('EVENTS_HEARTBEAT_INTERVAL', 15.0)
+
+
+    # Request metrics exposed on /metrics, Server-Timing header, and the number of SQL
+    # statements above which a request is logged as a possible N+1 query pattern
+    METRICS_ENABLED: bool = _get_bool('METRICS_ENABLED', True)
+    METRICS_SERVER_TIMING: bool = _get_bool('METRICS_SERVER_TIMING', True)
+    METRICS_N_PLUS_ONE_THRESHOLD: int = _get_int('METRICS_N_PLUS_ONE_THRESHOLD', 20)
+
+
+    # Maximum number of buckets returned by a single /statistics/timeseries request
+    STATISTICS_TIMESERIES_MAX_BUCKETS: int = _get_int('STATISTICS_TIMESERIES_MAX_BUCKETS', 1000)
+
+
+    # Monthly partitions of task_statistics (MySQL): months created ahead of time, and months kept
+    # in the table before the archival job moves them to "ndjson" (gzip) or "parquet" files
+    TASK_STATISTICS_FUTURE_PARTITIONS: int = _get_int('TASK_STATISTICS_FUTURE_PARTITIONS', 3)
+    TASK_STATISTICS_RETENTION_MONTHS: int = _get_int('TASK_STATISTICS_RETENTION_MONTHS', 12)
+    TASK_STATISTICS_ARCHIVE_DIR: str = os.getenv('TASK_STATISTICS_ARCHIVE_DIR', 'archive/task_statistics')
+    TASK_STATISTICS_ARCHIVE_FORMAT: str = os.getenv('TASK_STATISTICS_ARCHIVE_FORMAT', 'ndjson')
+
+
+    # Purge of soft-deleted tasks: days a task stays soft-deleted before it is hard-deleted ("delete") or
+    # moved to tasks_archive ("archive"), tasks per batch, pause after a batch relative to its duration,
+    # seconds between scheduled runs (0 only runs it from the admin endpoint or the job), and whether
+    # the actions of the purged tasks are deleted from task_statistics as well
+    TASK_PURGE_MIN_AGE_DAYS: int = _get_int('TASK_PURGE_MIN_AGE_DAYS', 30)
+    TASK_PURGE_MODE: str = os.getenv('TASK_PURGE_MODE', 'delete')
+    TASK_PURGE_BATCH_SIZE: int = _get_int('TASK_PURGE_BATCH_SIZE', 500)
+    TASK_PURGE_THROTTLE: float = _get_float('TASK_PURGE_THROTTLE', 1.0)
+    TASK_PURGE_INTERVAL: float = _get_float('TASK_PURGE_INTERVAL', 0.0)
+    TASK_PURGE_DELETE_ACTIONS: bool = _get_bool('TASK_PURGE_DELETE_ACTIONS', False)
+
+
+    # Idempotency-Key support of the task write routes: where the responses are kept ("lru", "redis",
+    # "fakeredis" or "none" to only coalesce the duplicates in flight), how many (lru), for how many
+    # seconds, and how long a duplicate waits for the request in flight before getting a 409
+    IDEMPOTENCY_BACKEND: str = os.getenv('IDEMPOTENCY_BACKEND', 'lru')
+    IDEMPOTENCY_MAX_KEYS: int = _get_int('IDEMPOTENCY_MAX_KEYS', 10000)
+    IDEMPOTENCY_TTL: float = _get_float('IDEMPOTENCY_TTL', 86400.0)
+    IDEMPOTENCY_WAIT_TIMEOUT: float = _get_float('IDEMPOTENCY_WAIT_TIMEOUT', 30.0)
+
+
+    # Token expected in the X-Admin-Token header by the /admin endpoints, which are disabled when empty
+    ADMIN_TOKEN: str = os.getenv('ADMIN_TOKEN', '')
+
+
+settings = Settings()
@@ -0,0 +1,22 @@
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.database.pool import create_pooled_async_engine
+
+
+# Create async engine (aiomysql) with a per-process connection pool configured from the environment
+async_engine = create_pooled_async_engine(settings)
+
+# Create a configured "AsyncSession" class
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+
+# Dependency to get async database session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,3 +1,13 @@
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.sql import functions
 
 Base = declarative_base()
+
+
+@compiles(functions.now, "sqlite")
+def _sqlite_now(element, compiler, **kw):
+    # SQLite keeps timestamps as text: CURRENT_TIMESTAMP has no fractional seconds
+    # while the datetimes bound by SQLAlchemy have six digits, and the two formats
+    # do not compare as text. Server timestamps use the bound format instead.
+    return "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
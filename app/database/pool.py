@@ -0,0 +1,187 @@
+import os
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+from app.core.config import Settings
+from app.metrics.collectors import instrument_queries, observe_connection_wait
+
+
+class PoolMetrics:
+    """
+    Thread-safe counters of connection pool events
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.connects = 0
+            self.checkouts = 0
+            self.checkins = 0
+            self.invalidations = 0
+
+    def increment(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'connects': self.connects,
+                'checkouts': self.checkouts,
+                'checkins': self.checkins,
+                'invalidations': self.invalidations,
+            }
+
+
+pool_metrics = PoolMetrics()
+async_pool_metrics = PoolMetrics()
+
+
+class TimedCheckoutMixin:
+    """
+    Record how long getting a connection from the pool takes, waiting for a
+    free connection or opening a new one included
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            engine_name = "async" if getattr(self._dialect, "is_async", False) else "sync"
+            observe_connection_wait(engine_name, time.perf_counter() - started)
+
+
+class TimedQueuePool(TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+class TimedNullPool(TimedCheckoutMixin, NullPool):
+    pass
+
+
+def build_database_url(settings: Settings) -> str:
+    if settings.DATABASE_URL:
+        return settings.DATABASE_URL
+
+    return (
+        f"mysql+pymysql://{settings.MYSQL_USER}:"
+        f"{settings.MYSQL_PASSWORD}@"
+        f"{settings.DB_HOST}/"
+        f"{settings.MYSQL_DATABASE}"
+    )
+
+
+# Async drivers used in place of the sync ones when running in async mode
+ASYNC_DRIVERS = {
+    'mysql+pymysql': 'mysql+aiomysql',
+    'mysql+mysqldb': 'mysql+aiomysql',
+    'mysql': 'mysql+aiomysql',
+    'sqlite': 'sqlite+aiosqlite',
+    'sqlite+pysqlite': 'sqlite+aiosqlite',
+}
+
+
+def build_async_database_url(settings: Settings) -> str:
+    url = build_database_url(settings)
+    scheme, separator, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{separator}{rest}"
+
+
+def build_pool_options(settings: Settings, is_async: bool = False) -> Dict[str, Any]:
+    """
+    Translate the pool settings into `create_engine` keyword arguments
+    """
+    if settings.DB_POOL_MODE == "null":
+        return {
+            'poolclass': TimedNullPool,
+            'pool_pre_ping': settings.DB_POOL_PRE_PING,
+        }
+
+    if settings.DB_POOL_MODE != "queue":
+        raise ValueError(f"Unknown DB_POOL_MODE: {settings.DB_POOL_MODE}")
+
+    return {
+        'poolclass': TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool,
+        'pool_size': settings.DB_POOL_SIZE,
+        'max_overflow': settings.DB_MAX_OVERFLOW,
+        'pool_timeout': settings.DB_POOL_TIMEOUT,
+        'pool_recycle': settings.DB_POOL_RECYCLE,
+        'pool_pre_ping': settings.DB_POOL_PRE_PING,
+    }
+
+
+def instrument_pool(engine: Engine, metrics: PoolMetrics = pool_metrics):
+    """
+    Count connection pool events of the given engine
+    """
+    event.listen(engine, "connect", lambda *args: metrics.increment('connects'))
+    event.listen(engine, "checkout", lambda *args: metrics.increment('checkouts'))
+    event.listen(engine, "checkin", lambda *args: metrics.increment('checkins'))
+    event.listen(engine, "invalidate", lambda *args: metrics.increment('invalidations'))
+
+
+def make_fork_safe(engine: Engine):
+    """
+    Give every forked worker process (gunicorn/uvicorn --workers) its own pool.
+
+    Connections inherited from the parent are dropped without being closed,
+    so the child never shares a socket with another process.
+    """
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=lambda: engine.dispose(close=False))
+
+
+def create_pooled_engine(settings: Settings) -> Engine:
+    engine = create_engine(build_database_url(settings), **build_pool_options(settings))
+
+    instrument_pool(engine)
+    instrument_queries(engine)
+    make_fork_safe(engine)
+
+    return engine
+
+
+def create_pooled_async_engine(settings: Settings) -> AsyncEngine:
+    async_engine = create_async_engine(build_async_database_url(settings), **build_pool_options(settings, is_async=True))
+
+    instrument_pool(async_engine.sync_engine, async_pool_metrics)
+    instrument_queries(async_engine.sync_engine)
+    make_fork_safe(async_engine.sync_engine)
+
+    return async_engine
+
+
+def get_pool_status(engine: Engine, metrics: PoolMetrics = pool_metrics) -> Dict[str, Any]:
+    """
+    Current pool occupancy merged with the event counters
+    """
+    pool = engine.pool
+    status: Dict[str, Any] = {
+        'mode': type(pool).__name__,
+        'pid': os.getpid(),
+    }
+
+    if isinstance(pool, QueuePool):
+        status.update({
+            'size': pool.size(),
+            'checked_in': pool.checkedin(),
+            'checked_out': pool.checkedout(),
+            'overflow': pool.overflow(),
+        })
+
+    status.update(metrics.snapshot())
+    return status
@@ -1,29 +1,11 @@
-from dotenv.main import load_dotenv
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import NullPool
-import os
 
+from app.core.config import settings
+from app.database.pool import create_pooled_engine
 
-load_dotenv()
 
-# Get database connection details from environment variables
-DATABASE_URL = (
-    f"mysql+pymysql://{os.getenv('MYSQL_USER', 'user')}:"
-    f"{os.getenv('MYSQL_PASSWORD', 'password')}@"
-    f"{os.getenv('DB_HOST', 'localhost')}/"
-    f"{os.getenv('MYSQL_DATABASE', 'mydb')}"
-)
-
-
-print(DATABASE_URL)
-
-# Create engine with connection pooling disabled for better performance in async contexts
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,
-    poolclass=NullPool
-)
+# Create engine with a per-process connection pool configured from the environment
+engine = create_pooled_engine(settings)
 
 # Create a configured "Session" class
 SessionLocal = sessionmaker(
@@ -0,0 +1,23 @@
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm.session import Session
+
+
+def get_approximate_row_count(db: Session, table_name: str) -> Optional[int]:
+    """
+    Read the estimated number of rows of a table from the database statistics
+    instead of counting them.
+
+    Returns None when the database does not keep such statistics.
+    """
+    if db.get_bind().dialect.name != "mysql":
+        return None
+
+    return db.execute(
+        text(
+            "SELECT TABLE_ROWS FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name"
+        ),
+        {'table_name': table_name}
+    ).scalar()
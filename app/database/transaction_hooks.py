@@ -0,0 +1,28 @@
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_PENDING_KEY = "after_commit_callbacks"
+
+
+def on_commit(db: Session, callback: Callable[[], None]):
+    """
+    Run a callback once the current transaction of the session is committed.
+
+    Callbacks are dropped if the transaction is rolled back instead, so they
+    only ever observe data that was actually persisted.
+    """
+    db.info.setdefault(_PENDING_KEY, []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_commit_callbacks(db: Session):
+    callbacks = db.info.pop(_PENDING_KEY, [])
+    for callback in callbacks:
+        callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_commit_callbacks(db: Session):
+    db.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,48 @@
+"""
+Move the task_statistics partitions past the retention to archive files (MySQL).
+
+Usage:
+    python -m app.jobs.archive_task_statistics --dry-run
+    python -m app.jobs.archive_task_statistics --retention-months 6 --format parquet
+
+Every month older than TASK_STATISTICS_RETENTION_MONTHS months before the
+current one is written to TASK_STATISTICS_ARCHIVE_DIR, recorded in
+task_statistics_archives with its action counts, and its partition dropped.
+Archived actions stay available through
+`GET /statistics/actions/export?include_archived=true`.
+"""
+import argparse
+import logging
+import sys
+
+from app.core.config import settings
+from app.database.session import SessionLocal
+from app.services.archive_service import ARCHIVE_EXTENSIONS
+from app.services.partition_service import PartitioningError, PartitionService
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--retention-months", type=int, default=settings.TASK_STATISTICS_RETENTION_MONTHS)
+    parser.add_argument("--dir", default=settings.TASK_STATISTICS_ARCHIVE_DIR)
+    parser.add_argument("--format", choices=list(ARCHIVE_EXTENSIONS), default=settings.TASK_STATISTICS_ARCHIVE_FORMAT)
+    parser.add_argument("--dry-run", action="store_true", help="Only list the partitions to archive")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    db = SessionLocal()
+    try:
+        archives = PartitionService.archive_expired(
+            db, args.retention_months, args.dir, args.format, dry_run=args.dry_run
+        )
+        for archive in archives:
+            print(f"Archived {archive.partition_name}: {archive.row_count} actions to {archive.path}")
+    except PartitioningError as e:
+        sys.exit(str(e))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
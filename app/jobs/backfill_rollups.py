@@ -0,0 +1,34 @@
+"""
+Rebuild the hourly and daily task action rollups from the base tables.
+
+Usage:
+    python -m app.jobs.backfill_rollups                                   # every day
+    python -m app.jobs.backfill_rollups --since 2026-10-01 --until 2026-10-15
+
+Whole days are rebuilt. Writes to those days while the job runs may be lost,
+so run it while the API is stopped (e.g. right after the migration adding the
+rollups) or on days that are over.
+"""
+import argparse
+from datetime import datetime
+
+from app.database.session import SessionLocal
+from app.services.rollup_service import RollupService
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--since", type=datetime.fromisoformat, help="First day to rebuild (UTC)")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="Day after the last one to rebuild (UTC)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        rows = RollupService.backfill(db, since=args.since, until=args.until)
+        print(f"Rebuilt {rows} task action rollup rows")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Create the monthly task_statistics partitions ahead of time (MySQL).
+
+Usage:
+    python -m app.jobs.maintain_partitions
+    python -m app.jobs.maintain_partitions --months-ahead 6
+
+Splits the catch-all p_future partition so the current month and the next
+TASK_STATISTICS_FUTURE_PARTITIONS months have their own partition. Run it
+at least monthly (e.g. daily from cron), it does nothing when they exist.
+"""
+import argparse
+import sys
+
+from app.core.config import settings
+from app.database.session import SessionLocal
+from app.services.partition_service import PartitioningError, PartitionService
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--months-ahead", type=int, default=settings.TASK_STATISTICS_FUTURE_PARTITIONS)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        created = PartitionService.ensure_future_partitions(db, args.months_ahead)
+        print(f"Created partitions: {', '.join(created)}" if created else "Partitions already exist")
+    except PartitioningError as e:
+        sys.exit(str(e))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Hard-delete the tasks soft-deleted more than TASK_PURGE_MIN_AGE_DAYS days ago.
+
+Usage:
+    python -m app.jobs.purge_deleted_tasks --dry-run
+    python -m app.jobs.purge_deleted_tasks --min-age-days 90 --mode archive
+
+Tasks are purged in throttled batches, oldest deletion first; with
+--mode archive they are moved to the tasks_archive table. Sync tokens
+issued before the purged deletions are expired, their clients sync again
+from scratch. The API runs the same purge from `POST /api/v1/admin/purge`.
+"""
+import argparse
+import logging
+import sys
+
+from app.core.config import settings
+from app.database.session import SessionLocal
+from app.schemas.purge_schema import PurgeModeEnum, PurgeStateEnum
+from app.services.purge_service import TaskPurger
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--min-age-days", type=int, default=settings.TASK_PURGE_MIN_AGE_DAYS)
+    parser.add_argument("--mode", choices=[mode.value for mode in PurgeModeEnum], default=settings.TASK_PURGE_MODE)
+    parser.add_argument("--batch-size", type=int, default=settings.TASK_PURGE_BATCH_SIZE)
+    parser.add_argument("--throttle", type=float, default=settings.TASK_PURGE_THROTTLE,
+                        help="Pause after each batch, relative to its duration")
+    parser.add_argument("--delete-actions", action="store_true", default=settings.TASK_PURGE_DELETE_ACTIONS,
+                        help="Delete the actions of the purged tasks from task_statistics too")
+    parser.add_argument("--dry-run", action="store_true", help="Only count the tasks to purge")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    purger = TaskPurger(
+        SessionLocal,
+        min_age_days=args.min_age_days,
+        batch_size=args.batch_size,
+        mode=PurgeModeEnum(args.mode),
+        delete_actions=args.delete_actions,
+        throttle=args.throttle
+    )
+    status = purger.run(dry_run=args.dry_run)
+
+    if args.dry_run:
+        print(f"{status.remaining_tasks} tasks deleted before {status.cutoff} would be purged")
+    else:
+        print(f"Purged {status.purged_tasks} tasks deleted before {status.cutoff} in {status.batches} batches")
+
+    if status.state == PurgeStateEnum.failed:
+        sys.exit(status.last_error)
+
+
+if __name__ == "__main__":
+    main()
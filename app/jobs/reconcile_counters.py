@@ -0,0 +1,23 @@
+"""
+Recompute the task counters from the base tables.
+
+Usage: python -m app.jobs.reconcile_counters
+"""
+from app.database.session import SessionLocal
+from app.services.counter_service import CounterService
+
+
+def main():
+    db = SessionLocal()
+    try:
+        counter = CounterService.reconcile(db)
+        print(
+            f"Reconciled task counters: total={counter.total_tasks} completed={counter.completed_tasks} "
+            f"modified={counter.modified_tasks} deleted={counter.deleted_tasks}"
+        )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,151 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.requests import Request
-from starlette.responses import JSONResponse
-from app.routes import task_routes
-from app.routes import stats_routes
+from starlette.responses import JSONResponse, PlainTextResponse
+from app.core.config import settings
+from app.routes import admin_routes, event_routes, export_routes
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.cache.idempotency_store import idempotency_store
+from app.cache.task_cache import task_cache
+from app.database.pool import async_pool_metrics, get_pool_status, pool_metrics
+from app.database.session import engine
+from app.metrics.collectors import db_pool_connections, registry
+from app.metrics.middleware import MetricsMiddleware
+from app.routes.dependencies import AdminAccessError
+from app.routes.idempotency import IdempotencyMiddleware, REPLAYED_HEADER
 from app.schemas.reponse_schemas import ErrorCode, create_error_response
+from app.services.audit_buffer import audit_buffer
+from app.services.event_hub import event_hub
+from app.services.purge_service import task_purger
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.AUDIT_BUFFER_ENABLED:
+        audit_buffer.start()
+    await event_hub.start()
+    task_purger.start()
+
+    yield
+
+    # a running purge stops after its current batch
+    task_purger.stop()
+    await event_hub.stop()
+
+    # write the task actions still waiting in the buffer
+    if settings.AUDIT_BUFFER_ENABLED:
+        audit_buffer.stop()
+
+    # close the pooled connections, and the aiosqlite / aiomysql worker threads with them
+    if settings.APP_DB_MODE == "async":
+        from app.database.async_session import async_engine
+        await async_engine.dispose()
+    engine.dispose()
+
 
 # Initialize FastAPI app
-app = FastAPI(title="Task Management API server")
+app = FastAPI(title="Task Management API server", lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Server-Timing", REPLAYED_HEADER],
 )
+app.add_middleware(IdempotencyMiddleware, store=idempotency_store, wait_timeout=settings.IDEMPOTENCY_WAIT_TIMEOUT)
+if settings.METRICS_ENABLED:
+    app.add_middleware(
+        MetricsMiddleware,
+        n_plus_one_threshold=settings.METRICS_N_PLUS_ONE_THRESHOLD,
+        server_timing=settings.METRICS_SERVER_TIMING,
+    )
+
+# Include routers, the async ones are only imported in async mode so the sync
+# deployment does not need the async driver installed
+if settings.APP_DB_MODE == "async":
+    from app.routes import async_change_routes as change_routes
+    from app.routes import async_task_routes as task_routes
+    from app.routes import async_stats_routes as stats_routes
+elif settings.APP_DB_MODE == "sync":
+    from app.routes import change_routes
+    from app.routes import task_routes
+    from app.routes import stats_routes
+else:
+    raise ValueError(f"Unknown APP_DB_MODE: {settings.APP_DB_MODE}")
+
+# Export and change routes go first, "/tasks/export" and "/tasks/changes" would
+# otherwise match "/tasks/{task_id}"
+app.include_router(export_routes.router, prefix="/api/v1", tags=["export"])
+
+app.include_router(change_routes.router, prefix="/api/v1", tags=["tasks"])
 
-# Include routers
 app.include_router(task_routes.router, prefix="/api/v1", tags=["tasks"])
 
 app.include_router(stats_routes.router, prefix="/api/v1", tags=["stats"])
 
+app.include_router(event_routes.router, prefix="/api/v1", tags=["events"])
+
+app.include_router(admin_routes.router, prefix="/api/v1", tags=["admin"])
+
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
-    print(await request.json())
     details = list(exc.errors())
     output = create_error_response(code=ErrorCode.VALIDATION_ERROR, message="Data validation error", details=details)
 
     return JSONResponse(status_code=400, content=output.model_dump())
 
 
+@app.exception_handler(AdminAccessError)
+async def admin_access_exception_handler(request: Request, exc: AdminAccessError):
+    output = create_error_response(code=ErrorCode.FORBIDDEN, message=str(exc))
+
+    return JSONResponse(status_code=403, content=output.model_dump())
+
+
 # Optional health check endpoint
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/health/pool")
+def pool_health():
+    if settings.APP_DB_MODE == "async":
+        from app.database.async_session import async_engine
+        return get_pool_status(async_engine.sync_engine, async_pool_metrics)
+
+    return get_pool_status(engine)
+
+
+def _collect_pool_metrics():
+    pools = {'sync': engine}
+    if settings.APP_DB_MODE == "async":
+        from app.database.async_session import async_engine
+        pools['async'] = async_engine.sync_engine
+
+    for name, pool_engine in pools.items():
+        status = get_pool_status(pool_engine, async_pool_metrics if name == "async" else pool_metrics)
+        for state in ("checked_in", "checked_out", "overflow"):
+            if state in status:
+                db_pool_connections.set(status[state], name, state)
+
+
+registry.on_collect(_collect_pool_metrics)
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/health/cache")
+def cache_health():
+    return task_cache.stats()
+
+
+@app.get("/health/events")
+def events_health():
+    return event_hub.stats()
@@ -0,0 +1,130 @@
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.metrics.registry import Registry
+
+# Buckets of the response sizes in bytes and of the statements per request
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 500)
+
+registry = Registry()
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "Time spent handling the requests", ("method", "route", "status")
+)
+http_response_size = registry.histogram(
+    "http_response_size_bytes", "Size of the response bodies", ("method", "route"), SIZE_BUCKETS
+)
+http_request_db_duration = registry.histogram(
+    "http_request_db_duration_seconds", "Time spent in SQL statements per request", ("method", "route")
+)
+http_request_db_statements = registry.histogram(
+    "http_request_db_statements", "SQL statements executed per request", ("method", "route"), QUERY_COUNT_BUCKETS
+)
+db_statement_duration = registry.histogram(
+    "db_statement_duration_seconds", "Duration of the SQL statements", ("operation",)
+)
+db_connection_wait = registry.histogram(
+    "db_connection_acquire_seconds", "Time spent getting a connection from the pool", ("engine",)
+)
+db_pool_connections = registry.gauge(
+    "db_pool_connections", "Connections of the pool by state", ("engine", "state")
+)
+n_plus_one_requests = registry.counter(
+    "http_request_n_plus_one_total", "Requests executing more SQL statements than the N+1 threshold", ("method", "route")
+)
+idempotent_requests = registry.counter(
+    "http_idempotent_requests_total", "Requests sent with an Idempotency-Key by outcome", ("outcome",)
+)
+single_flight_calls = registry.counter(
+    "single_flight_calls_total", "Coalesced reads by load, executed or shared with a concurrent identical call", ("load", "outcome")
+)
+audit_buffer_dropped = registry.counter(
+    "audit_buffer_dropped_total", "Buffered task actions dropped over AUDIT_BUFFER_MAX_PENDING"
+)
+audit_buffer_pending = registry.gauge(
+    "audit_buffer_pending", "Task actions waiting in the audit buffer"
+)
+
+task_purge_tasks = registry.counter(
+    "task_purge_tasks_total", "Soft-deleted tasks purged", ("mode",)
+)
+task_purge_actions = registry.counter(
+    "task_purge_actions_deleted_total", "Actions of purged tasks deleted from task_statistics"
+)
+task_purge_batches = registry.counter(
+    "task_purge_batches_total", "Purge batches by outcome", ("outcome",)
+)
+task_purge_batch_duration = registry.histogram(
+    "task_purge_batch_duration_seconds", "Duration of the purge batches"
+)
+task_purge_remaining = registry.gauge(
+    "task_purge_remaining_tasks", "Estimated soft-deleted tasks left to purge by the current run"
+)
+task_purge_running = registry.gauge(
+    "task_purge_running", "Whether a purge is running in this process"
+)
+
+
+class RequestMetrics:
+    """
+    SQL activity of the current request.
+
+    The middleware stores one in a context variable, the object is shared with
+    the threadpool and the greenlets running the route, which add to it.
+    """
+    __slots__ = ("db_statements", "db_time", "connection_wait")
+
+    def __init__(self):
+        self.db_statements = 0
+        self.db_time = 0.0
+        self.connection_wait = 0.0
+
+
+current_request: ContextVar[Optional[RequestMetrics]] = ContextVar("current_request", default=None)
+
+_START_KEY = "metrics_statement_start"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info[_START_KEY].pop()
+
+    operation = statement.lstrip()[:6].upper()
+    db_statement_duration.observe(elapsed, operation)
+
+    request = current_request.get()
+    if request is not None:
+        request.db_statements += 1
+        request.db_time += elapsed
+
+
+def _handle_error(exception_context):
+    # the after event does not fire for failed statements
+    starts = exception_context.connection.info.get(_START_KEY) if exception_context.connection is not None else None
+    if starts:
+        starts.pop()
+
+
+def instrument_queries(engine: Engine):
+    """
+    Time the SQL statements of the given engine (the sync engine of an async one)
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def observe_connection_wait(engine_name: str, elapsed: float):
+    db_connection_wait.observe(elapsed, engine_name)
+
+    request = current_request.get()
+    if request is not None:
+        request.connection_wait += elapsed
@@ -0,0 +1,84 @@
+import logging
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.metrics.collectors import (
+    RequestMetrics,
+    current_request,
+    http_request_db_duration,
+    http_request_db_statements,
+    http_request_duration,
+    http_response_size,
+    n_plus_one_requests,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsMiddleware:
+    """
+    Measure every HTTP request: latency, response size, SQL statements and
+    the time spent in them, reported per route template (e.g. "/api/v1/tasks/{task_id}").
+
+    The DB time of the request is added as a `Server-Timing` header, and
+    requests executing more than `n_plus_one_threshold` statements are logged
+    as likely N+1 query patterns.
+    """
+
+    def __init__(self, app: ASGIApp, n_plus_one_threshold: int = 20, server_timing: bool = True):
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = RequestMetrics()
+        token = current_request.set(request)
+        started = time.perf_counter()
+        status = 500
+        response_size = 0
+
+        async def send_with_metrics(message: Message):
+            nonlocal status, response_size
+
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    server_timing = (
+                        f"db;dur={request.db_time * 1000:.1f};desc=\"{request.db_statements} statements\", "
+                        f"pool;dur={request.connection_wait * 1000:.1f}, "
+                        f"app;dur={(time.perf_counter() - started) * 1000:.1f}"
+                    )
+                    message.setdefault("headers", [])
+                    message["headers"] = list(message["headers"]) + [(b"server-timing", server_timing.encode())]
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            current_request.reset(token)
+            self._observe(scope, request, status, response_size, time.perf_counter() - started)
+
+    def _observe(self, scope: Scope, request: RequestMetrics, status: int, response_size: int, elapsed: float):
+        method = scope["method"]
+        # unmatched paths are grouped, raw paths would make the number of series unbounded
+        route = getattr(scope.get("route"), "path", None) or "unmatched"
+
+        http_request_duration.observe(elapsed, method, route, str(status))
+        http_response_size.observe(response_size, method, route)
+        http_request_db_duration.observe(request.db_time, method, route)
+        http_request_db_statements.observe(request.db_statements, method, route)
+
+        if request.db_statements > self.n_plus_one_threshold:
+            n_plus_one_requests.inc(1, method, route)
+            logger.warning(
+                "Possible N+1 queries: %s %s executed %d SQL statements (threshold %d) in %.1f ms",
+                method, route, request.db_statements, self.n_plus_one_threshold, request.db_time * 1000
+            )
@@ -0,0 +1,26 @@
+from sqlalchemy.schema import Column
+from sqlalchemy.sql.sqltypes import DateTime, Enum as SqlEnum, Integer
+from app.database.base import Base
+import enum
+
+
+class RollupBucketEnum(str, enum.Enum):
+    hour = "hour"
+    day = "day"
+
+
+class TaskActionRollup(Base):
+    """
+    Task actions counted per hour and per day (UTC), maintained by
+    `StatisticsService.log_action` in the same transaction as the actions
+    """
+    __tablename__ = "task_action_rollups"
+
+    bucket = Column(SqlEnum(RollupBucketEnum), primary_key=True)
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+
+    created = Column(Integer, nullable=False, default=0, server_default="0")
+    modified = Column(Integer, nullable=False, default=0, server_default="0")
+    deleted = Column(Integer, nullable=False, default=0, server_default="0")
+    # tasks that became completed, by creation or update
+    completed = Column(Integer, nullable=False, default=0, server_default="0")
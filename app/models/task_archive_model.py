@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Index
+from sqlalchemy.sql import func
+from sqlalchemy.sql.sqltypes import BigInteger, Boolean, DateTime, Enum as SqlEnum, Integer, String, Text
+from app.database.base import Base
+from app.models.task_model import TaskStatusEnum
+
+
+class TaskArchive(Base):
+    """
+    A soft-deleted task moved out of the tasks table by the purge
+    (TASK_PURGE_MODE=archive), as it was when it was purged
+    """
+    __tablename__ = "tasks_archive"
+    __table_args__ = (
+        Index("ix_tasks_archive_archived_at", "archived_at"),
+    )
+
+    # the id the task had in the tasks table
+    id = Column(Integer, primary_key=True, autoincrement=False)
+
+    title = Column(String(255), nullable=False)
+    description = Column(Text, nullable=True)
+    status = Column(SqlEnum(TaskStatusEnum), nullable=True)
+
+    created_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), nullable=True)
+    is_deleted = Column(Boolean, nullable=False, default=True)
+    change_seq = Column(BigInteger, nullable=False, default=0)
+
+    archived_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
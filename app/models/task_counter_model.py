@@ -0,0 +1,27 @@
+from sqlalchemy.schema import Column
+from sqlalchemy.sql.sqltypes import BigInteger, DateTime, Integer
+from app.database.base import Base
+
+
+class TaskCounter(Base):
+    """
+    Single summary row holding the task statistics, maintained by the
+    write paths in the same transaction as the change itself
+    """
+    __tablename__ = "task_counters"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+
+    total_tasks = Column(Integer, nullable=False, default=0, server_default="0")
+    completed_tasks = Column(Integer, nullable=False, default=0, server_default="0")
+    modified_tasks = Column(Integer, nullable=False, default=0, server_default="0")
+    deleted_tasks = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # bumped by every write, identifies a state of the data (used for ETags)
+    version = Column(BigInteger, nullable=False, default=0, server_default="0")
+
+    # highest change_seq of the soft-deleted tasks hard-deleted by the purge,
+    # sync tokens below it may have missed their tombstones
+    purged_change_seq = Column(BigInteger, nullable=False, default=0, server_default="0")
+
+    reconciled_at = Column(DateTime(timezone=True), nullable=True)
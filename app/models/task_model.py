@@ -1,8 +1,8 @@
-from sqlalchemy import Column
+from sqlalchemy import Column, Index
 from sqlalchemy.orm import mapped_column
 from sqlalchemy.orm.base import Mapped
 from sqlalchemy.sql import func
-from sqlalchemy.sql.sqltypes import Boolean, DateTime, Enum as SqlEnum, String, Text
+from sqlalchemy.sql.sqltypes import BigInteger, Boolean, DateTime, Enum as SqlEnum, String, Text
 from sqlalchemy.types import Integer
 from app.database.base import Base
 from enum import Enum
@@ -14,8 +14,21 @@ class TaskStatusEnum(str, Enum):
 
 class Task(Base):
     __tablename__ = "tasks"
-
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    __table_args__ = (
+        # listing non-deleted tasks in id order
+        Index("ix_tasks_is_deleted_id", "is_deleted", "id"),
+        # counting non-deleted / completed tasks
+        Index("ix_tasks_is_deleted_status", "is_deleted", "status"),
+        # listing non-deleted tasks by creation / update date
+        Index("ix_tasks_is_deleted_created_at", "is_deleted", "created_at"),
+        Index("ix_tasks_is_deleted_updated_at", "is_deleted", "updated_at"),
+        # full-text search in the titles and descriptions
+        Index("ix_tasks_title_description", "title", "description", mysql_prefix="FULLTEXT"),
+        # reading the changes after a sync token
+        Index("ix_tasks_change_seq_id", "change_seq", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
 
     title = Column(String(255), index=True, nullable=False)
     description = Column(Text, nullable=True)
@@ -26,3 +39,6 @@ class Task(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     is_deleted: Mapped[bool] = mapped_column(Boolean, default=False)
+
+    # write version of the last change to the task, see CounterService.apply
+    change_seq: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0", nullable=False)
@@ -0,0 +1,27 @@
+from sqlalchemy.schema import Column
+from sqlalchemy.sql.sqltypes import DateTime, Integer, String
+from app.database.base import Base
+
+
+class TaskStatisticsArchive(Base):
+    """
+    A month of task_statistics moved out of the table to an archive file,
+    with its action counts so the counters and rollups can still include it
+    """
+    __tablename__ = "task_statistics_archives"
+
+    id = Column(Integer, primary_key=True)
+
+    partition_name = Column(String(64), nullable=False, unique=True)
+    # actions in [range_start, range_end), the first partition has no lower bound
+    range_start = Column(DateTime(timezone=True), nullable=True)
+    range_end = Column(DateTime(timezone=True), nullable=False)
+
+    row_count = Column(Integer, nullable=False)
+    created_count = Column(Integer, nullable=False)
+    modified_count = Column(Integer, nullable=False)
+    deleted_count = Column(Integer, nullable=False)
+
+    path = Column(String(1024), nullable=False)
+    format = Column(String(16), nullable=False)
+    archived_at = Column(DateTime(timezone=True), nullable=False)
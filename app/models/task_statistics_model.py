@@ -1,5 +1,4 @@
-from sqlalchemy.orm.properties import ForeignKey
-from sqlalchemy.schema import Column
+from sqlalchemy.schema import Column, Index
 from sqlalchemy.sql import func
 from sqlalchemy.sql.sqltypes import DateTime, Enum as SqlEnum, Integer
 from app.database.base import Base
@@ -11,12 +10,28 @@ class TaskActionEnum(str, enum.Enum):
     deleted = "deleted"
 
 class TaskStatistic(Base):
+    """
+    Append-only log of the task actions.
+
+    On MySQL the table is partitioned by month on `action_at` (see
+    PartitionService), which requires `action_at` in the physical primary key
+    (id, action_at) and rules out foreign keys: `task_id` is not constrained
+    and expired months are moved to archive files.
+    """
     __tablename__ = "task_statistics"
+    __table_args__ = (
+        # actions feed ordered by time
+        Index("ix_task_statistics_action_at", "action_at"),
+        # counting actions of a type, optionally over a time range
+        Index("ix_task_statistics_action_action_at", "action", "action_at"),
+        # history of a single task
+        Index("ix_task_statistics_task_id_action_at", "task_id", "action_at"),
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
 
-    task_id = Column(Integer, ForeignKey("tasks.id"), nullable=False)
+    task_id = Column(Integer, nullable=False)
 
     action = Column(SqlEnum(TaskActionEnum), nullable=False)
 
-    action_at = Column(DateTime(timezone=True), server_default=func.now())
+    action_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
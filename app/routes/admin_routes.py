@@ -0,0 +1,46 @@
+from typing import Optional
+
+from fastapi import APIRouter
+from fastapi.params import Depends
+
+from app.routes.dependencies import require_admin_token
+from app.schemas.purge_schema import PurgeRequestSchema, PurgeStatusSchema
+from app.schemas.reponse_schemas import APIResponse, ErrorCode, create_error_response, create_success_response
+from app.services.purge_service import task_purger
+
+# The purge runs on its own sync session in a background thread, so these
+# routes are shared by both database modes
+router = APIRouter(dependencies=[Depends(require_admin_token)])
+
+
+@router.get("/admin/purge", response_model=APIResponse[PurgeStatusSchema])
+def get_purge_status():
+    """
+    Status of the current or last purge of soft-deleted tasks in this process
+    """
+    try:
+        return create_success_response(data=task_purger.status())
+    except Exception as e:
+        return create_error_response(
+            code=ErrorCode.INTERNAL_SERVER_ERROR,
+            message=f"Failed to retrieve the purge status: {str(e)}"
+        )
+
+
+@router.post("/admin/purge", response_model=APIResponse[PurgeStatusSchema])
+def trigger_purge(request: Optional[PurgeRequestSchema] = None):
+    """
+    Start purging the soft-deleted tasks in the background, then poll
+    `GET /admin/purge` for its progress. A purge already running is not
+    restarted, its status is returned.
+    """
+    try:
+        request = request or PurgeRequestSchema()
+        task_purger.trigger(min_age_days=request.min_age_days, dry_run=request.dry_run)
+
+        return create_success_response(data=task_purger.status())
+    except Exception as e:
+        return create_error_response(
+            code=ErrorCode.INTERNAL_SERVER_ERROR,
+            message=f"Failed to start the purge: {str(e)}"
+        )
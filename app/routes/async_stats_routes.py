@@ -0,0 +1,103 @@
+from datetime import datetime
+from typing import Optional, cast
+from fastapi import APIRouter, Depends, Header, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.async_session import get_async_db
+from app.models.task_action_rollup_model import RollupBucketEnum
+from app.routes.common import (
+    TaskActionQuery,
+    internal_error_response,
+    statistics_etag,
+    statistics_response,
+    task_actions_response,
+    task_history_response,
+    validation_error_response,
+)
+from app.schemas.reponse_schemas import APIResponse, create_success_response
+from app.services.rollup_service import InvalidTimeRangeError
+from app.services.async_statistics_service import AsyncStatisticsService
+
+from app.schemas.task_statistic_schema import TaskStatisticSchema
+from app.utils.cursor import InvalidCursorError
+from app.utils.etag import etag_matches
+
+router = APIRouter()
+
+@router.get("/statistics", response_model=APIResponse[dict])
+async def get_task_statistics(
+    response: Response,
+    db: AsyncSession = cast(AsyncSession, Depends(get_async_db)),
+    if_none_match: Optional[str] = Header(None)
+):
+    try:
+        # Answer conditional requests from the write version, before reading the counters
+        etag = statistics_etag(await AsyncStatisticsService.get_write_version(db))
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+
+        statistics = await AsyncStatisticsService.get_task_statistics(db)
+        return statistics_response(response, etag, statistics)
+    except Exception as e:
+        return internal_error_response("retrieve task statistics", e)
+
+@router.get("/statistics/timeseries", response_model=APIResponse[dict])
+async def get_action_timeseries(
+    db: AsyncSession = cast(AsyncSession, Depends(get_async_db)),
+    bucket: RollupBucketEnum = RollupBucketEnum.hour,
+    from_: Optional[datetime] = Query(None, alias="from"),
+    to: Optional[datetime] = None
+):
+    try:
+        # Served from the hourly / daily rollups, missing buckets are returned with zero counts
+        timeseries = await AsyncStatisticsService.get_action_timeseries(db, bucket, from_, to)
+
+        return create_success_response(data=timeseries.model_dump(by_alias=True))
+    except InvalidTimeRangeError as e:
+        return validation_error_response(e)
+    except Exception as e:
+        return internal_error_response("retrieve the action timeseries", e)
+
+@router.get("/statistics/actions", response_model=APIResponse[list[TaskStatisticSchema]])
+async def get_task_actions(
+    db: AsyncSession = cast(AsyncSession, Depends(get_async_db)),
+    page: int = 1,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    approximate_total: bool = False,
+    task_id: Optional[int] = None,
+    query: TaskActionQuery = cast(TaskActionQuery, Depends(TaskActionQuery))
+):
+    try:
+        # Get paginated actions, by page or after a cursor (empty for the first page)
+        result = await AsyncStatisticsService.get_paginated_task_actions(
+            db, limit, page, include_total, approximate_total, query.filters(task_id), cursor
+        )
+        return task_actions_response(result, limit, page, cursor)
+    except InvalidCursorError as e:
+        return validation_error_response(e)
+    except Exception as e:
+        return internal_error_response("retrieve task actions", e)
+
+@router.get("/tasks/{task_id}/history", response_model=APIResponse[list[TaskStatisticSchema]])
+async def get_task_history(
+    task_id: int,
+    db: AsyncSession = cast(AsyncSession, Depends(get_async_db)),
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    query: TaskActionQuery = cast(TaskActionQuery, Depends(TaskActionQuery))
+):
+    """
+    Actions of a single task, newest first. Pages are walked with `next_cursor`,
+    each one is an index range read of (task_id, action_at) without counting.
+    """
+    try:
+        result = await AsyncStatisticsService.get_paginated_task_actions(
+            db, limit, include_total=False, filters=query.filters(task_id), cursor=cursor or ""
+        )
+        return task_history_response(result, limit, cursor)
+    except InvalidCursorError as e:
+        return validation_error_response(e)
+    except Exception as e:
+        return internal_error_response("retrieve the task history", e)
@@ -0,0 +1,195 @@
+from typing import Any, Optional, cast
+from typing_extensions import List
+from fastapi import APIRouter, Header, Response
+from fastapi.params import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.async_session import get_async_db
+from app.routes.common import (
+    TaskListQuery,
+    bulk_create_response,
+    internal_error_response,
+    no_valid_tasks_response,
+    not_found_response,
+    task_cursor_page_response,
+    task_etag,
+    task_page_response,
+    validate_bulk_create_items,
+    validation_error_response,
+)
+from app.routes.dependencies import read_bulk_create_items
+from app.routes.idempotency import idempotency_key
+from app.schemas.reponse_schemas import APIResponse, TaskResponseSchema, create_success_response
+from app.schemas.task_schema import TaskBulkCreateResult, TaskCreate, TaskUpdate, TasksBulkAction
+from app.services.async_task_service import AsyncTaskService
+from app.utils.cursor import InvalidCursorError
+from app.utils.etag import etag_matches
+from app.utils.fields import InvalidFieldsError
+
+router = APIRouter()
+
+
+@router.post("/tasks/", response_model=APIResponse[TaskResponseSchema], dependencies=[Depends(idempotency_key)])
+async def create_task(task: TaskCreate, db: AsyncSession = cast(AsyncSession, Depends(get_async_db))):
+    try:
+        created_task = await AsyncTaskService.create_task(db, task)
+        return create_success_response(
+            data=created_task,
+            schema=TaskResponseSchema
+        )
+    except Exception as e:
+        return internal_error_response("create task", e)
+
+@router.post("/tasks/bulk", response_model=APIResponse[TaskBulkCreateResult], dependencies=[Depends(idempotency_key)])
+async def bulk_create_tasks(
+    items: List[Any] = cast(List[Any], Depends(read_bulk_create_items)),
+    db: AsyncSession = cast(AsyncSession, Depends(get_async_db))
+):
+    """
+    Create many tasks at once from a JSON array or an NDJSON stream,
+    invalid tasks are reported by position and the valid ones are created
+    """
+    tasks, failed = validate_bulk_create_items(items)
+    if not tasks:
+        return no_valid_tasks_response(failed)
+
+    try:
+        created_task_ids = await AsyncTaskService.bulk_create_tasks(db, tasks)
+        return bulk_create_response(created_task_ids, failed)
+    except Exception as e:
+        return internal_error_response("perform bulk create", e)
+
+@router.get("/tasks/", response_model=APIResponse[List[TaskResponseSchema]])
+async def list_tasks(
+    response: Response,
+    query: TaskListQuery = cast(TaskListQuery, Depends(TaskListQuery)),
+    db: AsyncSession = cast(AsyncSession, Depends(get_async_db))
+):
+    try:
+        selected_fields = query.selected_fields()
+
+        write_version = await AsyncTaskService.get_write_version(db)
+
+        # Get total count for pagination, exact (cached), estimated or skipped
+        total_tasks = None
+        if query.include_total and query.approximate_total:
+            total_tasks = await AsyncTaskService.get_approximate_task_count(db, query.filters)
+        elif query.include_total:
+            total_tasks = await AsyncTaskService.get_total_task_count(db, query.filters)
+
+        # Answer conditional requests before querying the tasks
+        etag = query.etag(write_version, selected_fields, total_tasks)
+        if etag_matches(query.if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+
+        # Cursor (keyset) mode, an empty cursor requests the first page
+        if query.cursor is not None:
+            result = await AsyncTaskService.get_tasks_by_cursor(
+                db, query.cursor, query.limit, query.order, selected_fields, query.filters, query.sort_by
+            )
+            return task_cursor_page_response(response, query, selected_fields, etag, total_tasks, result)
+
+        # Without an exact total, fetch one extra task to know if there is a next page
+        tasks = await AsyncTaskService.get_tasks(
+            db, query.page, query.limit, query.order, peek=not query.exact_total,
+            fields=selected_fields, filters=query.filters, sort_by=query.sort_by
+        )
+        return task_page_response(response, query, selected_fields, etag, total_tasks, tasks)
+    except (InvalidCursorError, InvalidFieldsError) as e:
+        return validation_error_response(e)
+    except Exception as e:
+        return internal_error_response("retrieve tasks", e)
+
+@router.get("/tasks/{task_id}", response_model=APIResponse[TaskResponseSchema])
+async def get_task(
+    task_id: int,
+    response: Response,
+    db: AsyncSession = cast(AsyncSession, Depends(get_async_db)),
+    if_none_match: Optional[str] = Header(None)
+):
+    try:
+        task = await AsyncTaskService.get_cached_task(db, task_id)
+
+        if not task:
+            return not_found_response(f"Task with ID {task_id} not found")
+
+        # Answer conditional requests from the task itself, mostly a cache hit
+        etag = task_etag(task)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+
+        response.headers["ETag"] = etag
+        return create_success_response(data=task, response=response)
+    except Exception as e:
+        return internal_error_response("retrieve task", e)
+
+@router.put("/tasks/{task_id}", response_model=APIResponse[TaskResponseSchema], dependencies=[Depends(idempotency_key)])
+async def update_task(
+    task_id: int,
+    task: TaskUpdate,
+    db: AsyncSession = cast(AsyncSession, Depends(get_async_db))
+):
+    try:
+        updated_task = await AsyncTaskService.update_task(db, task_id, task)
+
+        if not updated_task:
+            return not_found_response(f"Task with ID {task_id} not found or already deleted")
+
+        return create_success_response(
+            data=updated_task,
+            schema=TaskResponseSchema
+        )
+    except Exception as e:
+        return internal_error_response("update task", e)
+
+@router.delete("/tasks/{task_id}", response_model=APIResponse[bool], dependencies=[Depends(idempotency_key)])
+async def delete_task(
+    task_id: int,
+    db: AsyncSession = cast(AsyncSession, Depends(get_async_db))
+):
+    try:
+        delete_result = await AsyncTaskService.delete_task(db, task_id)
+
+        if not delete_result:
+            return not_found_response(f"Task with ID {task_id} not found or already deleted")
+
+        return create_success_response(data=True)
+    except Exception as e:
+        return internal_error_response("delete task", e)
+
+
+
+@router.patch("/tasks/bulk-delete", response_model=APIResponse[List[int]], dependencies=[Depends(idempotency_key)])
+async def bulk_delete_tasks(
+    delete_request: TasksBulkAction,
+    db: AsyncSession = cast(AsyncSession, Depends(get_async_db))
+):
+    try:
+        # Perform bulk delete
+        deleted_task_ids = await AsyncTaskService.bulk_delete_tasks(db, delete_request.task_ids)
+
+        # Check if any tasks were deleted
+        if not deleted_task_ids:
+            return not_found_response("No tasks found for deletion or all tasks already deleted")
+
+        return create_success_response(data=deleted_task_ids)
+    except Exception as e:
+        return internal_error_response("perform bulk delete", e)
+
+
+@router.patch("/tasks/bulk-complete", response_model=APIResponse[List[int]], dependencies=[Depends(idempotency_key)])
+async def bulk_complete_tasks(
+    complete_request: TasksBulkAction,
+    db: AsyncSession = cast(AsyncSession, Depends(get_async_db))
+):
+    try:
+        # Perform bulk complete
+        completed_task_ids = await AsyncTaskService.bulk_complete_tasks(db=db, task_ids=complete_request.task_ids)
+
+        # Check if any tasks were completed
+        if not completed_task_ids:
+            return not_found_response("No tasks found for completion or all tasks already completed")
+
+        return create_success_response(data=completed_task_ids)
+    except Exception as e:
+        return internal_error_response("perform bulk complete", e)
@@ -0,0 +1,33 @@
+from typing import Optional, cast
+from fastapi import APIRouter
+from fastapi.params import Depends
+from sqlalchemy.orm.session import Session
+
+from app.database.session import get_db
+from app.routes.common import internal_error_response, task_changes_response, validation_error_response
+from app.schemas.reponse_schemas import APIResponse
+from app.schemas.task_schema import TaskChangesResult
+from app.services.task_service import TaskService
+from app.utils.cursor import InvalidCursorError
+
+router = APIRouter()
+
+
+@router.get("/tasks/changes", response_model=APIResponse[TaskChangesResult])
+def get_task_changes(
+    db: Session = cast(Session, Depends(get_db)),
+    since: Optional[str] = None,
+    limit: int = 100
+):
+    """
+    Tasks created, modified or deleted after the `since` token, with a new token.
+    Without a token every live task is returned, clients then keep the last token
+    and call again while `has_more` is true.
+    """
+    try:
+        result = TaskService.get_changes(db, since, limit)
+        return task_changes_response(result)
+    except InvalidCursorError as e:
+        return validation_error_response(e)
+    except Exception as e:
+        return internal_error_response("retrieve task changes", e)
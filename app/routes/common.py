@@ -0,0 +1,293 @@
+"""
+Request parsing, ETags and responses shared by the sync routers and their
+async counterparts, which only differ in the session and service they call
+"""
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from fastapi import Header, Response
+from pydantic import ValidationError
+
+from app.models.task_model import TaskStatusEnum
+from app.models.task_statistics_model import TaskActionEnum
+from app.schemas.reponse_schemas import ErrorCode, PaginationMetadata, TaskResponseSchema, create_error_response, create_success_response
+from app.schemas.task_schema import TaskBulkCreateError, TaskBulkCreateResult, TaskChange, TaskChangesResult, TaskCreate, TaskFilter, TaskSortFieldEnum, TaskSortingModeEnum
+from app.schemas.task_statistic_schema import TaskActionFilter, TaskStatisticSchema, TaskStatisticsOverviewSchema
+from app.services.task_service import TaskService
+from app.utils.cursor import CursorDirectionEnum
+from app.utils.etag import make_etag
+
+
+class TaskListQuery:
+    """
+    Query parameters of the task list
+    """
+
+    def __init__(
+        self,
+        page: int = 1,
+        limit: int = 10,
+        order: TaskSortingModeEnum = TaskSortingModeEnum.desc,
+        sort_by: TaskSortFieldEnum = TaskSortFieldEnum.id,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        approximate_total: bool = False,
+        fields: Optional[str] = None,
+        status: Optional[TaskStatusEnum] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        updated_since: Optional[datetime] = None,
+        title_prefix: Optional[str] = None,
+        title_contains: Optional[str] = None,
+        search: Optional[str] = None,
+        if_none_match: Optional[str] = Header(None)
+    ):
+        self.page = page
+        self.limit = limit
+        self.order = order
+        self.sort_by = sort_by
+        self.cursor = cursor
+        self.include_total = include_total
+        self.approximate_total = approximate_total
+        self.fields = fields
+        self.if_none_match = if_none_match
+
+        self.filters = TaskFilter(
+            status=status,
+            created_after=created_after,
+            created_before=created_before,
+            updated_since=updated_since,
+            title_prefix=title_prefix,
+            title_contains=title_contains,
+            search=search
+        )
+
+    @property
+    def exact_total(self) -> bool:
+        return self.include_total and not self.approximate_total
+
+    def selected_fields(self) -> Optional[List[str]]:
+        """
+        Sparse fieldset, e.g. "id,title,status" to leave out the descriptions
+
+        Raises:
+            InvalidFieldsError: if a field is unknown
+        """
+        return TaskService.parse_task_fields(self.fields)
+
+    def etag(self, write_version: int, selected_fields: Optional[List[str]], total_tasks: Optional[int]) -> str:
+        """
+        ETag of a page, from the write version and the total: the tasks are
+        read from the database but the total may come from the per-process
+        count cache, which another worker's write leaves stale until it expires
+        """
+        return make_etag(
+            "tasks", write_version, total_tasks, self.page, self.limit, self.order.value, self.sort_by.value, self.cursor,
+            self.include_total, self.approximate_total, selected_fields, self.filters.model_dump_json(exclude_none=True)
+        )
+
+
+class TaskActionQuery:
+    """
+    Filters of the task action lists
+    """
+
+    def __init__(
+        self,
+        action: Optional[TaskActionEnum] = None,
+        action_after: Optional[datetime] = None,
+        action_before: Optional[datetime] = None
+    ):
+        self.action = action
+        self.action_after = action_after
+        self.action_before = action_before
+
+    def filters(self, task_id: Optional[int] = None) -> TaskActionFilter:
+        return TaskActionFilter(task_id=task_id, action=self.action, action_after=self.action_after, action_before=self.action_before)
+
+
+def task_etag(task: TaskResponseSchema) -> str:
+    """
+    ETag of a single task, from its content: the task may come from a
+    per-process cache that lags behind the write version
+    """
+    return make_etag("task", task.model_dump_json())
+
+
+def validation_error_response(e: Exception):
+    return create_error_response(code=ErrorCode.VALIDATION_ERROR, message=str(e))
+
+
+def internal_error_response(action: str, e: Exception):
+    return create_error_response(code=ErrorCode.INTERNAL_SERVER_ERROR, message=f"Failed to {action}: {str(e)}")
+
+
+def not_found_response(message: str):
+    return create_error_response(code=ErrorCode.NOT_FOUND, message=message)
+
+
+def get_total_pages(total_items: Optional[int], limit: int) -> Optional[int]:
+    return (total_items + limit - 1) // limit if total_items is not None else None
+
+
+def task_cursor_page_response(
+    response: Response,
+    query: TaskListQuery,
+    selected_fields: Optional[List[str]],
+    etag: str,
+    total_tasks: Optional[int],
+    result: dict
+):
+    """
+    Response of the task list in cursor (keyset) mode
+    """
+    pagination = PaginationMetadata(
+        total_items=total_tasks,
+        total_pages=get_total_pages(total_tasks, query.limit),
+        page_size=query.limit,
+        has_next=result['has_next'],
+        has_previous=result['has_previous'],
+        next_cursor=result['next_cursor'],
+        prev_cursor=result['prev_cursor']
+    )
+
+    response.headers["ETag"] = etag
+    return create_success_response(
+        data=result['tasks'],
+        pagination=pagination,
+        schema=TaskResponseSchema,
+        response=response,
+        fields=selected_fields
+    )
+
+
+def task_page_response(
+    response: Response,
+    query: TaskListQuery,
+    selected_fields: Optional[List[str]],
+    etag: str,
+    total_tasks: Optional[int],
+    tasks: list
+):
+    """
+    Response of the task list in page mode, `tasks` holding one extra task
+    when there is a next page unless the exact total is known
+    """
+    if query.exact_total:
+        has_next = query.page * query.limit < total_tasks
+    else:
+        has_next = len(tasks) > query.limit
+        tasks = tasks[:query.limit]
+
+    # Create pagination metadata, with a cursor so clients can switch to keyset mode
+    pagination = PaginationMetadata(
+        total_items=total_tasks,
+        total_pages=get_total_pages(total_tasks, query.limit),
+        current_page=query.page,
+        page_size=query.limit,
+        has_next=has_next,
+        has_previous=query.page > 1,
+        next_cursor=TaskService.encode_task_cursor(tasks[-1], CursorDirectionEnum.next, query.order, query.sort_by) if tasks and has_next else None
+    )
+
+    response.headers["ETag"] = etag
+    return create_success_response(
+        data=tasks,
+        pagination=pagination,
+        schema=TaskResponseSchema,
+        response=response,
+        fields=selected_fields
+    )
+
+
+def validate_bulk_create_items(items: List[Any]) -> Tuple[List[TaskCreate], List[TaskBulkCreateError]]:
+    """
+    Validate every task of a bulk create on its own so one invalid task does
+    not reject the others, returning the valid tasks and the errors by position
+    """
+    tasks: list[TaskCreate] = []
+    failed: list[TaskBulkCreateError] = []
+    for index, item in enumerate(items):
+        try:
+            if isinstance(item, str):
+                tasks.append(TaskCreate.model_validate_json(item))
+            else:
+                tasks.append(TaskCreate.model_validate(item))
+        except ValidationError as e:
+            failed.append(TaskBulkCreateError(index=index, errors=e.errors(include_url=False, include_context=False)))
+
+    return tasks, failed
+
+
+def no_valid_tasks_response(failed: List[TaskBulkCreateError]):
+    return create_error_response(
+        code=ErrorCode.VALIDATION_ERROR,
+        message="No valid tasks to create",
+        details=[error.model_dump() for error in failed]
+    )
+
+
+def bulk_create_response(created_task_ids: List[int], failed: List[TaskBulkCreateError]):
+    return create_success_response(data=TaskBulkCreateResult(created_ids=created_task_ids, failed=failed))
+
+
+def task_changes_response(result: dict):
+    changes = [
+        TaskChange(
+            id=task.id,
+            deleted=task.is_deleted,
+            task=None if task.is_deleted else TaskResponseSchema.model_validate(task)
+        )
+        for task in result['tasks']
+    ]
+
+    return create_success_response(
+        data=TaskChangesResult(changes=changes, next_token=result['next_token'], has_more=result['has_more'])
+    )
+
+
+def statistics_etag(write_version: int) -> str:
+    return make_etag("statistics", write_version)
+
+
+def statistics_response(response: Response, etag: str, statistics: TaskStatisticsOverviewSchema):
+    response.headers["ETag"] = etag
+    return create_success_response(data=statistics.model_dump(), response=response)
+
+
+def task_actions_response(result: dict, limit: int, page: int, cursor: Optional[str]):
+    """
+    Response of the action list, walked by page or after a cursor
+    """
+    pagination = PaginationMetadata(
+        total_items=result['total_actions'],
+        total_pages=get_total_pages(result['total_actions'], limit),
+        current_page=page if cursor is None else None,
+        page_size=limit,
+        has_next=result['has_next'],
+        has_previous=page > 1 if cursor is None else bool(cursor),
+        next_cursor=result['next_cursor']
+    )
+
+    return create_success_response(
+        data=result['actions'],
+        pagination=pagination,
+        schema=TaskStatisticSchema
+    )
+
+
+def task_history_response(result: dict, limit: int, cursor: Optional[str]):
+    pagination = PaginationMetadata(
+        total_items=None,
+        total_pages=None,
+        page_size=limit,
+        has_next=result['has_next'],
+        has_previous=bool(cursor),
+        next_cursor=result['next_cursor']
+    )
+
+    return create_success_response(
+        data=result['actions'],
+        pagination=pagination,
+        schema=TaskStatisticSchema
+    )
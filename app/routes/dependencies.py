@@ -0,0 +1,79 @@
+import codecs
+import hmac
+import json
+from typing import Any, List, Optional, Union
+
+from fastapi import Header
+from fastapi.exceptions import RequestValidationError
+from fastapi.requests import Request
+
+from app.core.config import settings
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+class AdminAccessError(Exception):
+    """
+    Raised when an admin endpoint is called without the admin token
+    """
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(None)):
+    """
+    Check the X-Admin-Token header against ADMIN_TOKEN, the admin endpoints
+    being closed while no token is configured
+    """
+    if not settings.ADMIN_TOKEN:
+        raise AdminAccessError("Admin endpoints are disabled, ADMIN_TOKEN is not configured")
+
+    if not hmac.compare_digest(x_admin_token or "", settings.ADMIN_TOKEN):
+        raise AdminAccessError("Missing or invalid X-Admin-Token header")
+
+
+async def read_bulk_create_items(request: Request) -> List[Union[dict, Any]]:
+    """
+    Read the tasks of a bulk create request, sent either as a JSON array or as
+    NDJSON (one task per line). Items are not validated here so that invalid
+    ones can be reported individually; NDJSON lines are returned as raw strings.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+
+    if content_type in NDJSON_MEDIA_TYPES:
+        items: List[Any] = []
+        async for line in _iter_lines(request):
+            if line.strip():
+                items.append(line)
+    else:
+        try:
+            items = json.loads(await request.body())
+        except ValueError:
+            raise RequestValidationError([{"loc": ["body"], "msg": "Invalid JSON", "type": "json_invalid"}])
+
+        if not isinstance(items, list):
+            raise RequestValidationError([{"loc": ["body"], "msg": "Expected a list of tasks", "type": "list_type"}])
+
+    if not items:
+        raise RequestValidationError([{"loc": ["body"], "msg": "At least one task is required", "type": "too_short"}])
+
+    if len(items) > settings.BULK_CREATE_MAX_ITEMS:
+        raise RequestValidationError([{
+            "loc": ["body"],
+            "msg": f"At most {settings.BULK_CREATE_MAX_ITEMS} tasks can be created at once",
+            "type": "too_long"
+        }])
+
+    return items
+
+
+async def _iter_lines(request: Request):
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    async for chunk in request.stream():
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line
+
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
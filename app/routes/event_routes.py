@@ -0,0 +1,27 @@
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from app.schemas.reponse_schemas import ErrorCode, create_error_response
+from app.services.event_hub import event_hub
+
+router = APIRouter()
+
+
+@router.get("/events")
+async def stream_events():
+    """
+    Server-Sent Events stream of the task changes (`task.created`, `task.modified`,
+    `task.deleted`) and of the task statistics (`statistics`)
+    """
+    subscriber = event_hub.subscribe()
+    if subscriber is None:
+        return create_error_response(
+            code=ErrorCode.INTERNAL_SERVER_ERROR,
+            message="Event stream unavailable, too many subscribers"
+        )
+
+    return StreamingResponse(
+        event_hub.listen(subscriber),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
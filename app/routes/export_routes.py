@@ -0,0 +1,78 @@
+from datetime import datetime
+from itertools import chain
+from typing import Optional
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from app.database.session import SessionLocal
+from app.models.task_model import TaskStatusEnum
+from app.models.task_statistics_model import TaskActionEnum
+from app.schemas.export_schema import ExportFormatEnum
+from app.services.archive_service import ArchiveService
+from app.services.export_service import TASK_ACTION_EXPORT_COLUMNS, TASK_EXPORT_COLUMNS, ExportService
+
+router = APIRouter()
+
+MEDIA_TYPES = {
+    ExportFormatEnum.ndjson: "application/x-ndjson",
+    ExportFormatEnum.csv: "text/csv",
+}
+
+
+def stream_export(name: str, export_format: ExportFormatEnum, columns, iter_rows) -> StreamingResponse:
+    """
+    Stream the rows returned by `iter_rows(db)`.
+
+    The session is owned by the stream instead of the `get_db` dependency,
+    so it stays open until the last row has been sent.
+    """
+    column_names = [column.key for column in columns]
+
+    def generate():
+        db = SessionLocal()
+        try:
+            yield from ExportService.serialize(iter_rows(db), column_names, export_format)
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        generate(),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{export_format.value}"'}
+    )
+
+
+@router.get("/tasks/export")
+def export_tasks(
+    format: ExportFormatEnum = ExportFormatEnum.ndjson,
+    status: Optional[TaskStatusEnum] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    include_deleted: bool = False
+):
+    return stream_export(
+        "tasks",
+        format,
+        TASK_EXPORT_COLUMNS,
+        lambda db: ExportService.iter_tasks(db, status, created_after, created_before, include_deleted)
+    )
+
+
+@router.get("/statistics/actions/export")
+def export_task_actions(
+    format: ExportFormatEnum = ExportFormatEnum.ndjson,
+    action: Optional[TaskActionEnum] = None,
+    task_id: Optional[int] = None,
+    action_after: Optional[datetime] = None,
+    action_before: Optional[datetime] = None,
+    include_archived: bool = False
+):
+    def iter_rows(db):
+        rows = ExportService.iter_task_actions(db, action, task_id, action_after, action_before)
+        if include_archived:
+            # the archived months are older than every action left in the table
+            rows = chain(ArchiveService.iter_archived_actions(db, action, task_id, action_after, action_before), rows)
+        return rows
+
+    return stream_export("task_actions", format, TASK_ACTION_EXPORT_COLUMNS, iter_rows)
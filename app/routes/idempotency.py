@@ -0,0 +1,203 @@
+import base64
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+from fastapi import Header
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.cache.idempotency_store import (
+    IdempotencyKeyConflictError,
+    IdempotencyKeyInProgressError,
+    IdempotencyStore,
+)
+from app.metrics.collectors import idempotent_requests
+from app.schemas.reponse_schemas import ErrorCode, create_error_response
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+# Header added to the responses replayed from the store
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+WRITE_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+
+def idempotency_key(
+    idempotency_key: Optional[str] = Header(
+        None,
+        alias=IDEMPOTENCY_HEADER,
+        max_length=MAX_KEY_LENGTH,
+        description="Unique key of the request, retries with the same key get the response of the first execution"
+    )
+) -> Optional[str]:
+    """
+    Route dependency enabling Idempotency-Key support, handled by `IdempotencyMiddleware`
+    """
+    return idempotency_key
+
+
+class _BodyHasher:
+    """
+    Receive channel hashing the request body as the route reads it
+    """
+
+    def __init__(self, receive: Receive):
+        self._receive = receive
+        self._hash = hashlib.sha256()
+        self._complete = False
+        self._disconnected = False
+
+    async def receive(self) -> Message:
+        message = await self._receive()
+        if message["type"] == "http.request" and not self._complete:
+            self._hash.update(message.get("body", b""))
+            self._complete = not message.get("more_body", False)
+        elif message["type"] == "http.disconnect":
+            self._disconnected = True
+        return message
+
+    async def digest(self) -> Optional[str]:
+        """
+        Hash of the whole body, reading the rest of it, None if the client
+        disconnected before sending it all
+        """
+        while not self._complete and not self._disconnected:
+            await self.receive()
+        return self._hash.hexdigest() if self._complete else None
+
+
+class IdempotencyMiddleware:
+    """
+    Execute the write requests of the routes depending on `idempotency_key`
+    once per Idempotency-Key.
+
+    The response of the first execution is stored and replayed, byte for byte,
+    to the retries sent with the same key and the same method, path, query and
+    body. Duplicates arriving while the first one runs wait for its response.
+    Responses of failed executions (5xx or `internal_server_error`) are handed
+    to the waiting duplicates but not stored, so a later retry executes again.
+
+    The body is never buffered: it is hashed while it streams to the route,
+    and the hash of a retry is compared once its body has been read.
+    """
+
+    def __init__(self, app: ASGIApp, store: IdempotencyStore, wait_timeout: float = 30.0):
+        self.app = app
+        self.store = store
+        self.wait_timeout = wait_timeout
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        key = self._get_key(scope)
+        # keys over the maximum length are rejected by the route dependency
+        if not key or len(key) > MAX_KEY_LENGTH or not self._is_idempotent_route(scope):
+            await self.app(scope, receive, send)
+            return
+
+        fingerprint = hashlib.sha256(
+            b"\n".join((scope["method"].encode(), scope["path"].encode(), scope.get("query_string", b"")))
+        ).hexdigest()
+        body = _BodyHasher(receive)
+
+        coalesced = self.store.is_in_flight(key)
+        try:
+            stored = await self.store.begin(key, fingerprint, self.wait_timeout)
+            if stored is not None and await body.digest() != stored.get('body_hash'):
+                raise IdempotencyKeyConflictError("Idempotency-Key already used for a different request")
+        except IdempotencyKeyConflictError as e:
+            idempotent_requests.inc(1, "conflict")
+            await self._send_error(send, 422, ErrorCode.VALIDATION_ERROR, str(e))
+            return
+        except IdempotencyKeyInProgressError as e:
+            idempotent_requests.inc(1, "timeout")
+            await self._send_error(send, 409, ErrorCode.CONFLICT, str(e))
+            return
+
+        if stored is not None:
+            idempotent_requests.inc(1, "coalesced" if coalesced else "replayed")
+            await self._replay(stored, send)
+            return
+
+        idempotent_requests.inc(1, "executed")
+        response: Dict[str, Any] = {'fingerprint': fingerprint, 'status': 500, 'headers': [], 'body': ""}
+        body_parts: List[bytes] = []
+
+        async def send_and_capture(message: Message):
+            if message["type"] == "http.response.start":
+                response['status'] = message["status"]
+                response['headers'] = [
+                    [name.decode("latin-1"), value.decode("latin-1")] for name, value in message.get("headers", [])
+                ]
+            elif message["type"] == "http.response.body":
+                body_parts.append(message.get("body", b""))
+            await send(message)
+
+        completed = False
+        try:
+            await self.app(scope, body.receive, send_and_capture)
+            # read what the route left of the body, a partial one is not stored
+            response['body_hash'] = await body.digest()
+            completed = True
+        finally:
+            if completed:
+                response['body'] = base64.b64encode(b"".join(body_parts)).decode()
+                store = response['body_hash'] is not None and self._is_success(response['status'], body_parts)
+                self.store.finish(key, response, store=store)
+            else:
+                self.store.finish(key, None)
+
+    @staticmethod
+    def _get_key(scope: Scope) -> Optional[str]:
+        name = IDEMPOTENCY_HEADER.lower().encode()
+        for header, value in scope["headers"]:
+            if header == name:
+                return value.decode("latin-1").strip()
+        return None
+
+    @staticmethod
+    def _is_idempotent_route(scope: Scope) -> bool:
+        # resolve the route the way the router will, the first full match wins
+        for route in scope["app"].router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                dependant = getattr(route, "dependant", None)
+                return dependant is not None and any(
+                    dependency.call is idempotency_key for dependency in dependant.dependencies
+                )
+        return False
+
+    @staticmethod
+    def _is_success(status: int, body_parts: List[bytes]) -> bool:
+        if status >= 500:
+            return False
+        try:
+            payload = json.loads(b"".join(body_parts))
+        except ValueError:
+            return True
+        # errors are returned in a 200 envelope
+        error = payload.get("error") if isinstance(payload, dict) else None
+        return not (isinstance(error, dict) and error.get("code") == ErrorCode.INTERNAL_SERVER_ERROR.value)
+
+    @staticmethod
+    async def _replay(stored: Dict[str, Any], send: Send):
+        headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in stored['headers']]
+        headers.append((REPLAYED_HEADER.lower().encode(), b"true"))
+
+        await send({"type": "http.response.start", "status": stored['status'], "headers": headers})
+        await send({"type": "http.response.body", "body": base64.b64decode(stored['body'])})
+
+    @staticmethod
+    async def _send_error(send: Send, status: int, code: ErrorCode, message: str):
+        body = json.dumps(create_error_response(code=code, message=message).model_dump()).encode()
+
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
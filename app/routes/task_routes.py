@@ -1,87 +1,129 @@
-from typing import cast
+from typing import Any, Optional, cast
 from typing_extensions import List
-from fastapi import APIRouter
+from fastapi import APIRouter, Header, Response
 from fastapi.params import Depends
 from sqlalchemy.orm.session import Session
 
 from app.database.session import get_db
-from app.schemas.reponse_schemas import APIResponse, ErrorCode, PaginationMetadata, TaskResponseSchema, create_error_response, create_success_response
-from app.schemas.task_schema import TaskCreate, TaskSchema, TaskSortingModeEnum, TaskUpdate, TasksBulkAction
+from app.routes.common import (
+    TaskListQuery,
+    bulk_create_response,
+    internal_error_response,
+    no_valid_tasks_response,
+    not_found_response,
+    task_cursor_page_response,
+    task_etag,
+    task_page_response,
+    validate_bulk_create_items,
+    validation_error_response,
+)
+from app.routes.dependencies import read_bulk_create_items
+from app.routes.idempotency import idempotency_key
+from app.schemas.reponse_schemas import APIResponse, TaskResponseSchema, create_success_response
+from app.schemas.task_schema import TaskBulkCreateResult, TaskCreate, TaskUpdate, TasksBulkAction
 from app.services.task_service import TaskService
+from app.utils.cursor import InvalidCursorError
+from app.utils.etag import etag_matches
+from app.utils.fields import InvalidFieldsError
 
 router = APIRouter()
 
 
-@router.post("/tasks/", response_model=APIResponse[TaskResponseSchema])
+@router.post("/tasks/", response_model=APIResponse[TaskResponseSchema], dependencies=[Depends(idempotency_key)])
 def create_task(task: TaskCreate, db: Session = cast(Session, Depends(get_db))):
     try:
         created_task = TaskService.create_task(db, task)
         return create_success_response(
-            data=TaskResponseSchema.model_validate(created_task)
+            data=created_task,
+            schema=TaskResponseSchema
         )
     except Exception as e:
-        return create_error_response(
-            code=ErrorCode.INTERNAL_SERVER_ERROR,
-            message=f"Failed to create task: {str(e)}"
-        )
+        return internal_error_response("create task", e)
+
+@router.post("/tasks/bulk", response_model=APIResponse[TaskBulkCreateResult], dependencies=[Depends(idempotency_key)])
+def bulk_create_tasks(
+    items: List[Any] = cast(List[Any], Depends(read_bulk_create_items)),
+    db: Session = cast(Session, Depends(get_db))
+):
+    """
+    Create many tasks at once from a JSON array or an NDJSON stream,
+    invalid tasks are reported by position and the valid ones are created
+    """
+    tasks, failed = validate_bulk_create_items(items)
+    if not tasks:
+        return no_valid_tasks_response(failed)
+
+    try:
+        created_task_ids = TaskService.bulk_create_tasks(db, tasks)
+        return bulk_create_response(created_task_ids, failed)
+    except Exception as e:
+        return internal_error_response("perform bulk create", e)
 
 @router.get("/tasks/", response_model=APIResponse[List[TaskResponseSchema]])
 def list_tasks(
-    db: Session = cast(Session, Depends(get_db)),
-    page: int = 1,
-    limit: int = 10,
-    order: TaskSortingModeEnum = TaskSortingModeEnum.desc
+    response: Response,
+    query: TaskListQuery = cast(TaskListQuery, Depends(TaskListQuery)),
+    db: Session = cast(Session, Depends(get_db))
 ):
     try:
-        # Get total count for pagination
-        total_tasks = TaskService.get_total_task_count(db)
-
-        tasks = TaskService.get_tasks(db, page, limit, order)
-
-        # Convert to response schema
-        task_responses = [TaskResponseSchema.model_validate(task) for task in tasks]
-
-        # Create pagination metadata
-        pagination = PaginationMetadata(
-            total_items=total_tasks,
-            total_pages=(total_tasks + limit - 1) // limit,
-            current_page=page,
-            page_size=limit,
-            has_next=page * limit < total_tasks,
-            has_previous=page > 1
-        )
+        selected_fields = query.selected_fields()
+
+        write_version = TaskService.get_write_version(db)
+
+        # Get total count for pagination, exact (cached), estimated or skipped
+        total_tasks = None
+        if query.include_total and query.approximate_total:
+            total_tasks = TaskService.get_approximate_task_count(db, query.filters)
+        elif query.include_total:
+            total_tasks = TaskService.get_total_task_count(db, query.filters)
+
+        # Answer conditional requests before querying the tasks
+        etag = query.etag(write_version, selected_fields, total_tasks)
+        if etag_matches(query.if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+
+        # Cursor (keyset) mode, an empty cursor requests the first page
+        if query.cursor is not None:
+            result = TaskService.get_tasks_by_cursor(
+                db, query.cursor, query.limit, query.order, selected_fields, query.filters, query.sort_by
+            )
+            return task_cursor_page_response(response, query, selected_fields, etag, total_tasks, result)
 
-        return create_success_response(
-            data=task_responses,
-            pagination=pagination
+        # Without an exact total, fetch one extra task to know if there is a next page
+        tasks = TaskService.get_tasks(
+            db, query.page, query.limit, query.order, peek=not query.exact_total,
+            fields=selected_fields, filters=query.filters, sort_by=query.sort_by
         )
+        return task_page_response(response, query, selected_fields, etag, total_tasks, tasks)
+    except (InvalidCursorError, InvalidFieldsError) as e:
+        return validation_error_response(e)
     except Exception as e:
-        return create_error_response(
-            code=ErrorCode.INTERNAL_SERVER_ERROR,
-            message=f"Failed to retrieve tasks: {str(e)}"
-        )
+        return internal_error_response("retrieve tasks", e)
 
 @router.get("/tasks/{task_id}", response_model=APIResponse[TaskResponseSchema])
-def get_task(task_id: int, db: Session = cast(Session, Depends(get_db))):
+def get_task(
+    task_id: int,
+    response: Response,
+    db: Session = cast(Session, Depends(get_db)),
+    if_none_match: Optional[str] = Header(None)
+):
     try:
-        task = TaskService.get_task_by_id(db, task_id)
+        task = TaskService.get_cached_task(db, task_id)
 
         if not task:
-            return create_error_response(
-                code=ErrorCode.NOT_FOUND,
-                message=f"Task with ID {task_id} not found"
-            )
+            return not_found_response(f"Task with ID {task_id} not found")
 
-        return create_success_response(
-            data=TaskResponseSchema.model_validate(task)
-        )
+        # Answer conditional requests from the task itself, mostly a cache hit
+        etag = task_etag(task)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+
+        response.headers["ETag"] = etag
+        return create_success_response(data=task, response=response)
     except Exception as e:
-        return create_error_response(
-            code=ErrorCode.INTERNAL_SERVER_ERROR,
-            message=f"Failed to retrieve task: {str(e)}"
-        )
+        return internal_error_response("retrieve task", e)
 
-@router.put("/tasks/{task_id}", response_model=APIResponse[TaskResponseSchema])
+@router.put("/tasks/{task_id}", response_model=APIResponse[TaskResponseSchema], dependencies=[Depends(idempotency_key)])
 def update_task(
     task_id: int,
     task: TaskUpdate,
@@ -91,21 +133,16 @@ def update_task(
         updated_task = TaskService.update_task(db, task_id, task)
 
         if not updated_task:
-            return create_error_response(
-                code=ErrorCode.NOT_FOUND,
-                message=f"Task with ID {task_id} not found or already deleted"
-            )
+            return not_found_response(f"Task with ID {task_id} not found or already deleted")
 
         return create_success_response(
-            data=TaskResponseSchema.model_validate(updated_task)
+            data=updated_task,
+            schema=TaskResponseSchema
         )
     except Exception as e:
-        return create_error_response(
-            code=ErrorCode.INTERNAL_SERVER_ERROR,
-            message=f"Failed to update task: {str(e)}"
-        )
+        return internal_error_response("update task", e)
 
-@router.delete("/tasks/{task_id}", response_model=APIResponse[bool])
+@router.delete("/tasks/{task_id}", response_model=APIResponse[bool], dependencies=[Depends(idempotency_key)])
 def delete_task(
     task_id: int,
     db: Session = cast(Session, Depends(get_db))
@@ -114,21 +151,15 @@ def delete_task(
         delete_result = TaskService.delete_task(db, task_id)
 
         if not delete_result:
-            return create_error_response(
-                code=ErrorCode.NOT_FOUND,
-                message=f"Task with ID {task_id} not found or already deleted"
-            )
+            return not_found_response(f"Task with ID {task_id} not found or already deleted")
 
         return create_success_response(data=True)
     except Exception as e:
-        return create_error_response(
-            code=ErrorCode.INTERNAL_SERVER_ERROR,
-            message=f"Failed to delete task: {str(e)}"
-        )
+        return internal_error_response("delete task", e)
 
 
 
-@router.patch("/tasks/bulk-delete", response_model=APIResponse[List[int]])
+@router.patch("/tasks/bulk-delete", response_model=APIResponse[List[int]], dependencies=[Depends(idempotency_key)])
 def bulk_delete_tasks(
     delete_request: TasksBulkAction,
     db: Session = cast(Session, Depends(get_db))
@@ -139,20 +170,14 @@ def bulk_delete_tasks(
 
         # Check if any tasks were deleted
         if not deleted_task_ids:
-            return create_error_response(
-                code=ErrorCode.NOT_FOUND,
-                message="No tasks found for deletion or all tasks already deleted"
-            )
+            return not_found_response("No tasks found for deletion or all tasks already deleted")
 
         return create_success_response(data=deleted_task_ids)
     except Exception as e:
-        return create_error_response(
-            code=ErrorCode.INTERNAL_SERVER_ERROR,
-            message=f"Failed to perform bulk delete: {str(e)}"
-        )
+        return internal_error_response("perform bulk delete", e)
 
 
-@router.patch("/tasks/bulk-complete", response_model=APIResponse[List[int]])
+@router.patch("/tasks/bulk-complete", response_model=APIResponse[List[int]], dependencies=[Depends(idempotency_key)])
 def bulk_complete_tasks(
     complete_request: TasksBulkAction,
     db: Session = cast(Session, Depends(get_db))
@@ -163,14 +188,8 @@ def bulk_complete_tasks(
 
         # Check if any tasks were completed
         if not completed_task_ids:
-            return create_error_response(
-                code=ErrorCode.NOT_FOUND,
-                message="No tasks found for completion or all tasks already completed"
-            )
+            return not_found_response("No tasks found for completion or all tasks already completed")
 
         return create_success_response(data=completed_task_ids)
     except Exception as e:
-        return create_error_response(
-            code=ErrorCode.INTERNAL_SERVER_ERROR,
-            message=f"Failed to perform bulk complete: {str(e)}"
-        )
+        return internal_error_response("perform bulk complete", e)
@@ -0,0 +1,38 @@
+import datetime
+from enum import Enum
+from typing import Optional
+from pydantic import Field
+from pydantic.main import BaseModel
+
+
+class PurgeModeEnum(str, Enum):
+    delete = "delete"
+    archive = "archive"
+
+
+class PurgeStateEnum(str, Enum):
+    idle = "idle"
+    running = "running"
+    completed = "completed"
+    stopped = "stopped"
+    failed = "failed"
+
+
+class PurgeRequestSchema(BaseModel):
+    min_age_days: Optional[int] = Field(None, ge=0, description="Purge the tasks deleted at least this many days ago, TASK_PURGE_MIN_AGE_DAYS by default")
+    dry_run: bool = Field(False, description="Only count the tasks that would be purged")
+
+
+class PurgeStatusSchema(BaseModel):
+    state: PurgeStateEnum = Field(..., description="State of the current or last purge run")
+    mode: PurgeModeEnum = Field(..., description="Whether purged tasks are deleted or moved to tasks_archive")
+    dry_run: bool = False
+    cutoff: Optional[datetime.datetime] = Field(None, description="Tasks deleted before this date are purged")
+    started_at: Optional[datetime.datetime] = None
+    finished_at: Optional[datetime.datetime] = None
+    purged_tasks: int = Field(0, description="Tasks purged by the run so far")
+    deleted_actions: int = Field(0, description="Actions of the purged tasks deleted from task_statistics")
+    batches: int = Field(0, description="Batches committed by the run so far")
+    batch_size: int = Field(..., description="Current batch size, lowered while batches are slow or fail")
+    remaining_tasks: Optional[int] = Field(None, description="Estimated number of tasks left to purge")
+    last_error: Optional[str] = None
@@ -1,24 +1,33 @@
-from typing import Generic, List, Optional, TypeVar
+from typing import Any, Generic, List, Optional, Type, TypeVar, Union
 from pydantic import BaseModel, Field
 from datetime import datetime
 from enum import Enum
+from operator import attrgetter
+from starlette.responses import Response
+import orjson
+
+from app.core.config import settings
 
 # Generic type for data payload
 T = TypeVar('T')
 
 # Pagination Model
 class PaginationMetadata(BaseModel):
-    total_items: int = Field(..., description="Total number of items")
-    total_pages: int = Field(..., description="Total number of pages")
-    current_page: int = Field(..., description="Current page number")
+    total_items: Optional[int] = Field(..., description="Total number of items, None when not requested")
+    total_pages: Optional[int] = Field(..., description="Total number of pages, None when not requested")
+    current_page: Optional[int] = Field(None, description="Current page number, not set in cursor mode")
     page_size: int = Field(..., description="Number of items per page")
     has_next: bool = Field(..., description="Whether there are more pages")
     has_previous: bool = Field(..., description="Whether there are previous pages")
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor of the next page")
+    prev_cursor: Optional[str] = Field(None, description="Opaque cursor of the previous page")
 
 # Error Model
 class ErrorCode(str, Enum):
     NOT_FOUND = "not_found"
     VALIDATION_ERROR = "validation_error"
+    FORBIDDEN = "forbidden"
+    CONFLICT = "conflict"
     INTERNAL_SERVER_ERROR = "internal_server_error"
 
 class ErrorResponse(BaseModel):
@@ -45,11 +54,90 @@ class TaskResponseSchema(BaseModel):
     class Config:
         from_attributes = True
 
-# Example of how to use these models in routes
+class FastJSONResponse(Response):
+    """
+    JSON response whose content is already encoded, or encoded with orjson
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+
+
+def _to_plain(value: Any, fields: Optional[List[str]]) -> Any:
+    """
+    Turn ORM entities, `Row` tuples or schemas into plain structures orjson can encode,
+    reading the schema `fields` directly instead of validating them
+    """
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, (list, tuple)) and not hasattr(value, "_fields"):
+        if fields and value and not isinstance(value[0], (BaseModel, dict)):
+            get_fields = attrgetter(*fields)
+            if len(fields) == 1:
+                return [{fields[0]: get_fields(item)} for item in value]
+            return [dict(zip(fields, get_fields(item))) for item in value]
+        return [_to_plain(item, fields) for item in value]
+    if fields is not None and value is not None:
+        if isinstance(value, dict):
+            return {field: value.get(field) for field in fields}
+        return {field: getattr(value, field) for field in fields}
+    return value
+
+
 def create_success_response(
     data: Optional[T] = None,
-    pagination: Optional[PaginationMetadata] = None
-) -> APIResponse[T]:
+    pagination: Optional[PaginationMetadata] = None,
+    schema: Optional[Type[BaseModel]] = None,
+    fast: Optional[bool] = None,
+    response: Optional[Response] = None,
+    fields: Optional[List[str]] = None
+) -> Union[APIResponse[T], FastJSONResponse]:
+    """
+    Build the success envelope
+
+    `data` may hold ORM entities or `Row` tuples, converted with `schema`.
+    In fast mode (FAST_RESPONSES, or `fast` for a single route) the envelope is
+    encoded straight to bytes with orjson, skipping the pydantic validation and
+    the second validation FastAPI does for `response_model`. Headers set on the
+    route's `response` are carried over to the fast response.
+
+    `fields` restricts the output to a subset of the schema fields (sparse
+    fieldsets), such partial objects would not validate so they always take
+    the fast path.
+    """
+    if fields is not None:
+        fast = True
+    elif fast is None:
+        fast = settings.FAST_RESPONSES
+
+    if fast:
+        content = orjson.dumps(
+            {
+                'success': True,
+                'data': _to_plain(data, fields or (list(schema.model_fields) if schema is not None else None)),
+                'error': None,
+                'pagination': pagination.model_dump() if pagination is not None else None,
+            },
+            option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+        )
+        fast_response = FastJSONResponse(content=content)
+
+        if response is not None:
+            for name, value in response.headers.items():
+                if name != "content-length":
+                    fast_response.headers[name] = value
+
+        return fast_response
+
+    if schema is not None and data is not None:
+        if isinstance(data, (list, tuple)) and not hasattr(data, "_fields"):
+            data = [schema.model_validate(item) for item in data]
+        else:
+            data = schema.model_validate(data)
+
     return APIResponse(
         success=True,
         data=data,
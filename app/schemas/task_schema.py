@@ -2,14 +2,32 @@ from enum import Enum
 from typing_extensions import List
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from app.models.task_model import TaskStatusEnum
+from app.schemas.reponse_schemas import TaskResponseSchema
 
 class TaskSortingModeEnum(str, Enum):
     asc = "asc"
     desc = "desc"
 
+class TaskSortFieldEnum(str, Enum):
+    id = "id"
+    created_at = "created_at"
+    updated_at = "updated_at"
+
+class TaskFilter(BaseModel):
+    status: Optional[TaskStatusEnum] = Field(None, description="Only tasks with this status")
+    created_after: Optional[datetime] = Field(None, description="Only tasks created at or after this date")
+    created_before: Optional[datetime] = Field(None, description="Only tasks created before this date")
+    updated_since: Optional[datetime] = Field(None, description="Only tasks updated at or after this date")
+    title_prefix: Optional[str] = Field(None, description="Only tasks whose title starts with this text")
+    title_contains: Optional[str] = Field(None, description="Only tasks whose title contains this text")
+    search: Optional[str] = Field(None, description="Full-text search in the title and description")
+
+    def is_empty(self) -> bool:
+        return not self.model_dump(exclude_none=True)
+
 class TaskBase(BaseModel):
     title: str = Field(..., min_length=1, max_length=255, description="Task title")
     description: Optional[str] = Field(None, description="Optional task description")
@@ -27,6 +45,24 @@ class TaskUpdate(TaskBase):
 class TasksBulkAction(BaseModel):
     task_ids: List[int] = Field(..., min_length=1, description="List of task IDs to be acted upon")
 
+class TaskBulkCreateError(BaseModel):
+    index: int = Field(..., description="Position of the rejected task in the request")
+    errors: List[Dict[str, Any]] = Field(..., description="Validation errors of the task")
+
+class TaskBulkCreateResult(BaseModel):
+    created_ids: List[int] = Field(..., description="IDs of the created tasks, in request order")
+    failed: List[TaskBulkCreateError] = Field(default_factory=list, description="Tasks rejected by validation")
+
+class TaskChange(BaseModel):
+    id: int = Field(..., description="ID of the changed task")
+    deleted: bool = Field(..., description="Whether the task was deleted (tombstone)")
+    task: Optional[TaskResponseSchema] = Field(None, description="Current state of the task, None for tombstones")
+
+class TaskChangesResult(BaseModel):
+    changes: List[TaskChange] = Field(..., description="Changed tasks, oldest change first")
+    next_token: str = Field(..., description="Token to send as `since` on the next sync")
+    has_more: bool = Field(..., description="Whether more changes are waiting after this batch")
+
 class TaskSchema(TaskBase):
     id: int
     created_at: datetime
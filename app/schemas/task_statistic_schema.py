@@ -1,6 +1,8 @@
 import datetime
+from typing import List, Optional
 from pydantic import Field
 from pydantic.main import BaseModel
+from app.models.task_action_rollup_model import RollupBucketEnum
 from app.models.task_statistics_model import TaskActionEnum
 
 
@@ -13,8 +15,33 @@ class TaskStatisticSchema(BaseModel):
     class Config:
         from_attributes = True
 
+class TaskActionFilter(BaseModel):
+    task_id: Optional[int] = Field(None, description="Only actions of this task")
+    action: Optional[TaskActionEnum] = Field(None, description="Only actions of this type")
+    action_after: Optional[datetime.datetime] = Field(None, description="Only actions at or after this date")
+    action_before: Optional[datetime.datetime] = Field(None, description="Only actions before this date")
+
+    def is_empty(self) -> bool:
+        return not self.model_dump(exclude_none=True)
+
 class TaskStatisticsOverviewSchema(BaseModel):
     total_tasks: int = Field(..., description="Total number of tasks")
     modified_tasks: int = Field(..., description="Number of modified tasks")
     deleted_tasks: int = Field(..., description="Number of deleted tasks")
     completed_tasks: int = Field(..., description="Number of completed tasks")
+
+class TaskActionBucketSchema(BaseModel):
+    bucket_start: datetime.datetime = Field(..., description="Start of the bucket (UTC)")
+    created: int = Field(..., description="Number of tasks created")
+    modified: int = Field(..., description="Number of task modifications")
+    deleted: int = Field(..., description="Number of tasks deleted")
+    completed: int = Field(..., description="Number of tasks that became completed")
+
+class TaskActionTimeseriesSchema(BaseModel):
+    bucket: RollupBucketEnum
+    start: datetime.datetime = Field(..., alias="from", description="Start of the first bucket (inclusive)")
+    end: datetime.datetime = Field(..., alias="to", description="End of the last bucket (exclusive)")
+    series: List[TaskActionBucketSchema]
+
+    class Config:
+        populate_by_name = True
@@ -0,0 +1,147 @@
+import gzip
+import json
+import os
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, Optional
+
+from sqlalchemy.orm.session import Session
+
+from app.core.config import settings
+from app.models.task_statistics_archive_model import TaskStatisticsArchive
+from app.models.task_statistics_model import TaskActionEnum
+from app.schemas.export_schema import ExportFormatEnum
+from app.services.export_service import TASK_ACTION_EXPORT_COLUMNS, ExportService
+from app.services.rollup_service import as_utc
+
+ARCHIVE_COLUMNS = [column.key for column in TASK_ACTION_EXPORT_COLUMNS]
+
+ARCHIVE_EXTENSIONS = {
+    "ndjson": "ndjson.gz",
+    "parquet": "parquet",
+}
+
+
+class ArchiveService:
+    """
+    Writes task actions to compressed files and reads them back.
+
+    Archives hold the export columns of task_statistics, either as gzip
+    compressed NDJSON or as Parquet (zstd), the latter needing pyarrow.
+    """
+
+    @staticmethod
+    def write(rows: Iterable, path: str, archive_format: str) -> Dict[str, int]:
+        """
+        Write the rows to `path`, atomically, returning the number of rows per action
+        """
+        if archive_format not in ARCHIVE_EXTENSIONS:
+            raise ValueError(f"Unknown archive format: {archive_format}")
+
+        counts = dict.fromkeys((action.value for action in TaskActionEnum), 0)
+
+        def counted(rows: Iterable) -> Iterator:
+            for row in rows:
+                counts[row.action.value] += 1
+                yield row
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        temporary_path = f"{path}.tmp"
+
+        if archive_format == "parquet":
+            ArchiveService._write_parquet(counted(rows), temporary_path)
+        else:
+            with gzip.open(temporary_path, "wt", encoding="utf-8") as f:
+                for chunk in ExportService.serialize(counted(rows), ARCHIVE_COLUMNS, ExportFormatEnum.ndjson):
+                    f.write(chunk)
+
+        # the file must be complete on disk before the partition is dropped
+        with open(temporary_path, "rb") as f:
+            os.fsync(f.fileno())
+        os.replace(temporary_path, path)
+
+        return counts
+
+    @staticmethod
+    def _write_parquet(rows: Iterable, path: str):
+        # optional dependency, only needed for Parquet archives
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = pa.schema([
+            ("id", pa.int64()),
+            ("task_id", pa.int64()),
+            ("action", pa.string()),
+            ("action_at", pa.timestamp("s", tz="UTC")),
+        ])
+
+        def write_batch(writer, batch):
+            writer.write_table(pa.table({
+                "id": [row.id for row in batch],
+                "task_id": [row.task_id for row in batch],
+                "action": [row.action.value for row in batch],
+                "action_at": [as_utc(row.action_at) for row in batch],
+            }, schema=schema))
+
+        with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) == settings.EXPORT_BATCH_SIZE:
+                    write_batch(writer, batch)
+                    batch = []
+            if batch:
+                write_batch(writer, batch)
+
+    @staticmethod
+    def read(path: str, archive_format: str) -> Iterator[tuple]:
+        """
+        Read the actions of an archive as (id, task_id, action, action_at) tuples
+        """
+        if archive_format == "parquet":
+            import pyarrow.parquet as pq
+
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=settings.EXPORT_BATCH_SIZE):
+                for row in batch.to_pylist():
+                    yield row["id"], row["task_id"], TaskActionEnum(row["action"]), row["action_at"]
+            return
+
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                row = json.loads(line)
+                yield row["id"], row["task_id"], TaskActionEnum(row["action"]), datetime.fromisoformat(row["action_at"])
+
+    @staticmethod
+    def iter_archived_actions(
+        db: Session,
+        action: Optional[TaskActionEnum] = None,
+        task_id: Optional[int] = None,
+        action_after: Optional[datetime] = None,
+        action_before: Optional[datetime] = None
+    ) -> Iterator[tuple]:
+        """
+        Stream the archived actions matching the filters, oldest archive first.
+        Only the archives overlapping the time range are read, each one in full.
+        """
+        query = db.query(TaskStatisticsArchive).order_by(TaskStatisticsArchive.range_end)
+        if action_after is not None:
+            query = query.filter(TaskStatisticsArchive.range_end > action_after)
+        if action_before is not None:
+            query = query.filter(
+                (TaskStatisticsArchive.range_start == None) | (TaskStatisticsArchive.range_start < action_before)
+            )
+        archives = query.all()
+
+        after = as_utc(action_after) if action_after is not None else None
+        before = as_utc(action_before) if action_before is not None else None
+
+        for archive in archives:
+            for row in ArchiveService.read(archive.path, archive.format):
+                if action is not None and row[2] != action:
+                    continue
+                if task_id is not None and row[1] != task_id:
+                    continue
+                if after is not None and as_utc(row[3]) < after:
+                    continue
+                if before is not None and as_utc(row[3]) >= before:
+                    continue
+                yield row
@@ -0,0 +1,51 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache.single_flight import single_flight
+from app.models.task_action_rollup_model import RollupBucketEnum
+from app.schemas.task_statistic_schema import TaskActionFilter, TaskActionTimeseriesSchema, TaskStatisticsOverviewSchema
+from app.services.counter_service import CounterService
+from app.services.statistics_service import STATISTICS_FLIGHT_KEY, StatisticsService
+
+
+class AsyncStatisticsService:
+    """
+    Async counterpart of `StatisticsService`.
+
+    The queries are shared with the sync service and executed through
+    `AsyncSession.run_sync`, so the I/O goes through the async driver
+    without blocking the event loop.
+    """
+
+    @staticmethod
+    async def get_write_version(db: AsyncSession) -> int:
+        return await db.run_sync(StatisticsService.get_write_version)
+
+    @staticmethod
+    async def get_task_statistics(db: AsyncSession) -> TaskStatisticsOverviewSchema:
+        return await single_flight.do_async(STATISTICS_FLIGHT_KEY, lambda: db.run_sync(CounterService.get))
+
+    @staticmethod
+    async def get_action_timeseries(
+        db: AsyncSession,
+        bucket: RollupBucketEnum = RollupBucketEnum.hour,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> TaskActionTimeseriesSchema:
+        return await db.run_sync(StatisticsService.get_action_timeseries, bucket, start, end)
+
+    @staticmethod
+    async def get_paginated_task_actions(
+        db: AsyncSession,
+        limit: int = 10,
+        page: int = 1,
+        include_total: bool = True,
+        approximate_total: bool = False,
+        filters: Optional[TaskActionFilter] = None,
+        cursor: Optional[str] = None
+    ):
+        return await db.run_sync(
+            StatisticsService.get_paginated_task_actions, limit, page, include_total, approximate_total, filters, cursor
+        )
@@ -0,0 +1,102 @@
+from typing import Optional
+from typing_extensions import List
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache.single_flight import single_flight
+from app.models.task_model import Task
+from app.schemas.reponse_schemas import TaskResponseSchema
+from app.schemas.task_schema import TaskCreate, TaskFilter, TaskSortFieldEnum, TaskSortingModeEnum, TaskUpdate
+from app.services.task_service import TaskService
+
+
+class AsyncTaskService:
+    """
+    Async counterpart of `TaskService`.
+
+    The queries are shared with the sync service and executed through
+    `AsyncSession.run_sync`, so the I/O goes through the async driver
+    without blocking the event loop. Coalesced reads join their flight
+    before `run_sync`, waiting inside it would block the event loop.
+    """
+
+    encode_task_cursor = staticmethod(TaskService.encode_task_cursor)
+    parse_task_fields = staticmethod(TaskService.parse_task_fields)
+
+    @staticmethod
+    async def get_total_task_count(db: AsyncSession, filters: Optional[TaskFilter] = None) -> int:
+        return await single_flight.do_async(
+            TaskService.count_flight_key(filters),
+            lambda: db.run_sync(TaskService.count_tasks, filters)
+        )
+
+    @staticmethod
+    async def get_write_version(db: AsyncSession) -> int:
+        return await db.run_sync(TaskService.get_write_version)
+
+    @staticmethod
+    async def get_approximate_task_count(db: AsyncSession, filters: Optional[TaskFilter] = None) -> int:
+        return await db.run_sync(TaskService.get_approximate_task_count, filters)
+
+    @staticmethod
+    async def get_tasks(
+        db: AsyncSession,
+        page: int = 1,
+        limit: int = 10,
+        order: TaskSortingModeEnum = TaskSortingModeEnum.desc,
+        peek: bool = False,
+        fields: Optional[List[str]] = None,
+        filters: Optional[TaskFilter] = None,
+        sort_by: TaskSortFieldEnum = TaskSortFieldEnum.id
+    ):
+        return await single_flight.do_async(
+            TaskService.page_flight_key(page, limit, order, peek, fields, filters, sort_by),
+            lambda: db.run_sync(TaskService.query_tasks, page, limit, order, peek, fields, filters, sort_by)
+        )
+
+    @staticmethod
+    async def get_tasks_by_cursor(
+        db: AsyncSession,
+        cursor: Optional[str] = None,
+        limit: int = 10,
+        order: TaskSortingModeEnum = TaskSortingModeEnum.desc,
+        fields: Optional[List[str]] = None,
+        filters: Optional[TaskFilter] = None,
+        sort_by: TaskSortFieldEnum = TaskSortFieldEnum.id
+    ):
+        return await db.run_sync(TaskService.get_tasks_by_cursor, cursor, limit, order, fields, filters, sort_by)
+
+    @staticmethod
+    async def get_changes(db: AsyncSession, since: Optional[str] = None, limit: int = 100):
+        return await db.run_sync(TaskService.get_changes, since, limit)
+
+    @staticmethod
+    async def get_task_by_id(db: AsyncSession, task_id: int):
+        return await db.run_sync(TaskService.get_task_by_id, task_id)
+
+    @staticmethod
+    async def get_cached_task(db: AsyncSession, task_id: int) -> Optional[TaskResponseSchema]:
+        return await db.run_sync(TaskService.get_cached_task, task_id)
+
+    @staticmethod
+    async def create_task(db: AsyncSession, task: TaskCreate) -> Task:
+        return await db.run_sync(TaskService.create_task, task)
+
+    @staticmethod
+    async def bulk_create_tasks(db: AsyncSession, tasks: List[TaskCreate]) -> List[int]:
+        return await db.run_sync(TaskService.bulk_create_tasks, tasks)
+
+    @staticmethod
+    async def update_task(db: AsyncSession, task_id: int, updated_task: TaskUpdate) -> Optional[Task]:
+        return await db.run_sync(TaskService.update_task, task_id, updated_task)
+
+    @staticmethod
+    async def delete_task(db: AsyncSession, task_id: int) -> bool:
+        return await db.run_sync(TaskService.delete_task, task_id)
+
+    @staticmethod
+    async def bulk_delete_tasks(db: AsyncSession, task_ids: List[int]) -> List[int]:
+        return await db.run_sync(TaskService.bulk_delete_tasks, task_ids)
+
+    @staticmethod
+    async def bulk_complete_tasks(db: AsyncSession, task_ids: List[int]) -> List[int]:
+        return await db.run_sync(TaskService.bulk_complete_tasks, task_ids)
@@ -0,0 +1,187 @@
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm.session import Session
+
+from app.cache.count_cache import count_cache
+from app.core.config import settings
+from app.database.session import SessionLocal
+from app.metrics.collectors import audit_buffer_dropped, audit_buffer_pending
+from app.models.task_statistics_model import TaskActionEnum, TaskStatistic
+from app.services.rollup_service import RollupService, action_time
+
+logger = logging.getLogger(__name__)
+
+
+class AuditBuffer:
+    """
+    Batches `task_statistics` inserts across requests.
+
+    Entries are handed over only after the transaction that produced them has
+    committed, and are written by a background thread with multi-row inserts
+    of at most `max_size` entries once the buffer holds `max_size` entries or
+    its oldest entry is `max_age` seconds old, together with the matching
+    hourly and daily rollups. Writers never flush themselves, so no insert runs
+    on the event loop in async mode.
+
+    When a flush fails the entries are kept and retried `max_age` seconds later.
+    The buffer holds at most `max_pending` entries, the oldest ones are dropped
+    beyond that (counted in `audit_buffer_dropped_total`) so a database outage
+    does not exhaust the memory. Entries still buffered when the process dies
+    are lost as well, so this mode trades audit durability for write throughput.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        max_size: int = 500,
+        max_age: float = 1.0,
+        max_pending: int = 50000
+    ):
+        self.session_factory = session_factory
+        self.max_size = max_size
+        self.max_age = max_age
+        self.max_pending = max(max_pending, max_size)
+
+        self._entries: List[Dict] = []
+        self._completions: List[Tuple[datetime, int]] = []
+        self._oldest_at: Optional[float] = None
+        self._retry_at = 0.0
+        self._dropping = False
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, task_ids: List[int], action_type: TaskActionEnum, completed: int = 0):
+        action_at = action_time()
+
+        with self._lock:
+            if not self._entries:
+                self._oldest_at = time.monotonic()
+            self._entries.extend(
+                {'task_id': task_id, 'action': action_type, 'action_at': action_at}
+                for task_id in task_ids
+            )
+            if completed:
+                self._completions.append((action_at, completed))
+            self._drop_overflow()
+            should_flush = len(self._entries) >= self.max_size
+
+        if should_flush:
+            # without the background thread (scripts), flush in the caller
+            if self._thread is None:
+                self.flush()
+            else:
+                self._wake.set()
+
+    def _drop_overflow(self):
+        """
+        Drop the oldest entries beyond `max_pending`, with their completions. Called with the lock held.
+        """
+        overflow = len(self._entries) - self.max_pending
+        if overflow > 0:
+            del self._entries[:overflow]
+            kept_from = self._entries[0]['action_at']
+            self._completions = [completion for completion in self._completions if completion[0] >= kept_from]
+
+            audit_buffer_dropped.inc(overflow)
+            # logged once per outage, the metric counts every dropped action
+            if not self._dropping:
+                self._dropping = True
+                logger.warning("Audit buffer full, dropping the oldest task actions until a flush succeeds")
+
+        audit_buffer_pending.set(len(self._entries))
+
+    def flush(self) -> int:
+        """
+        Write the buffered entries in batches of `max_size`, returns the number
+        of rows inserted. Stops at the first failed batch, which is kept for a
+        later retry.
+        """
+        flushed = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    entries, self._entries = self._entries[:self.max_size], self._entries[self.max_size:]
+                    # the completions are written with the first batch
+                    completions, self._completions = self._completions, []
+                    self._oldest_at = time.monotonic() if self._entries else None
+                    audit_buffer_pending.set(len(self._entries))
+
+                if not entries:
+                    break
+
+                db = self.session_factory()
+                try:
+                    db.execute(insert(TaskStatistic), entries)
+                    RollupService.add(db, [
+                        *((entry['action_at'], entry['action'].value, 1) for entry in entries),
+                        *((completed_at, 'completed', count) for completed_at, count in completions),
+                    ])
+                    db.commit()
+                except Exception:
+                    db.rollback()
+                    logger.exception("Failed to flush %d buffered task actions, retrying later", len(entries))
+
+                    # put the entries back in front of the newer ones
+                    with self._lock:
+                        self._entries[:0] = entries
+                        self._completions[:0] = completions
+                        self._oldest_at = time.monotonic()
+                        self._retry_at = time.monotonic() + self.max_age
+                        self._drop_overflow()
+                    break
+                finally:
+                    db.close()
+
+                flushed += len(entries)
+                self._dropping = False
+
+        if flushed:
+            count_cache.invalidate()
+        return flushed
+
+    def _should_flush(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            if not self._entries or now < self._retry_at:
+                return False
+            return len(self._entries) >= self.max_size or now - self._oldest_at >= self.max_age
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.max_age / 4)
+            self._wake.clear()
+            if not self._stop.is_set() and self._should_flush():
+                self.flush()
+
+    def start(self):
+        if self._thread is not None:
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-buffer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        self.flush()
+
+
+audit_buffer = AuditBuffer(
+    SessionLocal,
+    max_size=settings.AUDIT_BUFFER_MAX_SIZE,
+    max_age=settings.AUDIT_BUFFER_MAX_AGE,
+    max_pending=settings.AUDIT_BUFFER_MAX_PENDING
+)
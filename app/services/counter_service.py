@@ -0,0 +1,177 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import and_, func
+from sqlalchemy.orm.session import Session
+
+from app.models.task_counter_model import TaskCounter
+from app.models.task_model import Task, TaskStatusEnum
+from app.models.task_statistics_archive_model import TaskStatisticsArchive
+from app.models.task_statistics_model import TaskActionEnum, TaskStatistic
+from app.schemas.task_statistic_schema import TaskStatisticsOverviewSchema
+
+# Primary key of the summary row
+SUMMARY_ROW_ID = 1
+
+
+class CounterService:
+    @staticmethod
+    def apply(
+        db: Session,
+        total: int = 0,
+        completed: int = 0,
+        modified: int = 0,
+        deleted: int = 0,
+        before_write: bool = False
+    ) -> int:
+        """
+        Add deltas to the counters and bump the write version as part of the
+        caller's transaction, returning the new version.
+
+        The summary row stays locked until the caller commits, so writes commit
+        in version order and the version can serve as a change sequence.
+
+        If the summary row does not exist yet, the pending changes are flushed
+        and the row is rebuilt from the base tables, which then already include
+        the change, unless `before_write` tells the change is written after
+        this call (inserts stamped with the returned version).
+        """
+        updated = db.query(TaskCounter).filter(TaskCounter.id == SUMMARY_ROW_ID).update(
+            {
+                TaskCounter.total_tasks: TaskCounter.total_tasks + total,
+                TaskCounter.completed_tasks: TaskCounter.completed_tasks + completed,
+                TaskCounter.modified_tasks: TaskCounter.modified_tasks + modified,
+                TaskCounter.deleted_tasks: TaskCounter.deleted_tasks + deleted,
+                TaskCounter.version: TaskCounter.version + 1,
+            },
+            synchronize_session=False
+        )
+
+        if not updated:
+            db.flush()
+            version = CounterService.reconcile(db, commit=False).version
+            if before_write:
+                return CounterService.apply(db, total, completed, modified, deleted)
+            return version
+
+        return CounterService.get_version(db)
+
+    @staticmethod
+    def get(db: Session) -> TaskStatisticsOverviewSchema:
+        """
+        Read the counters, building the summary row on first use
+        """
+        counter = db.query(TaskCounter).filter(TaskCounter.id == SUMMARY_ROW_ID).first()
+
+        if counter is None:
+            counter = CounterService.reconcile(db)
+
+        return TaskStatisticsOverviewSchema(
+            total_tasks=counter.total_tasks,
+            modified_tasks=counter.modified_tasks,
+            deleted_tasks=counter.deleted_tasks,
+            completed_tasks=counter.completed_tasks
+        )
+
+    @staticmethod
+    def get_version(db: Session) -> int:
+        """
+        Get the write version, a single primary key lookup
+        """
+        version = db.query(TaskCounter.version).filter(TaskCounter.id == SUMMARY_ROW_ID).scalar()
+        return version or 0
+
+    @staticmethod
+    def record_purge(db: Session, change_seq: int, modified: int = 0, deleted: int = 0) -> int:
+        """
+        Record soft-deleted tasks hard-deleted by the purge as part of the
+        caller's transaction: the counters lose the deleted actions of the
+        purged tasks, if any, and the purge watermark is raised to the highest
+        change_seq of the purged tasks. Returns the new write version.
+        """
+        version = CounterService.apply(db, modified=modified, deleted=deleted)
+
+        db.query(TaskCounter)\
+            .filter(TaskCounter.id == SUMMARY_ROW_ID, TaskCounter.purged_change_seq < change_seq)\
+            .update({TaskCounter.purged_change_seq: change_seq}, synchronize_session=False)
+
+        return version
+
+    @staticmethod
+    def get_purged_change_seq(db: Session) -> int:
+        """
+        Get the highest change_seq of the purged tasks, 0 when nothing was purged
+        """
+        purged_change_seq = db.query(TaskCounter.purged_change_seq).filter(TaskCounter.id == SUMMARY_ROW_ID).scalar()
+        return purged_change_seq or 0
+
+    @staticmethod
+    def count_base_tables(db: Session) -> TaskStatisticsOverviewSchema:
+        """
+        Count the statistics from the tasks and task_statistics tables (full scans),
+        adding the actions moved to archive files
+        """
+        # Total tasks (excluding soft-deleted)
+        total_tasks = db.query(Task).filter(Task.is_deleted == False).count()
+
+        # Modified tasks
+        modified_tasks = db.query(TaskStatistic)\
+            .filter(TaskStatistic.action == TaskActionEnum.modified)\
+            .count()
+
+        # Deleted tasks
+        deleted_tasks = db.query(TaskStatistic)\
+            .filter(TaskStatistic.action == TaskActionEnum.deleted)\
+            .count()
+
+        # Actions of the archived partitions
+        archived_modified, archived_deleted = db.query(
+            func.coalesce(func.sum(TaskStatisticsArchive.modified_count), 0),
+            func.coalesce(func.sum(TaskStatisticsArchive.deleted_count), 0)
+        ).one()
+        modified_tasks += archived_modified
+        deleted_tasks += archived_deleted
+
+        # Completed tasks
+        completed_tasks = db.query(Task)\
+            .filter(and_(
+                Task.status == TaskStatusEnum.completed,
+                Task.is_deleted == False
+            ))\
+            .count()
+
+        return TaskStatisticsOverviewSchema(
+            total_tasks=total_tasks,
+            modified_tasks=modified_tasks,
+            deleted_tasks=deleted_tasks,
+            completed_tasks=completed_tasks
+        )
+
+    @staticmethod
+    def reconcile(db: Session, commit: bool = True) -> TaskCounter:
+        """
+        Recompute the counters from the base tables
+
+        The summary row is locked first, so writers wait for the recount
+        and no change is counted twice or missed.
+        """
+        counter = db.query(TaskCounter).filter(TaskCounter.id == SUMMARY_ROW_ID).with_for_update().first()
+        if counter is None:
+            counter = TaskCounter(id=SUMMARY_ROW_ID, version=0)
+            db.add(counter)
+
+        statistics = CounterService.count_base_tables(db)
+
+        counter.total_tasks = statistics.total_tasks
+        counter.completed_tasks = statistics.completed_tasks
+        counter.modified_tasks = statistics.modified_tasks
+        counter.deleted_tasks = statistics.deleted_tasks
+        counter.reconciled_at = datetime.now(timezone.utc)
+        counter.version += 1
+
+        if commit:
+            db.commit()
+            db.refresh(counter)
+        else:
+            db.flush()
+
+        return counter
@@ -0,0 +1,244 @@
+import asyncio
+import inspect
+import logging
+import threading
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Union
+
+import orjson
+
+from app.core.config import settings
+from app.database.session import SessionLocal
+from app.services.statistics_service import StatisticsService
+
+logger = logging.getLogger(__name__)
+
+
+def format_event(event_type: str, data) -> str:
+    """
+    Encode an event as a Server-Sent Events frame
+    """
+    return f"event: {event_type}\ndata: {orjson.dumps(data, option=orjson.OPT_UTC_Z).decode()}\n\n"
+
+
+class Subscriber:
+    def __init__(self, queue_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.close_reason: Optional[str] = None
+
+
+class EventHub:
+    """
+    In-process fan-out of task events to the event stream subscribers.
+
+    `publish` may be called from any thread, it encodes the event once and
+    hands it to the event loop. The events published during one loop iteration
+    are joined and put as a single item in the bounded queue of every
+    subscriber, so bursts of writes do not fill the queues. Writers never wait
+    for subscribers: a subscriber whose queue is full is dropped, and is told
+    so (`closed` event), so it can reconnect and catch up through the changes
+    endpoint.
+
+    Writes only mark the statistics as stale, they are read and broadcast at
+    most every `statistics_interval` seconds whatever the write rate. A
+    coroutine `statistics_loader` is awaited on the loop, a plain one runs in
+    the default executor.
+
+    The hub only sees the writes of its own process: with several workers,
+    a subscriber misses the events of the writes handled by the others.
+    """
+
+    def __init__(
+        self,
+        statistics_loader: Callable[[], Union[Dict, Awaitable[Dict]]],
+        queue_size: int = 100,
+        max_subscribers: int = 10000,
+        statistics_interval: float = 1.0,
+        heartbeat_interval: float = 15.0
+    ):
+        self.statistics_loader = statistics_loader
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self.statistics_interval = statistics_interval
+        self.heartbeat_interval = heartbeat_interval
+
+        self._subscribers: Set[Subscriber] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._statistics_task: Optional[asyncio.Task] = None
+        self._statistics_dirty = True
+        self._statistics_frame: Optional[str] = None
+        self._pending: List[str] = []
+        self._pending_lock = threading.Lock()
+
+        self.published = 0
+        self.dropped_subscribers = 0
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    async def start(self):
+        if self._loop is not None:
+            return
+
+        self._loop = asyncio.get_running_loop()
+        self._statistics_task = asyncio.create_task(self._broadcast_statistics())
+
+    async def stop(self):
+        if self._statistics_task is not None:
+            self._statistics_task.cancel()
+            try:
+                await self._statistics_task
+            except asyncio.CancelledError:
+                pass
+            self._statistics_task = None
+
+        for subscriber in list(self._subscribers):
+            self._close(subscriber, "shutdown")
+        self._loop = None
+
+    def mark_statistics_dirty(self):
+        self._statistics_dirty = True
+
+    def publish(self, event_type: str, data):
+        """
+        Broadcast an event to the current subscribers, safe to call from any thread
+        """
+        loop = self._loop
+        if loop is None or not self._subscribers:
+            return
+
+        frame = format_event(event_type, data)
+        with self._pending_lock:
+            self._pending.append(frame)
+            if len(self._pending) > 1:
+                # a flush is already scheduled
+                return
+
+        try:
+            loop.call_soon_threadsafe(self._flush_pending)
+        except RuntimeError:
+            # the loop is closed, the application is shutting down
+            pass
+
+    def subscribe(self) -> Optional[Subscriber]:
+        """
+        Register a subscriber, None when the hub is not running or full
+        """
+        if self._loop is None or len(self._subscribers) >= self.max_subscribers:
+            return None
+
+        subscriber = Subscriber(self.queue_size)
+        self._subscribers.add(subscriber)
+
+        # start with the counters, fresh ones are sent with the next broadcast
+        if self._statistics_frame is not None and not self._statistics_dirty:
+            subscriber.queue.put_nowait(self._statistics_frame)
+        else:
+            self._statistics_dirty = True
+
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self._subscribers.discard(subscriber)
+
+    async def listen(self, subscriber: Subscriber) -> AsyncIterator[str]:
+        """
+        Frames of a subscriber, with a comment as heartbeat when idle
+        """
+        try:
+            while True:
+                try:
+                    frame = await asyncio.wait_for(subscriber.queue.get(), timeout=self.heartbeat_interval)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+
+                if frame is None:
+                    yield format_event("closed", {"reason": subscriber.close_reason})
+                    return
+                yield frame
+        finally:
+            self.unsubscribe(subscriber)
+
+    def stats(self) -> Dict:
+        return {
+            'subscribers': len(self._subscribers),
+            'published': self.published,
+            'dropped_subscribers': self.dropped_subscribers,
+        }
+
+    def _flush_pending(self):
+        with self._pending_lock:
+            frames, self._pending = self._pending, []
+
+        self.published += len(frames)
+        self._fan_out("".join(frames))
+
+    def _fan_out(self, frame: str):
+
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber.queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                self.dropped_subscribers += 1
+                self._close(subscriber, "slow consumer")
+
+    def _close(self, subscriber: Subscriber, reason: str):
+        """
+        Unregister a subscriber and replace its backlog with the end of stream marker
+        """
+        self._subscribers.discard(subscriber)
+        subscriber.close_reason = reason
+
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(None)
+
+    async def _broadcast_statistics(self):
+        while True:
+            await asyncio.sleep(self.statistics_interval)
+
+            if not self._statistics_dirty or not self._subscribers:
+                continue
+
+            self._statistics_dirty = False
+            try:
+                if inspect.iscoroutinefunction(self.statistics_loader):
+                    statistics = await self.statistics_loader()
+                else:
+                    statistics = await asyncio.get_running_loop().run_in_executor(None, self.statistics_loader)
+            except Exception:
+                self._statistics_dirty = True
+                logger.exception("Failed to load the task statistics for the event stream")
+                continue
+
+            self._statistics_frame = format_event("statistics", statistics)
+            self.published += 1
+            self._fan_out(self._statistics_frame)
+
+
+def load_statistics() -> Dict:
+    db = SessionLocal()
+    try:
+        return StatisticsService.get_task_statistics(db).model_dump()
+    finally:
+        db.close()
+
+
+async def async_load_statistics() -> Dict:
+    # imported here so the sync deployment does not need the async driver
+    from app.database.async_session import AsyncSessionLocal
+    from app.services.async_statistics_service import AsyncStatisticsService
+
+    async with AsyncSessionLocal() as db:
+        statistics = await AsyncStatisticsService.get_task_statistics(db)
+        return statistics.model_dump()
+
+
+event_hub = EventHub(
+    async_load_statistics if settings.APP_DB_MODE == "async" else load_statistics,
+    queue_size=settings.EVENTS_QUEUE_SIZE,
+    max_subscribers=settings.EVENTS_MAX_SUBSCRIBERS,
+    statistics_interval=settings.EVENTS_STATISTICS_INTERVAL,
+    heartbeat_interval=settings.EVENTS_HEARTBEAT_INTERVAL
+)
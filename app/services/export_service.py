@@ -0,0 +1,119 @@
+import csv
+import io
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Iterable, Iterator, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.orm.session import Session
+
+from app.core.config import settings
+from app.models.task_model import Task, TaskStatusEnum
+from app.models.task_statistics_model import TaskActionEnum, TaskStatistic
+from app.schemas.export_schema import ExportFormatEnum
+
+TASK_EXPORT_COLUMNS = (
+    Task.id,
+    Task.title,
+    Task.description,
+    Task.status,
+    Task.created_at,
+    Task.updated_at,
+    Task.is_deleted,
+)
+
+TASK_ACTION_EXPORT_COLUMNS = (
+    TaskStatistic.id,
+    TaskStatistic.task_id,
+    TaskStatistic.action,
+    TaskStatistic.action_at,
+)
+
+
+def _to_json_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+class ExportService:
+    """
+    Streams tasks and task actions out of the database with constant memory.
+
+    Rows are read through a server-side cursor `EXPORT_BATCH_SIZE` rows at a
+    time and serialized one by one, without building ORM entities or schemas.
+    """
+
+    @staticmethod
+    def iter_tasks(
+        db: Session,
+        status: Optional[TaskStatusEnum] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        include_deleted: bool = False
+    ) -> Iterator:
+        query = select(*TASK_EXPORT_COLUMNS).order_by(Task.id)
+
+        if not include_deleted:
+            query = query.where(Task.is_deleted == False)
+        if status is not None:
+            query = query.where(Task.status == status)
+        if created_after is not None:
+            query = query.where(Task.created_at >= created_after)
+        if created_before is not None:
+            query = query.where(Task.created_at < created_before)
+
+        yield from db.execute(query.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+
+    @staticmethod
+    def iter_task_actions(
+        db: Session,
+        action: Optional[TaskActionEnum] = None,
+        task_id: Optional[int] = None,
+        action_after: Optional[datetime] = None,
+        action_before: Optional[datetime] = None
+    ) -> Iterator:
+        query = select(*TASK_ACTION_EXPORT_COLUMNS).order_by(TaskStatistic.id)
+
+        if action is not None:
+            query = query.where(TaskStatistic.action == action)
+        if task_id is not None:
+            query = query.where(TaskStatistic.task_id == task_id)
+        if action_after is not None:
+            query = query.where(TaskStatistic.action_at >= action_after)
+        if action_before is not None:
+            query = query.where(TaskStatistic.action_at < action_before)
+
+        yield from db.execute(query.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+
+    @staticmethod
+    def serialize(rows: Iterable, columns: Sequence[str], export_format: ExportFormatEnum) -> Iterator[str]:
+        """
+        Serialize rows to NDJSON or CSV, yielding one chunk per batch of rows
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if export_format == ExportFormatEnum.csv else None
+
+        if writer is not None:
+            writer.writerow(columns)
+
+        for count, row in enumerate(rows, start=1):
+            if writer is not None:
+                writer.writerow(_to_json_value(value) for value in row)
+            else:
+                buffer.write(json.dumps(
+                    {column: _to_json_value(value) for column, value in zip(columns, row)},
+                    separators=(",", ":")
+                ))
+                buffer.write("\n")
+
+            if count % settings.EXPORT_BATCH_SIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue()
@@ -0,0 +1,231 @@
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy import func, text
+from sqlalchemy.orm.session import Session
+
+from app.models.task_statistics_archive_model import TaskStatisticsArchive
+from app.models.task_statistics_model import TaskStatistic
+from app.services.archive_service import ARCHIVE_EXTENSIONS, ArchiveService
+from app.services.export_service import ExportService
+from app.services.rollup_service import as_utc
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLE = TaskStatistic.__tablename__
+
+# Catch-all partition above the monthly ones, split by `ensure_future_partitions`
+FUTURE_PARTITION = "p_future"
+
+
+class PartitioningError(RuntimeError):
+    """
+    Raised when task_statistics is not partitioned the way the maintenance jobs expect
+    """
+
+
+@dataclass
+class Partition:
+    name: str
+    # exclusive upper bound of action_at, None for the MAXVALUE partition
+    upper_bound: Optional[datetime]
+    # estimate from the table statistics
+    rows: int
+
+
+def month_start(value: datetime) -> datetime:
+    return as_utc(value).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    month = value.month - 1 + months
+    return value.replace(year=value.year + month // 12, month=month % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"p{month:%Y%m}"
+
+
+def partition_definition(name: str, upper_bound: Optional[datetime]) -> str:
+    if upper_bound is None:
+        return f"PARTITION {name} VALUES LESS THAN (MAXVALUE)"
+    return f"PARTITION {name} VALUES LESS THAN ('{upper_bound:%Y-%m-%d %H:%M:%S}')"
+
+
+class PartitionService:
+    """
+    Maintains the monthly RANGE COLUMNS(action_at) partitions of task_statistics
+    on MySQL: new months are split off the catch-all partition ahead of time,
+    and months past the retention are written to archive files and dropped,
+    which is a metadata operation instead of a large DELETE.
+    """
+
+    @staticmethod
+    def is_supported(db: Session) -> bool:
+        return db.get_bind().dialect.name == "mysql"
+
+    @staticmethod
+    def list_partitions(db: Session) -> List[Partition]:
+        """
+        Get the partitions of task_statistics in bound order, empty when the table is not partitioned
+        """
+        rows = db.execute(
+            text(
+                "SELECT PARTITION_NAME, PARTITION_DESCRIPTION, TABLE_ROWS FROM information_schema.PARTITIONS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name AND PARTITION_NAME IS NOT NULL "
+                "ORDER BY PARTITION_ORDINAL_POSITION"
+            ),
+            {'table_name': PARTITIONED_TABLE}
+        ).all()
+
+        partitions = []
+        for name, description, table_rows in rows:
+            upper_bound = None
+            if description != "MAXVALUE":
+                upper_bound = as_utc(datetime.strptime(description.strip("'"), "%Y-%m-%d %H:%M:%S"))
+            partitions.append(Partition(name=name, upper_bound=upper_bound, rows=table_rows or 0))
+
+        return partitions
+
+    @staticmethod
+    def _require_partitions(db: Session) -> List[Partition]:
+        if not PartitionService.is_supported(db):
+            raise PartitioningError("task_statistics is only partitioned on MySQL")
+
+        partitions = PartitionService.list_partitions(db)
+        if not partitions or partitions[-1].name != FUTURE_PARTITION:
+            raise PartitioningError(f"task_statistics has no {FUTURE_PARTITION} partition, run the migrations first")
+
+        return partitions
+
+    @staticmethod
+    def ensure_future_partitions(db: Session, months_ahead: int, now: Optional[datetime] = None) -> List[str]:
+        """
+        Split the catch-all partition so that the current month and the next
+        `months_ahead` ones have their own partition, returning the created ones
+
+        Raises:
+            PartitioningError: if the table is not partitioned
+        """
+        partitions = PartitionService._require_partitions(db)
+
+        bounds = [partition.upper_bound for partition in partitions if partition.upper_bound is not None]
+        current = month_start(now or datetime.now(timezone.utc))
+        target = add_months(current, months_ahead + 1)
+
+        # without monthly partitions yet, start with the current month
+        bound = max(bounds) if bounds else current
+        created = []
+        while bound < target:
+            created.append((partition_name(bound), add_months(bound, 1)))
+            bound = add_months(bound, 1)
+
+        if created:
+            definitions = [partition_definition(name, upper_bound) for name, upper_bound in created]
+            definitions.append(partition_definition(FUTURE_PARTITION, None))
+            db.execute(text(
+                f"ALTER TABLE {PARTITIONED_TABLE} REORGANIZE PARTITION {FUTURE_PARTITION} INTO ({', '.join(definitions)})"
+            ))
+
+        return [name for name, _ in created]
+
+    @staticmethod
+    def archive_expired(
+        db: Session,
+        retention_months: int,
+        archive_dir: str,
+        archive_format: str,
+        now: Optional[datetime] = None,
+        dry_run: bool = False
+    ) -> List[TaskStatisticsArchive]:
+        """
+        Archive and drop the monthly partitions entirely older than
+        `retention_months` months before the current month
+
+        Raises:
+            PartitioningError: if the table is not partitioned
+        """
+        partitions = PartitionService._require_partitions(db)
+        cutoff = add_months(month_start(now or datetime.now(timezone.utc)), -retention_months)
+
+        archives = []
+        lower_bound = None
+        for index, partition in enumerate(partitions):
+            if partition.upper_bound is None or partition.upper_bound > cutoff:
+                break
+
+            if index == 0:
+                # the previous archives end where the first partition starts, its own
+                # archive may exist already if a previous run stopped before dropping it
+                lower_bound = PartitionService.get_archived_until(db, before=partition.upper_bound)
+
+            if dry_run:
+                logger.info("Would archive partition %s (about %d rows)", partition.name, partition.rows)
+            else:
+                archives.append(PartitionService.archive_partition(db, partition, lower_bound, archive_dir, archive_format))
+            lower_bound = partition.upper_bound
+
+        return archives
+
+    @staticmethod
+    def archive_partition(
+        db: Session,
+        partition: Partition,
+        lower_bound: Optional[datetime],
+        archive_dir: str,
+        archive_format: str
+    ) -> TaskStatisticsArchive:
+        """
+        Write the rows of the oldest partition to an archive file, record it, then drop the partition.
+
+        The archive is recorded before the partition is dropped, so an interrupted
+        run is resumed by running it again: the file is rewritten and the record updated.
+        """
+        path = os.path.join(archive_dir, f"{PARTITIONED_TABLE}_{partition.name}.{ARCHIVE_EXTENSIONS[archive_format]}")
+
+        # partitions are archived oldest first, so the partition holds every action
+        # below its bound, which selects it through partition pruning
+        rows = ExportService.iter_task_actions(db, action_before=partition.upper_bound)
+        counts = ArchiveService.write(rows, path, archive_format)
+
+        row_count = db.query(func.count(TaskStatistic.id)).filter(TaskStatistic.action_at < partition.upper_bound).scalar()
+        if row_count != sum(counts.values()):
+            raise PartitioningError(
+                f"Archive of {partition.name} holds {sum(counts.values())} rows instead of {row_count}, partition kept"
+            )
+
+        archive = db.query(TaskStatisticsArchive).filter(TaskStatisticsArchive.partition_name == partition.name).first()
+        if archive is None:
+            archive = TaskStatisticsArchive(partition_name=partition.name)
+            db.add(archive)
+
+        archive.range_start = lower_bound
+        archive.range_end = partition.upper_bound
+        archive.row_count = row_count
+        archive.created_count = counts['created']
+        archive.modified_count = counts['modified']
+        archive.deleted_count = counts['deleted']
+        archive.path = os.path.abspath(path)
+        archive.format = archive_format
+        archive.archived_at = datetime.now(timezone.utc)
+        db.commit()
+
+        db.execute(text(f"ALTER TABLE {PARTITIONED_TABLE} DROP PARTITION {partition.name}"))
+        logger.info("Archived partition %s (%d rows) to %s", partition.name, row_count, path)
+
+        return archive
+
+    @staticmethod
+    def get_archived_until(db: Session, before: Optional[datetime] = None) -> Optional[datetime]:
+        """
+        Get the end of the archived actions (of the archives ending before `before`),
+        older actions are only in the archive files
+        """
+        query = db.query(func.max(TaskStatisticsArchive.range_end))
+        if before is not None:
+            query = query.filter(TaskStatisticsArchive.range_end < before)
+        archived_until = query.scalar()
+        return as_utc(archived_until) if archived_until is not None else None
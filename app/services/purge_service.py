@@ -0,0 +1,335 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm.session import Session
+
+from app.cache.count_cache import count_cache
+from app.cache.single_flight import single_flight
+from app.cache.task_cache import task_cache
+from app.core.config import settings
+from app.database.session import SessionLocal
+from app.metrics.collectors import (
+    task_purge_actions,
+    task_purge_batch_duration,
+    task_purge_batches,
+    task_purge_remaining,
+    task_purge_running,
+    task_purge_tasks,
+)
+from app.models.task_archive_model import TaskArchive
+from app.models.task_model import Task
+from app.models.task_statistics_model import TaskActionEnum, TaskStatistic
+from app.schemas.purge_schema import PurgeModeEnum, PurgeStateEnum, PurgeStatusSchema
+from app.services.counter_service import CounterService
+from app.services.event_hub import event_hub
+
+logger = logging.getLogger(__name__)
+
+# Columns copied to tasks_archive, archived_at is set by the database
+ARCHIVED_COLUMNS = ("id", "title", "description", "status", "created_at", "updated_at", "is_deleted", "change_seq")
+
+# Batches are resized to take about this long, keeping the row locks short
+TARGET_BATCH_SECONDS = 0.5
+MIN_BATCH_SIZE = 10
+
+# Consecutive failed batches (lock wait timeouts, deadlocks) before a run gives up
+MAX_BATCH_FAILURES = 5
+
+
+class PurgeService:
+    """
+    Hard-deletes soft-deleted tasks, in batches small enough to run next to
+    the API. A task is purged once its deletion (its last update) is older than
+    the cutoff; with `archive` it is copied to tasks_archive first.
+
+    task_statistics has no foreign key to tasks, so the actions of purged tasks
+    are kept as the audit trail by default. When they are deleted as well, the
+    counters lose them in the same transaction, as a recount would.
+    """
+
+    @staticmethod
+    def get_cutoff(min_age_days: int, now: Optional[datetime] = None) -> datetime:
+        return (now or datetime.now(timezone.utc)).replace(microsecond=0) - timedelta(days=min_age_days)
+
+    @staticmethod
+    def count_purgeable(db: Session, cutoff: datetime) -> int:
+        """
+        Count the tasks deleted before the cutoff, a range of the (is_deleted, updated_at) index
+        """
+        return db.query(func.count(Task.id))\
+            .filter(Task.is_deleted == True, Task.updated_at < cutoff)\
+            .scalar()
+
+    @staticmethod
+    def purge_batch(
+        db: Session,
+        cutoff: datetime,
+        batch_size: int,
+        mode: PurgeModeEnum = PurgeModeEnum.delete,
+        delete_actions: bool = False
+    ) -> Dict[str, int]:
+        """
+        Purge up to `batch_size` of the tasks deleted before the cutoff, oldest
+        deletion first, and commit. Returns the number of purged tasks and of
+        deleted actions, no tasks being left when `tasks` is 0.
+
+        Tasks locked by another purge are skipped (MySQL), so purges running in
+        several processes share the work instead of waiting on each other.
+        """
+        rows = db.query(Task.id, Task.change_seq)\
+            .filter(Task.is_deleted == True, Task.updated_at < cutoff)\
+            .order_by(Task.updated_at, Task.id)\
+            .limit(batch_size)\
+            .with_for_update(skip_locked=True)\
+            .all()
+
+        if not rows:
+            db.rollback()
+            return {'tasks': 0, 'actions': 0}
+
+        task_ids = [row.id for row in rows]
+
+        if mode == PurgeModeEnum.archive:
+            db.execute(
+                insert(TaskArchive).from_select(
+                    ARCHIVED_COLUMNS,
+                    select(*(getattr(Task, column) for column in ARCHIVED_COLUMNS)).where(Task.id.in_(task_ids))
+                )
+            )
+
+        action_counts = {}
+        if delete_actions:
+            action_counts = dict(
+                db.query(TaskStatistic.action, func.count(TaskStatistic.id))
+                .filter(TaskStatistic.task_id.in_(task_ids))
+                .group_by(TaskStatistic.action)
+                .all()
+            )
+            db.execute(delete(TaskStatistic).where(TaskStatistic.task_id.in_(task_ids)))
+
+        db.execute(delete(Task).where(Task.id.in_(task_ids)))
+
+        CounterService.record_purge(
+            db,
+            max(row.change_seq for row in rows),
+            modified=-action_counts.get(TaskActionEnum.modified, 0),
+            deleted=-action_counts.get(TaskActionEnum.deleted, 0)
+        )
+        db.commit()
+
+        task_cache.invalidate(task_ids)
+        if action_counts:
+            count_cache.invalidate()
+            single_flight.invalidate()
+            event_hub.mark_statistics_dirty()
+
+        return {'tasks': len(task_ids), 'actions': sum(action_counts.values())}
+
+
+class TaskPurger:
+    """
+    Runs the purge in a background thread, on demand or every `interval`
+    seconds, one run at a time per process.
+
+    The purge throttles itself: after each batch it pauses `throttle` times
+    the duration of the batch, and the batch size follows the time batches
+    take (halved when slow or failing, doubled back up to `batch_size` when
+    fast), so it backs off while the database is busy.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        min_age_days: int = 30,
+        batch_size: int = 500,
+        mode: PurgeModeEnum = PurgeModeEnum.delete,
+        delete_actions: bool = False,
+        throttle: float = 1.0,
+        interval: float = 0.0
+    ):
+        self.session_factory = session_factory
+        self.min_age_days = min_age_days
+        self.batch_size = batch_size
+        self.mode = mode
+        self.delete_actions = delete_actions
+        self.throttle = throttle
+        self.interval = interval
+
+        self._status = PurgeStatusSchema(state=PurgeStateEnum.idle, mode=mode, batch_size=batch_size)
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._scheduler: Optional[threading.Thread] = None
+        self._worker: Optional[threading.Thread] = None
+
+    def status(self) -> PurgeStatusSchema:
+        with self._lock:
+            return self._status.model_copy()
+
+    def _update(self, **changes):
+        with self._lock:
+            self._status = self._status.model_copy(update=changes)
+
+    def run(self, min_age_days: Optional[int] = None, dry_run: bool = False) -> PurgeStatusSchema:
+        """
+        Purge every task deleted more than `min_age_days` days ago in the
+        calling thread, returning the final status. A run already in progress
+        is left alone and its status returned.
+        """
+        if not self._run_lock.acquire(blocking=False):
+            return self.status()
+
+        self._begin(min_age_days, dry_run)
+        self._run_and_release()
+        return self.status()
+
+    def _begin(self, min_age_days: Optional[int], dry_run: bool):
+        cutoff = PurgeService.get_cutoff(self.min_age_days if min_age_days is None else min_age_days)
+        self._update(
+            state=PurgeStateEnum.running, mode=self.mode, dry_run=dry_run, cutoff=cutoff,
+            started_at=datetime.now(timezone.utc), finished_at=None, purged_tasks=0, deleted_actions=0,
+            batches=0, batch_size=self.batch_size, remaining_tasks=None, last_error=None
+        )
+        task_purge_running.set(1)
+
+    def _run_and_release(self):
+        try:
+            self._run()
+        finally:
+            task_purge_running.set(0)
+            self._run_lock.release()
+
+    def _run(self):
+        status = self.status()
+        cutoff, dry_run = status.cutoff, status.dry_run
+        batch_size = self.batch_size
+
+        db = self.session_factory()
+        try:
+            remaining = PurgeService.count_purgeable(db, cutoff)
+            db.rollback()
+            self._update(remaining_tasks=remaining)
+            task_purge_remaining.set(remaining)
+
+            if dry_run:
+                self._finish(PurgeStateEnum.completed)
+                return
+
+            failures = 0
+            while not self._stop.is_set():
+                started = time.perf_counter()
+                try:
+                    purged = PurgeService.purge_batch(db, cutoff, batch_size, self.mode, self.delete_actions)
+                except OperationalError as e:
+                    db.rollback()
+                    failures += 1
+                    task_purge_batches.inc(1, "failed")
+                    logger.warning("Purge batch of %d tasks failed (%d in a row): %s", batch_size, failures, e)
+
+                    if failures >= MAX_BATCH_FAILURES:
+                        raise
+                    batch_size = max(batch_size // 2, MIN_BATCH_SIZE)
+                    self._update(batch_size=batch_size, last_error=str(e))
+                    self._stop.wait(TARGET_BATCH_SECONDS * 2 ** failures)
+                    continue
+
+                elapsed = time.perf_counter() - started
+                failures = 0
+                if not purged['tasks']:
+                    break
+
+                task_purge_batches.inc(1, "committed")
+                task_purge_batch_duration.observe(elapsed)
+                task_purge_tasks.inc(purged['tasks'], self.mode.value)
+                task_purge_actions.inc(purged['actions'])
+
+                remaining = max(remaining - purged['tasks'], 0)
+                task_purge_remaining.set(remaining)
+
+                with self._lock:
+                    self._status = self._status.model_copy(update={
+                        'purged_tasks': self._status.purged_tasks + purged['tasks'],
+                        'deleted_actions': self._status.deleted_actions + purged['actions'],
+                        'batches': self._status.batches + 1,
+                        'remaining_tasks': remaining,
+                    })
+
+                if elapsed > TARGET_BATCH_SECONDS * 2:
+                    batch_size = max(batch_size // 2, MIN_BATCH_SIZE)
+                elif elapsed < TARGET_BATCH_SECONDS / 2:
+                    batch_size = min(batch_size * 2, self.batch_size)
+                self._update(batch_size=batch_size)
+
+                self._stop.wait(elapsed * self.throttle)
+
+            self._finish(PurgeStateEnum.stopped if self._stop.is_set() else PurgeStateEnum.completed)
+        except Exception as e:
+            db.rollback()
+            logger.exception("Purge of the soft-deleted tasks failed")
+            self._finish(PurgeStateEnum.failed, last_error=str(e))
+        finally:
+            db.close()
+
+        status = self.status()
+        logger.info(
+            "Purge %s: %d tasks purged (%s) in %d batches, deleted before %s",
+            status.state.value, status.purged_tasks, self.mode.value, status.batches, cutoff
+        )
+
+    def _finish(self, state: PurgeStateEnum, **changes):
+        self._update(state=state, finished_at=datetime.now(timezone.utc), **changes)
+
+    def trigger(self, min_age_days: Optional[int] = None, dry_run: bool = False) -> bool:
+        """
+        Start a run in a background thread, returns False if one is already running
+        """
+        if not self._run_lock.acquire(blocking=False):
+            return False
+
+        self._stop.clear()
+        self._begin(min_age_days, dry_run)
+        self._worker = threading.Thread(target=self._run_and_release, name="task-purge", daemon=True)
+        self._worker.start()
+        return True
+
+    def _schedule(self):
+        while not self._stop.wait(self.interval):
+            self.run()
+
+    def start(self):
+        """
+        Run the purge every `interval` seconds until stopped
+        """
+        if self._scheduler is not None or self.interval <= 0:
+            return
+
+        self._stop.clear()
+        self._scheduler = threading.Thread(target=self._schedule, name="task-purge-scheduler", daemon=True)
+        self._scheduler.start()
+
+    def stop(self):
+        """
+        Stop the scheduler and the current run after its current batch
+        """
+        self._stop.set()
+        for thread in (self._scheduler, self._worker):
+            if thread is not None:
+                thread.join()
+        self._scheduler = None
+        self._worker = None
+
+
+task_purger = TaskPurger(
+    SessionLocal,
+    min_age_days=settings.TASK_PURGE_MIN_AGE_DAYS,
+    batch_size=settings.TASK_PURGE_BATCH_SIZE,
+    mode=PurgeModeEnum(settings.TASK_PURGE_MODE),
+    delete_actions=settings.TASK_PURGE_DELETE_ACTIONS,
+    throttle=settings.TASK_PURGE_THROTTLE,
+    interval=settings.TASK_PURGE_INTERVAL
+)
@@ -0,0 +1,255 @@
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, update
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.orm.session import Session
+
+from app.models.task_action_rollup_model import RollupBucketEnum, TaskActionRollup
+from app.models.task_model import Task, TaskStatusEnum
+from app.models.task_statistics_archive_model import TaskStatisticsArchive
+from app.models.task_statistics_model import TaskStatistic
+
+# Counted columns of a rollup row, the action names plus "completed"
+COUNT_COLUMNS = ("created", "modified", "deleted", "completed")
+
+BUCKET_SIZES = {
+    RollupBucketEnum.hour: timedelta(hours=1),
+    RollupBucketEnum.day: timedelta(days=1),
+}
+
+# Buckets returned when the start of the range is not given
+DEFAULT_BUCKET_COUNTS = {
+    RollupBucketEnum.hour: 24,
+    RollupBucketEnum.day: 30,
+}
+
+
+class InvalidTimeRangeError(ValueError):
+    """
+    Raised when a requested time range is empty or spans too many buckets
+    """
+
+
+def action_time() -> datetime:
+    """
+    Timestamp of an action, truncated to the second like the DATETIME columns
+    store it so the rollup bucket of an action never differs from its row's
+    """
+    return datetime.now(timezone.utc).replace(microsecond=0)
+
+
+def as_utc(value: datetime) -> datetime:
+    # the database returns naive datetimes, they are stored in UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def floor_bucket(value: datetime, bucket: RollupBucketEnum) -> datetime:
+    value = as_utc(value).replace(minute=0, second=0, microsecond=0)
+    if bucket == RollupBucketEnum.day:
+        value = value.replace(hour=0)
+    return value
+
+
+def ceil_bucket(value: datetime, bucket: RollupBucketEnum) -> datetime:
+    start = floor_bucket(value, bucket)
+    return start if start == as_utc(value) else start + BUCKET_SIZES[bucket]
+
+
+class RollupService:
+    @staticmethod
+    def add(db: Session, events: Iterable[Tuple[datetime, str, int]]):
+        """
+        Add counts to the hour and day buckets of their timestamps as part of
+        the caller's transaction, `events` being (timestamp, column, count)
+        tuples such as (action_at, "created", 1)
+        """
+        deltas: Dict[Tuple[RollupBucketEnum, datetime], Dict[str, int]] = defaultdict(lambda: dict.fromkeys(COUNT_COLUMNS, 0))
+        for at, column, count in events:
+            if count:
+                for bucket in BUCKET_SIZES:
+                    deltas[(bucket, floor_bucket(at, bucket))][column] += count
+
+        if not deltas:
+            return
+
+        # rows are always locked in the same order so concurrent writers cannot deadlock
+        rows = [
+            {'bucket': bucket, 'bucket_start': start, **counts}
+            for (bucket, start), counts in sorted(deltas.items(), key=lambda item: (item[0][0].value, item[0][1]))
+        ]
+        RollupService._upsert(db, rows)
+
+    @staticmethod
+    def _upsert(db: Session, rows: List[Dict]):
+        """
+        Insert the rows, adding their counts to the existing rows of the same buckets
+        """
+        dialect = db.get_bind().dialect.name
+
+        if dialect == "mysql":
+            statement = mysql.insert(TaskActionRollup).values(rows)
+            db.execute(statement.on_duplicate_key_update({
+                column: getattr(TaskActionRollup, column) + getattr(statement.inserted, column)
+                for column in COUNT_COLUMNS
+            }))
+        elif dialect == "sqlite":
+            statement = sqlite.insert(TaskActionRollup).values(rows)
+            db.execute(statement.on_conflict_do_update(
+                index_elements=[TaskActionRollup.bucket, TaskActionRollup.bucket_start],
+                set_={
+                    column: getattr(TaskActionRollup, column) + getattr(statement.excluded, column)
+                    for column in COUNT_COLUMNS
+                }
+            ))
+        else:
+            for row in rows:
+                updated = db.execute(
+                    update(TaskActionRollup)
+                    .where(TaskActionRollup.bucket == row['bucket'], TaskActionRollup.bucket_start == row['bucket_start'])
+                    .values({column: getattr(TaskActionRollup, column) + row[column] for column in COUNT_COLUMNS})
+                ).rowcount
+                if not updated:
+                    db.execute(insert(TaskActionRollup).values(row))
+
+    @staticmethod
+    def resolve_range(
+        bucket: RollupBucketEnum,
+        start: Optional[datetime],
+        end: Optional[datetime],
+        max_buckets: int
+    ) -> Tuple[datetime, datetime]:
+        """
+        Widen a time range to the buckets it overlaps, `end` defaulting to now
+        (the current bucket included) and `start` to a default number of buckets
+        before `end`
+
+        Raises:
+            InvalidTimeRangeError: if the range is empty or spans more than `max_buckets` buckets
+        """
+        size = BUCKET_SIZES[bucket]
+        if end is None:
+            end = floor_bucket(datetime.now(timezone.utc), bucket) + size
+        else:
+            end = ceil_bucket(end, bucket)
+        start = floor_bucket(start, bucket) if start is not None else end - size * DEFAULT_BUCKET_COUNTS[bucket]
+
+        if start >= end:
+            raise InvalidTimeRangeError("`from` must be before `to`")
+        if (end - start) // size > max_buckets:
+            raise InvalidTimeRangeError(f"At most {max_buckets} {bucket.value} buckets can be requested at once")
+
+        return start, end
+
+    @staticmethod
+    def get_series(db: Session, bucket: RollupBucketEnum, start: datetime, end: datetime) -> List[Dict]:
+        """
+        Read the counts of the buckets in [start, end), both being bucket
+        boundaries; buckets without any action are returned with zero counts
+        """
+        rows = db.query(
+            TaskActionRollup.bucket_start,
+            *(getattr(TaskActionRollup, column) for column in COUNT_COLUMNS)
+        )\
+            .filter(
+                TaskActionRollup.bucket == bucket,
+                TaskActionRollup.bucket_start >= start,
+                TaskActionRollup.bucket_start < end
+            )\
+            .order_by(TaskActionRollup.bucket_start)\
+            .all()
+
+        found = {as_utc(row.bucket_start): row for row in rows}
+
+        series = []
+        current = start
+        while current < end:
+            row = found.get(current)
+            series.append({
+                'bucket_start': current,
+                **{column: getattr(row, column) if row is not None else 0 for column in COUNT_COLUMNS}
+            })
+            current += BUCKET_SIZES[bucket]
+
+        return series
+
+    @staticmethod
+    def _truncate_to_hour(db: Session, column):
+        # formatted as text, parsed back in Python
+        if db.get_bind().dialect.name == "mysql":
+            return func.date_format(column, "%Y-%m-%d %H:00:00")
+        return func.strftime("%Y-%m-%d %H:00:00", column)
+
+    @staticmethod
+    def _in_range(db: Session, column, since: Optional[datetime], until: Optional[datetime]):
+        conditions = [column.isnot(None)]
+        for bound, is_start in ((since, True), (until, False)):
+            if bound is None:
+                continue
+            conditions.append(column >= bound if is_start else column < bound)
+        return conditions
+
+    @staticmethod
+    def backfill(db: Session, since: Optional[datetime] = None, until: Optional[datetime] = None) -> int:
+        """
+        Rebuild the rollups of the whole days in [since, until) (everything by
+        default) from the base tables, returning the number of rows written.
+
+        Actions are counted from task_statistics. Completions are not logged as
+        actions, so each completed task is counted once, in the bucket of its
+        last update (or of its creation): earlier completions of tasks reopened
+        since are not recovered.
+
+        Days whose actions were moved to archive files are kept as they are.
+        Writes to the rebuilt buckets while the backfill runs may be lost, run
+        it while the API is stopped or on days that are over.
+        """
+        since = floor_bucket(since, RollupBucketEnum.day) if since is not None else None
+
+        archived_until = db.query(func.max(TaskStatisticsArchive.range_end)).scalar()
+        if archived_until is not None:
+            archived_until = ceil_bucket(archived_until, RollupBucketEnum.day)
+            since = max(since, archived_until) if since is not None else archived_until
+        until = ceil_bucket(until, RollupBucketEnum.day) if until is not None else None
+
+        hours: Dict[datetime, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(COUNT_COLUMNS, 0))
+
+        action_hour = RollupService._truncate_to_hour(db, TaskStatistic.action_at)
+        actions = db.query(action_hour, TaskStatistic.action, func.count())\
+            .filter(*RollupService._in_range(db, TaskStatistic.action_at, since, until))\
+            .group_by(action_hour, TaskStatistic.action)
+        for hour, action, count in actions:
+            hours[hour][action.value] += count
+
+        completed_at = func.coalesce(Task.updated_at, Task.created_at)
+        completed_hour = RollupService._truncate_to_hour(db, completed_at)
+        completions = db.query(completed_hour, func.count())\
+            .filter(Task.status == TaskStatusEnum.completed, *RollupService._in_range(db, completed_at, since, until))\
+            .group_by(completed_hour)
+        for hour, count in completions:
+            hours[hour]['completed'] += count
+
+        days: Dict[datetime, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(COUNT_COLUMNS, 0))
+        rows = []
+        for hour, counts in hours.items():
+            start = datetime.strptime(hour, "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
+            rows.append({'bucket': RollupBucketEnum.hour, 'bucket_start': start, **counts})
+            for column, count in counts.items():
+                days[floor_bucket(start, RollupBucketEnum.day)][column] += count
+        rows.extend({'bucket': RollupBucketEnum.day, 'bucket_start': start, **counts} for start, counts in days.items())
+
+        stale = delete(TaskActionRollup)
+        if since is not None:
+            stale = stale.where(TaskActionRollup.bucket_start >= since)
+        if until is not None:
+            stale = stale.where(TaskActionRollup.bucket_start < until)
+        db.execute(stale)
+
+        if rows:
+            db.execute(insert(TaskActionRollup), rows)
+        db.commit()
+
+        return len(rows)
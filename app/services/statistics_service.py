@@ -1,79 +1,243 @@
+from datetime import datetime
+from typing import Optional
+
 from sqlalchemy.orm.session import Session
 from sqlalchemy.sql.expression import func
-from sqlalchemy import and_
+from sqlalchemy import and_, insert, or_
+from typing_extensions import List
 
-from app.models.task_model import Task, TaskStatusEnum
+from app.cache.count_cache import count_cache
+from app.cache.single_flight import single_flight
+from app.core.config import settings
+from app.database.table_stats import get_approximate_row_count
+from app.database.transaction_hooks import on_commit
+from app.models.task_action_rollup_model import RollupBucketEnum
 from app.models.task_statistics_model import TaskActionEnum, TaskStatistic
-from app.schemas.task_statistic_schema import TaskStatisticsOverviewSchema
+from app.schemas.task_statistic_schema import TaskActionFilter, TaskActionTimeseriesSchema, TaskStatisticsOverviewSchema
+from app.services.audit_buffer import audit_buffer
+from app.services.counter_service import CounterService
+from app.services.rollup_service import RollupService, action_time
+from app.utils.cursor import InvalidCursorError, decode_cursor, encode_cursor
+
+STATISTICS_FLIGHT_KEY = ("statistics",)
 
 
 class StatisticsService:
     @staticmethod
-    def log_action(db: Session, task_id: int, action_type: TaskActionEnum):
+    def log_action(
+        db: Session,
+        task_id: int,
+        action_type: TaskActionEnum,
+        commit: bool = False,
+        completed: bool = False
+    ):
         """
-        Log a task action in the statistics
+        Log a task action in the statistics and add it to the hourly and daily
+        rollups, `completed` telling whether the action completed the task
+
+        The action joins the caller's transaction and is persisted by its commit,
+        pass `commit=True` to commit it on its own. With the audit buffer enabled
+        the action is queued once the transaction commits and written in a batch.
         """
-        task_stat = TaskStatistic(task_id=task_id, action=action_type)
-        db.add(task_stat)
-        db.commit()
+        task_stat = None
+        action_at = action_time()
+
+        if settings.AUDIT_BUFFER_ENABLED:
+            on_commit(db, lambda: audit_buffer.add([task_id], action_type, completed=int(completed)))
+        else:
+            task_stat = TaskStatistic(task_id=task_id, action=action_type, action_at=action_at)
+            db.add(task_stat)
+            RollupService.add(db, [(action_at, action_type.value, 1), (action_at, 'completed', int(completed))])
+
+        if commit:
+            db.commit()
+
         return task_stat
 
+    @staticmethod
+    def log_actions(db: Session, task_ids: List[int], action_type: TaskActionEnum, completed: int = 0):
+        """
+        Log the same action for many tasks with a single multi-row insert,
+        `completed` of them being completed by it; the caller is responsible
+        for committing
+        """
+        if not task_ids:
+            return
+
+        if settings.AUDIT_BUFFER_ENABLED:
+            on_commit(db, lambda: audit_buffer.add(task_ids, action_type, completed=completed))
+            return
+
+        action_at = action_time()
+        db.execute(
+            insert(TaskStatistic),
+            [{'task_id': task_id, 'action': action_type, 'action_at': action_at} for task_id in task_ids]
+        )
+        RollupService.add(db, [(action_at, action_type.value, len(task_ids)), (action_at, 'completed', completed)])
+
+    @staticmethod
+    def get_write_version(db: Session) -> int:
+        """
+        Get the version of the statistics, bumped by every task write
+        """
+        return CounterService.get_version(db)
+
     @staticmethod
     def get_task_statistics(db: Session) -> TaskStatisticsOverviewSchema:
         """
-        Get comprehensive task statistics
-        """
-        # Total tasks (excluding soft-deleted)
-        total_tasks = db.query(Task).filter(Task.is_deleted == False).count()
-
-        # Modified tasks
-        modified_tasks = db.query(TaskStatistic)\
-            .filter(TaskStatistic.action == TaskActionEnum.modified)\
-            .count()
-
-        # Deleted tasks
-        deleted_tasks = db.query(TaskStatistic)\
-            .filter(TaskStatistic.action == TaskActionEnum.deleted)\
-            .count()
-
-        # Completed tasks
-        completed_tasks = db.query(Task)\
-            .filter(and_(
-                Task.status == TaskStatusEnum.completed,
-                Task.is_deleted == False
-            ))\
-            .count()
-
-        return TaskStatisticsOverviewSchema(
-            total_tasks=total_tasks,
-            modified_tasks=modified_tasks,
-            deleted_tasks=deleted_tasks,
-            completed_tasks=completed_tasks
+        Get comprehensive task statistics from the maintained counters,
+        concurrent calls sharing one read (see `single_flight`)
+        """
+        return single_flight.do(STATISTICS_FLIGHT_KEY, lambda: CounterService.get(db))
+
+    @staticmethod
+    def get_action_timeseries(
+        db: Session,
+        bucket: RollupBucketEnum = RollupBucketEnum.hour,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> TaskActionTimeseriesSchema:
+        """
+        Get the action counts per hour or day from the rollups
+
+        Raises:
+            InvalidTimeRangeError: if the range is empty or spans too many buckets
+        """
+        start, end = RollupService.resolve_range(bucket, start, end, settings.STATISTICS_TIMESERIES_MAX_BUCKETS)
+
+        return TaskActionTimeseriesSchema(
+            bucket=bucket,
+            start=start,
+            end=end,
+            series=RollupService.get_series(db, bucket, start, end)
         )
 
+    @staticmethod
+    def get_total_action_count(db: Session, filters: Optional[TaskActionFilter] = None) -> int:
+        """
+        Get the total count of task actions, cached for COUNT_CACHE_TTL seconds.
+        Filtered counts are not cached, they go through the indexes of the filters.
+        """
+        if filters is not None and not filters.is_empty():
+            query = StatisticsService.filter_task_actions(db.query(func.count(TaskStatistic.id)), filters)
+            return query.scalar()
+
+        return count_cache.get_or_load(
+            "task_actions",
+            lambda: db.query(func.count(TaskStatistic.id)).scalar()
+        )
+
+    @staticmethod
+    def filter_task_actions(query, filters: Optional[TaskActionFilter]):
+        """
+        Apply the action filters, served by the (task_id, action_at) and
+        (action, action_at) indexes
+        """
+        if filters is None:
+            return query
+
+        if filters.task_id is not None:
+            query = query.filter(TaskStatistic.task_id == filters.task_id)
+        if filters.action is not None:
+            query = query.filter(TaskStatistic.action == filters.action)
+        if filters.action_after is not None:
+            query = query.filter(TaskStatistic.action_at >= filters.action_after)
+        if filters.action_before is not None:
+            query = query.filter(TaskStatistic.action_at < filters.action_before)
+
+        return query
+
+    @staticmethod
+    def encode_action_cursor(task_action) -> str:
+        """
+        Encode the position after a task action, newest actions coming first
+        """
+        return encode_cursor({'at': task_action.action_at.isoformat(), 'id': task_action.id})
+
+    @staticmethod
+    def action_seek_clause(cursor: str):
+        """
+        Condition selecting the actions after the cursor in (action_at, id) descending order
+
+        Raises:
+            InvalidCursorError: if the cursor is malformed
+        """
+        payload = decode_cursor(cursor)
+        try:
+            action_at = datetime.fromisoformat(payload["at"])
+            last_id = int(payload["id"])
+        except (KeyError, ValueError, TypeError) as e:
+            raise InvalidCursorError("Malformed pagination cursor") from e
+
+        column = TaskStatistic.action_at
+        return or_(column < action_at, and_(column == action_at, TaskStatistic.id < last_id))
+
     @staticmethod
     def get_paginated_task_actions(
         db: Session,
         limit: int = 10,
-        page: int = 1
+        page: int = 1,
+        include_total: bool = True,
+        approximate_total: bool = False,
+        filters: Optional[TaskActionFilter] = None,
+        cursor: Optional[str] = None
     ):
         """
-        Get paginated task actions with total count
+        Get paginated task actions, newest first, with total count
+
+        The total is None when `include_total` is false, and read from the table
+        statistics when `approximate_total` is set (exact for filtered actions).
+        Whenever the total is not exact, the next page is detected by fetching
+        one extra action.
+
+        With a `cursor` (empty for the first page), `page` is ignored and the
+        actions after the cursor are read with a keyset seek on (action_at, id)
+        instead of an OFFSET, which keeps deep pages and task histories cheap.
+
+        Raises:
+            InvalidCursorError: if the cursor is malformed
         """
-        # Calculate offset
-        offset = (page - 1) * limit
+        filtered = filters is not None and not filters.is_empty()
 
         # Get total count of actions
-        total_actions = db.query(func.count(TaskStatistic.id)).scalar()
+        total_actions = None
+        if include_total and approximate_total and not filtered:
+            total_actions = get_approximate_row_count(db, TaskStatistic.__tablename__)
+            if total_actions is None:
+                total_actions = StatisticsService.get_total_action_count(db)
+        elif include_total:
+            total_actions = StatisticsService.get_total_action_count(db, filters)
+
+        exact_total = include_total and (filtered or not approximate_total) and cursor is None
+
+        # Get the actions, as rows of the response columns
+        query = StatisticsService.filter_task_actions(
+            db.query(
+                TaskStatistic.id,
+                TaskStatistic.task_id,
+                TaskStatistic.action,
+                TaskStatistic.action_at
+            ),
+            filters
+        )
+        if cursor:
+            query = query.filter(StatisticsService.action_seek_clause(cursor))
+
+        query = query.order_by(TaskStatistic.action_at.desc(), TaskStatistic.id.desc())
+        if cursor is None:
+            query = query.offset((page - 1) * limit)
+
+        task_actions = query.limit(limit if exact_total else limit + 1).all()
 
-        # Get paginated actions
-        task_actions = db.query(TaskStatistic)\
-            .order_by(TaskStatistic.action_at.desc())\
-            .offset(offset)\
-            .limit(limit)\
-            .all()
+        if exact_total:
+            has_next = page * limit < total_actions
+        else:
+            has_next = len(task_actions) > limit
+            task_actions = task_actions[:limit]
 
         return {
             'actions': task_actions,
-            'total_actions': total_actions
+            'total_actions': total_actions,
+            'has_next': has_next,
+            'next_cursor': StatisticsService.encode_action_cursor(task_actions[-1]) if task_actions and has_next else None
         }
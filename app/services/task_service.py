@@ -1,85 +1,594 @@
+import re
+from datetime import datetime
 from typing import Optional
 from typing_extensions import List
+from sqlalchemy import and_, insert, or_, select
+from sqlalchemy.dialects.mysql import match
 from sqlalchemy.orm.session import Session
 
 from app.models.task_model import Task, TaskStatusEnum
 from app.models.task_statistics_model import TaskActionEnum, TaskStatistic
-from app.schemas.task_schema import TaskCreate, TaskSortingModeEnum, TaskUpdate
+from app.schemas.reponse_schemas import TaskResponseSchema
+from app.schemas.task_schema import TaskCreate, TaskFilter, TaskSortFieldEnum, TaskSortingModeEnum, TaskUpdate
+from app.cache.count_cache import count_cache
+from app.cache.single_flight import single_flight
+from app.cache.task_cache import task_cache
+from app.core.config import settings
+from app.database.transaction_hooks import on_commit
+from app.services.counter_service import CounterService
+from app.services.event_hub import event_hub
 from app.services.statistics_service import StatisticsService
+from app.utils.batching import chunked, unique
+from app.utils.cursor import CursorDirectionEnum, InvalidCursorError, decode_cursor, encode_cursor
+from app.utils.fields import parse_fields
+
+# Columns read for the task responses, the lists select them instead of whole entities
+TASK_RESPONSE_COLUMNS = {name: getattr(Task, name) for name in TaskResponseSchema.model_fields}
+
+TASK_SORT_COLUMNS = {
+    TaskSortFieldEnum.id: Task.id,
+    TaskSortFieldEnum.created_at: Task.created_at,
+    TaskSortFieldEnum.updated_at: Task.updated_at,
+}
 
 
 class TaskService:
 
     @staticmethod
-    def get_total_task_count(db: Session) -> int:
+    def get_total_task_count(db: Session, filters: Optional[TaskFilter] = None) -> int:
+        """
+        Get the total count of non-deleted tasks, concurrent identical calls
+        sharing one count (see `single_flight`)
+        """
+        return single_flight.do(TaskService.count_flight_key(filters), lambda: TaskService.count_tasks(db, filters))
+
+    @staticmethod
+    def count_flight_key(filters: Optional[TaskFilter] = None) -> tuple:
+        return ("tasks.count", filters.model_dump_json(exclude_none=True) if filters is not None else "{}")
+
+    @staticmethod
+    def count_tasks(db: Session, filters: Optional[TaskFilter] = None) -> int:
+        """
+        Count the non-deleted tasks, cached for COUNT_CACHE_TTL seconds.
+        Counts of filtered tasks are not cached.
+        """
+        if filters is not None and not filters.is_empty():
+            return TaskService.filter_tasks(db, db.query(Task.id), filters).count()
+
+        return count_cache.get_or_load(
+            "tasks",
+            lambda: db.query(Task).filter(Task.is_deleted == False).count()
+        )
+
+    @staticmethod
+    def get_write_version(db: Session) -> int:
+        """
+        Get the version of the task data, bumped by every write
+        """
+        return CounterService.get_version(db)
+
+    @staticmethod
+    def get_approximate_task_count(db: Session, filters: Optional[TaskFilter] = None) -> int:
+        """
+        Get the number of tasks without counting them: the unfiltered total is
+        the live tasks counter (exact, a single primary key lookup), filtered
+        tasks fall back to the exact count since nothing can estimate them.
+        """
+        if filters is not None and not filters.is_empty():
+            return TaskService.get_total_task_count(db, filters)
+
+        return CounterService.get(db).total_tasks
+
+    @staticmethod
+    def parse_task_fields(fields: Optional[str]) -> Optional[List[str]]:
+        """
+        Parse the sparse fieldset of the task lists, None selects every response field
+
+        Raises:
+            InvalidFieldsError: if a field is not part of the task response
+        """
+        return parse_fields(fields, TASK_RESPONSE_COLUMNS)
+
+    @staticmethod
+    def task_columns(fields: Optional[List[str]] = None, sort_by: TaskSortFieldEnum = TaskSortFieldEnum.id):
+        """
+        Columns to select for the given response fields, the id and the sort
+        column are always selected since the cursors are built from them
+        """
+        if not fields:
+            return list(TASK_RESPONSE_COLUMNS.values())
+
+        columns = [Task.id] + [TASK_RESPONSE_COLUMNS[field] for field in fields if field != "id"]
+        if sort_by.value not in fields and sort_by != TaskSortFieldEnum.id:
+            columns.append(TASK_SORT_COLUMNS[sort_by])
+
+        return columns
+
+    @staticmethod
+    def search_clause(db: Session, search: str):
+        """
+        Match the title or the description against `search`
+
+        On MySQL this goes through the FULLTEXT index, every word of the search
+        being required as a word prefix. Other databases fall back to LIKE.
+        """
+        words = re.findall(r"\w+", search)
+        if words and db.get_bind().dialect.name == "mysql":
+            return match(Task.title, Task.description, against=" ".join(f"+{word}*" for word in words)).in_boolean_mode()
+
+        return or_(Task.title.contains(search, autoescape=True), Task.description.contains(search, autoescape=True))
+
+    @staticmethod
+    def filter_tasks(db: Session, query, filters: Optional[TaskFilter] = None):
+        """
+        Restrict a task query to the non-deleted tasks matching `filters`
+        """
+        query = query.filter(Task.is_deleted == False)
+        if filters is None:
+            return query
+
+        if filters.status is not None:
+            query = query.filter(Task.status == filters.status)
+        if filters.created_after is not None:
+            query = query.filter(Task.created_at >= filters.created_after)
+        if filters.created_before is not None:
+            query = query.filter(Task.created_at < filters.created_before)
+        if filters.updated_since is not None:
+            query = query.filter(Task.updated_at >= filters.updated_since)
+        # a constant LIKE 'prefix%' pattern can range scan ix_tasks_title
+        if filters.title_prefix:
+            pattern = re.sub(r"([/%_])", r"/\1", filters.title_prefix) + "%"
+            query = query.filter(Task.title.like(pattern, escape="/"))
+        if filters.title_contains:
+            query = query.filter(Task.title.contains(filters.title_contains, autoescape=True))
+        if filters.search:
+            query = query.filter(TaskService.search_clause(db, filters.search))
+
+        return query
+
+    @staticmethod
+    def task_order_by(sort_by: TaskSortFieldEnum, ascending: bool):
+        """
+        ORDER BY of the task lists, ties of the sort column are broken by id
+        """
+        columns = [TASK_SORT_COLUMNS[sort_by]]
+        if sort_by != TaskSortFieldEnum.id:
+            columns.append(Task.id)
+
+        return [column.asc() if ascending else column.desc() for column in columns]
+
+    @staticmethod
+    def get_tasks(
+        db: Session,
+        page: int = 1,
+        limit: int = 10,
+        order: TaskSortingModeEnum = TaskSortingModeEnum.desc,
+        peek: bool = False,
+        fields: Optional[List[str]] = None,
+        filters: Optional[TaskFilter] = None,
+        sort_by: TaskSortFieldEnum = TaskSortFieldEnum.id
+    ):
+        """
+        Get a page of tasks (see `query_tasks`), concurrent identical calls
+        sharing one query (see `single_flight`)
+        """
+        return single_flight.do(
+            TaskService.page_flight_key(page, limit, order, peek, fields, filters, sort_by),
+            lambda: TaskService.query_tasks(db, page, limit, order, peek, fields, filters, sort_by)
+        )
+
+    @staticmethod
+    def page_flight_key(
+        page: int,
+        limit: int,
+        order: TaskSortingModeEnum,
+        peek: bool,
+        fields: Optional[List[str]],
+        filters: Optional[TaskFilter],
+        sort_by: TaskSortFieldEnum
+    ) -> tuple:
+        return (
+            "tasks.page", page, limit, order.value, peek, tuple(fields) if fields else None,
+            filters.model_dump_json(exclude_none=True) if filters is not None else "{}", sort_by.value
+        )
+
+    @staticmethod
+    def query_tasks(
+        db: Session,
+        page: int = 1,
+        limit: int = 10,
+        order: TaskSortingModeEnum = TaskSortingModeEnum.desc,
+        peek: bool = False,
+        fields: Optional[List[str]] = None,
+        filters: Optional[TaskFilter] = None,
+        sort_by: TaskSortFieldEnum = TaskSortFieldEnum.id
+    ):
         """
-        Get the total count of non-deleted tasks
+        Get a page of non-deleted tasks matching `filters` as rows of the response
+        columns (only `fields` when given), sorted on `sort_by` then id. With `peek`
+        one extra task is returned when there is a next page
         """
-        return db.query(Task).filter(Task.is_deleted == False).count()
+        query = TaskService.filter_tasks(db, db.query(*TaskService.task_columns(fields, sort_by)), filters)
+
+        return query\
+            .order_by(*TaskService.task_order_by(sort_by, order == TaskSortingModeEnum.asc))\
+            .offset((page - 1) * limit)\
+            .limit(limit + 1 if peek else limit)\
+            .all()
+
+    @staticmethod
+    def invalidate_caches_on_commit(db: Session, task_ids: Optional[List[int]] = None):
+        """
+        Drop the cached data derived from the tasks once the current write is committed
+        """
+        on_commit(db, count_cache.invalidate)
+        on_commit(db, single_flight.invalidate)
+
+        if task_ids:
+            on_commit(db, lambda: task_cache.invalidate(task_ids))
 
     @staticmethod
-    def get_tasks(db: Session, page: int = 1, limit: int = 10, order: TaskSortingModeEnum = TaskSortingModeEnum.desc):
-        order_by = Task.id.asc() if order == TaskSortingModeEnum.asc else Task.id.desc()
+    def publish_changes(action: TaskActionEnum, task_ids: List[int], change_seq: int, task: Optional[Task] = None):
+        """
+        Broadcast committed task changes to the event stream, with the task
+        itself for single task writes
+        """
+        event_hub.mark_statistics_dirty()
+        if not event_hub.has_subscribers:
+            return
+
+        data = {'task_ids': task_ids, 'change_seq': change_seq}
+        if task is not None:
+            data['task'] = TaskResponseSchema.model_validate(task).model_dump(mode="json")
+
+        event_hub.publish(f"task.{action.value}", data)
+
+    @staticmethod
+    def encode_task_cursor(
+        task,
+        direction: CursorDirectionEnum,
+        order: TaskSortingModeEnum,
+        sort_by: TaskSortFieldEnum = TaskSortFieldEnum.id
+    ) -> str:
+        """
+        Encode the position of `task` (an entity or row holding the id and
+        the sort column) in the list as a cursor
+        """
+        payload = {"id": task.id, "dir": direction.value, "order": order.value}
+        if sort_by != TaskSortFieldEnum.id:
+            sort_value = getattr(task, sort_by.value)
+            payload["sort"] = sort_by.value
+            payload["value"] = sort_value.isoformat() if sort_value is not None else None
 
-        return db.query(Task).filter(Task.is_deleted == False).order_by(order_by).offset((page - 1) * limit).limit(limit).all()
+        return encode_cursor(payload)
+
+    @staticmethod
+    def seek_clause(sort_by: TaskSortFieldEnum, sort_value: Optional[datetime], last_id: int, ascending: bool):
+        """
+        Condition selecting the tasks after (sort_value, last_id) in the walking
+        direction. NULLs sort first in ascending order, as on MySQL and SQLite.
+        """
+        id_after = Task.id > last_id if ascending else Task.id < last_id
+        if sort_by == TaskSortFieldEnum.id:
+            return id_after
+
+        column = TASK_SORT_COLUMNS[sort_by]
+        if sort_value is None:
+            if ascending:
+                return or_(and_(column.is_(None), id_after), column.isnot(None))
+            return and_(column.is_(None), id_after)
+
+        if ascending:
+            return or_(column > sort_value, and_(column == sort_value, id_after))
+        return or_(column < sort_value, and_(column == sort_value, id_after), column.is_(None))
+
+    @staticmethod
+    def get_tasks_by_cursor(
+        db: Session,
+        cursor: Optional[str] = None,
+        limit: int = 10,
+        order: TaskSortingModeEnum = TaskSortingModeEnum.desc,
+        fields: Optional[List[str]] = None,
+        filters: Optional[TaskFilter] = None,
+        sort_by: TaskSortFieldEnum = TaskSortFieldEnum.id
+    ):
+        """
+        Get a page of tasks by seeking on the sort column and the task id instead of using OFFSET
+
+        Args:
+            db (Session): Database session
+            cursor (Optional[str]): Opaque cursor from a previous page, None for the first page
+            limit (int): Maximum number of tasks to return
+            order (TaskSortingModeEnum): Sorting mode, overridden by the one stored in the cursor
+            fields (Optional[List[str]]): Response fields to select, all of them when None
+            filters (Optional[TaskFilter]): Filters of the list, they are not stored in the cursor
+            sort_by (TaskSortFieldEnum): Sort column, overridden by the one stored in the cursor
+
+        Returns:
+            dict: tasks of the page as rows, cursors to the neighbouring pages and their availability
+        """
+        direction = CursorDirectionEnum.next
+        last_id: Optional[int] = None
+        sort_value: Optional[datetime] = None
+
+        if cursor:
+            payload = decode_cursor(cursor)
+            try:
+                last_id = int(payload["id"])
+                direction = CursorDirectionEnum(payload["dir"])
+                order = TaskSortingModeEnum(payload["order"])
+                sort_by = TaskSortFieldEnum(payload.get("sort", TaskSortFieldEnum.id.value))
+                if payload.get("value") is not None:
+                    sort_value = datetime.fromisoformat(payload["value"])
+            except (KeyError, ValueError, TypeError) as e:
+                raise InvalidCursorError("Malformed pagination cursor") from e
+
+        # walking backwards is the same seek with the sort order flipped
+        ascending = (order == TaskSortingModeEnum.asc) == (direction == CursorDirectionEnum.next)
+
+        query = TaskService.filter_tasks(db, db.query(*TaskService.task_columns(fields, sort_by)), filters)
+        if last_id is not None:
+            query = query.filter(TaskService.seek_clause(sort_by, sort_value, last_id, ascending))
+
+        # fetch one extra row to know whether there is more data in the walking direction
+        tasks = query.order_by(*TaskService.task_order_by(sort_by, ascending)).limit(limit + 1).all()
+        has_more = len(tasks) > limit
+        tasks = tasks[:limit]
+
+        if direction == CursorDirectionEnum.prev:
+            tasks.reverse()
+            has_next, has_previous = last_id is not None, has_more
+        else:
+            has_next, has_previous = has_more, last_id is not None
+
+        next_cursor = None
+        prev_cursor = None
+        if tasks and has_next:
+            next_cursor = TaskService.encode_task_cursor(tasks[-1], CursorDirectionEnum.next, order, sort_by)
+        if tasks and has_previous:
+            prev_cursor = TaskService.encode_task_cursor(tasks[0], CursorDirectionEnum.prev, order, sort_by)
+
+        return {
+            'tasks': tasks,
+            'has_next': has_next,
+            'has_previous': has_previous,
+            'next_cursor': next_cursor,
+            'prev_cursor': prev_cursor
+        }
 
     @staticmethod
     def get_task_by_id(db: Session, task_id: int):
         return db.query(Task).filter(Task.id == task_id).first()
 
+    @staticmethod
+    def get_cached_task(db: Session, task_id: int) -> Optional[TaskResponseSchema]:
+        """
+        Get a task through the read-through task cache
+        """
+        def load_task():
+            task = TaskService.get_task_by_id(db, task_id)
+            return TaskResponseSchema.model_validate(task).model_dump(mode="json") if task else None
+
+        cached_task = task_cache.get_or_load(task_id, load_task)
+
+        return TaskResponseSchema.model_validate(cached_task) if cached_task else None
+
+
+    @staticmethod
+    def stamp_changes(db: Session, task_ids: List[int], change_seq: int):
+        """
+        Record the change sequence of tasks written with a bulk statement,
+        leaving their updated_at as it is
+        """
+        db.query(Task).filter(Task.id.in_(task_ids)).update(
+            {Task.change_seq: change_seq, Task.updated_at: Task.updated_at},
+            synchronize_session=False
+        )
+
+    @staticmethod
+    def encode_sync_token(change_seq: int, task_id: int, purged_change_seq: int = 0) -> str:
+        return encode_cursor({"seq": change_seq, "id": task_id, "purged": purged_change_seq})
+
+    @staticmethod
+    def get_changes(db: Session, since: Optional[str] = None, limit: int = 100):
+        """
+        Get the tasks changed after a sync token, in change order
+
+        Every write stamps the tasks it touches with the write version it got
+        from the counters (see `CounterService.apply`), which is allocated in
+        commit order, so seeking on (change_seq, id) never skips a change and
+        reads only the changed tasks. Soft-deleted tasks come back as tombstones,
+        except on a first sync (no token) where only live tasks are returned.
+        Tokens carry the purge watermark they were issued under: once a later
+        purge hard-deletes tombstones past a token, the token is expired and
+        its client must start over with a full sync.
+
+        Args:
+            db (Session): Database session
+            since (Optional[str]): Token returned by the previous sync, None for a full sync
+            limit (int): Maximum number of tasks to return
+
+        Returns:
+            dict: changed tasks as rows with `is_deleted`, the token to continue
+            from and whether more changes are waiting
+
+        Raises:
+            InvalidCursorError: if the token is malformed or expired
+        """
+        purged_change_seq = CounterService.get_purged_change_seq(db)
+
+        last_seq, last_id = 0, 0
+        if since:
+            try:
+                payload = decode_cursor(since)
+                last_seq, last_id = int(payload["seq"]), int(payload["id"])
+                token_purged_change_seq = int(payload.get("purged", 0))
+            except (KeyError, ValueError, TypeError) as e:
+                raise InvalidCursorError("Malformed sync token") from e
+
+            # tombstones purged since the token was issued may not have been seen
+            if token_purged_change_seq < purged_change_seq and last_seq <= purged_change_seq:
+                raise InvalidCursorError("Sync token expired, deleted tasks were purged since, sync again without a token")
+
+        query = db.query(*TaskService.task_columns(), Task.is_deleted, Task.change_seq).filter(
+            or_(Task.change_seq > last_seq, and_(Task.change_seq == last_seq, Task.id > last_id))
+        )
+        if not since:
+            query = query.filter(Task.is_deleted == False)
+
+        tasks = query.order_by(Task.change_seq.asc(), Task.id.asc()).limit(limit + 1).all()
+        has_more = len(tasks) > limit
+        tasks = tasks[:limit]
+
+        if tasks:
+            last_seq, last_id = tasks[-1].change_seq, tasks[-1].id
+
+        return {
+            'tasks': tasks,
+            'next_token': TaskService.encode_sync_token(last_seq, last_id, purged_change_seq),
+            'has_more': has_more
+        }
 
     @staticmethod
     def create_task(db: Session, task: TaskCreate) -> Task:
 
-        # create the new task and add it to the database
-        db_task = Task(title=task.title, description=task.description, status=task.status)
+        # update the counters first, so the task is inserted with its change sequence
+        is_completed = task.status == TaskStatusEnum.completed
+        change_seq = CounterService.apply(db, total=1, completed=int(is_completed), before_write=True)
+
+        # create the new task and flush it to get its id
+        db_task = Task(title=task.title, description=task.description, status=task.status, change_seq=change_seq)
         db.add(db_task)
+        db.flush()
+
+        # log the action in the same transaction
+        StatisticsService.log_action(db, db_task.id, TaskActionEnum.created, completed=is_completed)
+        TaskService.invalidate_caches_on_commit(db)
+
         db.commit()
         db.refresh(db_task)
 
-        # update the statistics
-        StatisticsService.log_action(db, db_task.id, TaskActionEnum.created)
+        TaskService.publish_changes(TaskActionEnum.created, [db_task.id], change_seq, db_task)
 
         return db_task
 
 
+    @staticmethod
+    def bulk_create_tasks(db: Session, tasks: List[TaskCreate]) -> List[int]:
+        """
+        Create many tasks in a single transaction
+
+        Tasks are inserted BULK_CHUNK_SIZE at a time with one multi-row insert,
+        and their `created` actions with one multi-row insert per chunk. MySQL
+        has no RETURNING and does not guarantee consecutive ids, so the ids are
+        read back by the change sequence of the chunk (an index range), which
+        no other write can share while the counters row is locked. The ids of
+        a statement increase in row order.
+
+        Args:
+            db (Session): Database session
+            tasks (List[TaskCreate]): Tasks to create
+
+        Returns:
+            List[int]: IDs of the created tasks, in the order of `tasks`
+        """
+        created_task_ids: list[int] = []
+
+        for chunk in chunked(tasks, settings.BULK_CHUNK_SIZE):
+            # update the counters first, so the tasks are inserted with their change sequence
+            completed = sum(1 for task in chunk if task.status == TaskStatusEnum.completed)
+            change_seq = CounterService.apply(db, total=len(chunk), completed=completed, before_write=True)
+
+            rows = [
+                {
+                    'title': task.title,
+                    'description': task.description,
+                    'status': task.status,
+                    'is_deleted': False,
+                    'change_seq': change_seq
+                }
+                for task in chunk
+            ]
+
+            db.execute(insert(Task).values(rows))
+            chunk_ids = list(db.scalars(
+                select(Task.id).where(Task.change_seq == change_seq).order_by(Task.id)
+            ))
+
+            # Log creation actions
+            StatisticsService.log_actions(db, chunk_ids, TaskActionEnum.created, completed=completed)
+
+            created_task_ids.extend(chunk_ids)
+
+        if created_task_ids:
+            TaskService.invalidate_caches_on_commit(db)
+            db.commit()
+
+            TaskService.publish_changes(TaskActionEnum.created, created_task_ids, change_seq)
+
+        return created_task_ids
+
+
     @staticmethod
     def update_task(db: Session, task_id: int, updated_task: TaskUpdate) -> Optional[Task]:
-        # find existing Task
-        db_task = db.query(Task).filter(Task.id == task_id).first()
+        # find and lock the existing Task, every writer locks the tasks before the counters row
+        db_task = db.query(Task).filter(Task.id == task_id).with_for_update().first()
 
         # if the task does not exist or is softly deleted, return None
         if not db_task or db_task.is_deleted:
             return None
 
+        was_completed = db_task.status == TaskStatusEnum.completed
+
         # update the task
         for key, value in updated_task.model_dump(exclude_unset=True).items():
             setattr(db_task, key, value)
 
-        # update the statistics
-        StatisticsService.log_action(db, db_task.id, TaskActionEnum.modified)
+        is_completed = db_task.status == TaskStatusEnum.completed and not db_task.is_deleted
+
+        # update the statistics and counters in the same transaction
+        StatisticsService.log_action(db, db_task.id, TaskActionEnum.modified, completed=is_completed and not was_completed)
+        db_task.change_seq = CounterService.apply(
+            db,
+            total=-int(db_task.is_deleted),
+            completed=int(is_completed) - int(was_completed),
+            modified=1
+        )
+        TaskService.invalidate_caches_on_commit(db, [db_task.id])
 
         db.commit()
         db.refresh(db_task)
 
+        TaskService.publish_changes(TaskActionEnum.modified, [db_task.id], db_task.change_seq, db_task)
+
         return db_task
 
 
     @staticmethod
     def delete_task(db: Session, task_id: int) -> bool:
-        # Soft delete the task
-        db_task = db.query(Task).filter(Task.id == task_id).first()
+        # Soft delete the task, locked before the counters row like in every writer
+        db_task = db.query(Task).filter(Task.id == task_id).with_for_update().first()
 
         if not db_task or db_task.is_deleted:
             return False
 
         db_task.is_deleted = True
 
-        # Update task statistics
+        # Update task statistics and counters in the same transaction
         StatisticsService.log_action(db, db_task.id, TaskActionEnum.deleted)
+        change_seq = CounterService.apply(
+            db,
+            total=-1,
+            completed=-int(db_task.status == TaskStatusEnum.completed),
+            deleted=1
+        )
+        db_task.change_seq = change_seq
+        TaskService.invalidate_caches_on_commit(db, [db_task.id])
 
         db.commit()
 
+        TaskService.publish_changes(TaskActionEnum.deleted, [task_id], change_seq)
+
         return True
 
     @staticmethod
@@ -95,28 +604,46 @@ class TaskService:
             List[int]: List of successfully deleted task IDs
         """
 
-        # Find existing, non-deleted tasks
-        existing_tasks = db.query(Task).filter(
-            Task.id.in_(task_ids),
-            Task.is_deleted == False
-        ).all()
-
         # Track successfully deleted task IDs
         deleted_task_ids: list[int] = []
 
-        # Soft delete tasks and log statistics for each
-        for task in existing_tasks:
-            task.is_deleted = True
+        # One select, one update and one multi-row insert per chunk, all in a single transaction
+        for chunk in chunked(unique(task_ids), settings.BULK_CHUNK_SIZE):
+            # Find and lock existing, non-deleted tasks
+            chunk_tasks = db.query(Task.id, Task.status).filter(
+                Task.id.in_(chunk),
+                Task.is_deleted == False
+            ).order_by(Task.id).with_for_update().all()
+
+            if not chunk_tasks:
+                continue
+
+            chunk_ids = [task.id for task in chunk_tasks]
+
+            db.query(Task).filter(Task.id.in_(chunk_ids)).update(
+                {Task.is_deleted: True},
+                synchronize_session=False
+            )
 
-            # Log deletion action
-            StatisticsService.log_action(db, task.id, TaskActionEnum.deleted)
+            # Log deletion actions and update the counters
+            StatisticsService.log_actions(db, chunk_ids, TaskActionEnum.deleted)
+            change_seq = CounterService.apply(
+                db,
+                total=-len(chunk_ids),
+                completed=-sum(1 for task in chunk_tasks if task.status == TaskStatusEnum.completed),
+                deleted=len(chunk_ids)
+            )
+            TaskService.stamp_changes(db, chunk_ids, change_seq)
 
-            deleted_task_ids.append(task.id)
+            deleted_task_ids.extend(chunk_ids)
 
         # Commit changes if we have any deletions
         if deleted_task_ids:
+            TaskService.invalidate_caches_on_commit(db, deleted_task_ids)
             db.commit()
 
+            TaskService.publish_changes(TaskActionEnum.deleted, deleted_task_ids, change_seq)
+
         return deleted_task_ids
 
     @staticmethod
@@ -131,27 +658,39 @@ class TaskService:
         Returns:
             List[int]: List of successfully completed task IDs
         """
-        # Find existing, non-deleted tasks that are not already completed
-        existing_tasks = db.query(Task).filter(
-            Task.id.in_(task_ids),
-            Task.is_deleted == False,
-            Task.status != TaskStatusEnum.completed
-        ).all()
 
         # Track successfully completed task IDs
         completed_task_ids: list[int] = []
 
-        # Mark tasks as complete and log statistics for each
-        for task in existing_tasks:
-            task.status = TaskStatusEnum.completed
+        # One select, one update and one multi-row insert per chunk, all in a single transaction
+        for chunk in chunked(unique(task_ids), settings.BULK_CHUNK_SIZE):
+            # Find and lock existing, non-deleted tasks that are not already completed
+            chunk_ids = [task_id for (task_id,) in db.query(Task.id).filter(
+                Task.id.in_(chunk),
+                Task.is_deleted == False,
+                Task.status != TaskStatusEnum.completed
+            ).order_by(Task.id).with_for_update().all()]
+
+            if not chunk_ids:
+                continue
 
-            # Log modification action
-            StatisticsService.log_action(db, task.id, TaskActionEnum.modified)
+            db.query(Task).filter(Task.id.in_(chunk_ids)).update(
+                {Task.status: TaskStatusEnum.completed},
+                synchronize_session=False
+            )
 
-            completed_task_ids.append(task.id)
+            # Log modification actions and update the counters
+            StatisticsService.log_actions(db, chunk_ids, TaskActionEnum.modified, completed=len(chunk_ids))
+            change_seq = CounterService.apply(db, completed=len(chunk_ids), modified=len(chunk_ids))
+            TaskService.stamp_changes(db, chunk_ids, change_seq)
+
+            completed_task_ids.extend(chunk_ids)
 
         # Commit changes if we have any completions
         if completed_task_ids:
+            TaskService.invalidate_caches_on_commit(db, completed_task_ids)
             db.commit()
 
+            TaskService.publish_changes(TaskActionEnum.modified, completed_task_ids, change_seq)
+
         return completed_task_ids
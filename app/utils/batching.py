@@ -0,0 +1,25 @@
+from typing import Iterable, Iterator, List, TypeVar
+
+T = TypeVar('T')
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """
+    Split items into lists of at most `size` elements
+    """
+    chunk: List[T] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def unique(items: Iterable[T]) -> List[T]:
+    """
+    Drop duplicates while keeping the original order
+    """
+    return list(dict.fromkeys(items))
@@ -0,0 +1,42 @@
+import base64
+import json
+from enum import Enum
+from typing import Any, Dict
+
+
+class CursorDirectionEnum(str, Enum):
+    next = "next"
+    prev = "prev"
+
+
+class InvalidCursorError(ValueError):
+    """
+    Raised when a pagination cursor cannot be decoded
+    """
+
+
+def encode_cursor(payload: Dict[str, Any]) -> str:
+    """
+    Encode a keyset position into an opaque, URL-safe cursor string
+    """
+    raw = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    Decode a cursor produced by `encode_cursor`
+
+    Raises:
+        InvalidCursorError: if the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError("Malformed pagination cursor") from e
+
+    if not isinstance(payload, dict):
+        raise InvalidCursorError("Malformed pagination cursor")
+
+    return payload
@@ -0,0 +1,29 @@
+from typing import Iterable, List, Optional
+
+
+class InvalidFieldsError(ValueError):
+    """
+    Raised when a sparse fieldset names unknown fields
+    """
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[List[str]]:
+    """
+    Parse a comma separated sparse fieldset, e.g. "id,title,status"
+
+    The fields are returned in the order of `allowed`, without duplicates.
+    None or an empty string means every field.
+
+    Raises:
+        InvalidFieldsError: if a field is not in `allowed`
+    """
+    if not fields:
+        return None
+
+    allowed = list(allowed)
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise InvalidFieldsError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    return [field for field in allowed if field in requested] or None
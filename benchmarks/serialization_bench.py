@@ -0,0 +1,82 @@
+"""
+Compare the standard response path with the fast (orjson) one for a page of tasks.
+
+standard: TaskResponseSchema.model_validate per row, APIResponse envelope,
+          then FastAPI's response_model validation and JSON encoding
+fast:     create_success_response(fast=True), rows read straight into orjson
+
+Usage: python -m benchmarks.serialization_bench [--rows 100] [--repeat 2000]
+"""
+import argparse
+import asyncio
+import timeit
+from datetime import datetime, timezone
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.models.task_model import Task, TaskStatusEnum
+from app.schemas.reponse_schemas import APIResponse, PaginationMetadata, TaskResponseSchema, create_success_response
+
+
+def make_tasks(count: int) -> List[Task]:
+    now = datetime.now(timezone.utc)
+    return [
+        Task(
+            id=i,
+            title=f"Task {i}",
+            description="Some description " * 10,
+            status=TaskStatusEnum.completed if i % 3 == 0 else TaskStatusEnum.pending,
+            created_at=now,
+            updated_at=now if i % 2 else None,
+            is_deleted=False,
+        )
+        for i in range(count)
+    ]
+
+
+def make_pagination(count: int) -> PaginationMetadata:
+    return PaginationMetadata(
+        total_items=count * 10,
+        total_pages=10,
+        current_page=1,
+        page_size=count,
+        has_next=True,
+        has_previous=False,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    tasks = make_tasks(args.rows)
+    pagination = make_pagination(args.rows)
+    response_field = create_model_field(name="Response", type_=APIResponse[List[TaskResponseSchema]], mode="serialization")
+    loop = asyncio.new_event_loop()
+
+    def standard() -> bytes:
+        content = create_success_response(data=tasks, pagination=pagination, schema=TaskResponseSchema, fast=False)
+        serialized = loop.run_until_complete(serialize_response(field=response_field, response_content=content))
+        return JSONResponse(content=serialized).body
+
+    def fast() -> bytes:
+        return create_success_response(data=tasks, pagination=pagination, schema=TaskResponseSchema, fast=True).body
+
+    print(f"{args.rows} rows per response, {args.repeat} responses")
+    results = {}
+    for name, func in (("standard", standard), ("fast", fast)):
+        func()
+        elapsed = min(timeit.repeat(func, number=args.repeat, repeat=3))
+        results[name] = elapsed / args.repeat * 1e6
+        print(f"{name:>9}: {results[name]:9.1f} us/response  ({len(func())} bytes)")
+
+    print(f"  speedup: {results['standard'] / results['fast']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Scripted workloads of the load benchmark.
+
+A workload turns a random generator and the shape of the seeded database into
+the next request to send. Requests are labelled with the endpoint they hit,
+which is the unit the results are reported by.
+"""
+import random
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional
+
+from app.utils.cursor import encode_cursor
+from benchmarks.seed_data import Dataset
+
+API = "/api/v1"
+
+
+@dataclass
+class BenchRequest:
+    endpoint: str
+    method: str
+    path: str
+    json: Optional[Any] = None
+
+
+@dataclass
+class Workload:
+    name: str
+    description: str
+    next_request: Callable[[random.Random, Dataset], BenchRequest]
+    requests: int
+    writes: bool = False
+
+
+def _random_task_id(rng: random.Random, dataset: Dataset) -> int:
+    return rng.randint(1, max(dataset.max_task_id, 1))
+
+
+def deep_pages(rng: random.Random, dataset: Dataset) -> BenchRequest:
+    """
+    Pages from the second half of the list, alternately with OFFSET and with a keyset cursor
+    """
+    limit = 20
+    pages = max(dataset.task_count // limit, 1)
+    page = rng.randint(max(pages // 2, 1), pages)
+
+    if rng.random() < 0.5:
+        return BenchRequest("GET /tasks/ (page)", "GET", f"{API}/tasks/?page={page}&limit={limit}")
+
+    cursor = encode_cursor({"id": dataset.max_task_id - page * limit, "dir": "next", "order": "desc"})
+    return BenchRequest("GET /tasks/ (cursor)", "GET", f"{API}/tasks/?cursor={cursor}&limit={limit}&include_total=false")
+
+
+def get_by_id(rng: random.Random, dataset: Dataset) -> BenchRequest:
+    """
+    Single task reads, 80% of them on the 1% most recent tasks
+    """
+    if rng.random() < 0.8:
+        hot = max(dataset.max_task_id // 100, 1)
+        task_id = dataset.max_task_id - rng.randint(0, hot - 1)
+    else:
+        task_id = _random_task_id(rng, dataset)
+
+    return BenchRequest("GET /tasks/{task_id}", "GET", f"{API}/tasks/{task_id}")
+
+
+def bulk_complete(rng: random.Random, dataset: Dataset) -> BenchRequest:
+    """
+    Complete 1000 random tasks at once, already completed or deleted ones are skipped by the service
+    """
+    task_ids = rng.sample(range(1, dataset.max_task_id + 1), min(1000, dataset.max_task_id))
+    return BenchRequest("PATCH /tasks/bulk-complete", "PATCH", f"{API}/tasks/bulk-complete", {"task_ids": task_ids})
+
+
+def statistics_polling(rng: random.Random, dataset: Dataset) -> BenchRequest:
+    """
+    What a dashboard polls: the counters and the first page of the actions feed
+    """
+    if rng.random() < 0.5:
+        return BenchRequest("GET /statistics", "GET", f"{API}/statistics")
+    return BenchRequest("GET /statistics/actions", "GET", f"{API}/statistics/actions?page=1&limit=20")
+
+
+def task_history(rng: random.Random, dataset: Dataset) -> BenchRequest:
+    """
+    First page of the action history of random tasks
+    """
+    return BenchRequest("GET /tasks/{task_id}/history", "GET", f"{API}/tasks/{_random_task_id(rng, dataset)}/history")
+
+
+def mixed(rng: random.Random, dataset: Dataset) -> BenchRequest:
+    """
+    80% reads (single tasks, first pages, statistics) and 20% writes (create, update, delete)
+    """
+    roll = rng.random()
+    if roll < 0.5:
+        return get_by_id(rng, dataset)
+    if roll < 0.7:
+        return BenchRequest("GET /tasks/", "GET", f"{API}/tasks/?page=1&limit=20")
+    if roll < 0.8:
+        return BenchRequest("GET /statistics", "GET", f"{API}/statistics")
+    if roll < 0.9:
+        return BenchRequest("POST /tasks/", "POST", f"{API}/tasks/", {"title": f"Bench task {rng.random():.6f}", "description": "created by the benchmark"})
+    if roll < 0.97:
+        task_id = _random_task_id(rng, dataset)
+        return BenchRequest("PUT /tasks/{task_id}", "PUT", f"{API}/tasks/{task_id}", {"status": rng.choice(["pending", "completed"])})
+
+    return BenchRequest("DELETE /tasks/{task_id}", "DELETE", f"{API}/tasks/{_random_task_id(rng, dataset)}")
+
+
+WORKLOADS: List[Workload] = [
+    Workload("deep_pages", deep_pages.__doc__.strip(), deep_pages, requests=500),
+    Workload("get_by_id", get_by_id.__doc__.strip(), get_by_id, requests=2000),
+    Workload("task_history", task_history.__doc__.strip(), task_history, requests=2000),
+    Workload("statistics_polling", statistics_polling.__doc__.strip(), statistics_polling, requests=2000),
+    Workload("bulk_complete", bulk_complete.__doc__.strip(), bulk_complete, requests=50, writes=True),
+    Workload("mixed", mixed.__doc__.strip(), mixed, requests=2000, writes=True),
+]
@@ -0,0 +1,51 @@
+import os
+import tempfile
+
+# the settings are read on import, point the application at a scratch SQLite database first
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'tests.sqlite')}"
+os.environ["APP_DB_MODE"] = "sync"
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.cache.count_cache import count_cache
+from app.cache.single_flight import single_flight
+from app.cache.task_cache import task_cache
+from app.database.base import Base
+from app.database.session import SessionLocal, engine
+# the models register their tables on Base.metadata when imported
+from app.models.task_action_rollup_model import TaskActionRollup
+from app.models.task_archive_model import TaskArchive
+from app.models.task_counter_model import TaskCounter
+from app.models.task_model import Task
+from app.models.task_statistics_archive_model import TaskStatisticsArchive
+from app.models.task_statistics_model import TaskStatistic
+
+
+@pytest.fixture
+def tables():
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    task_cache.clear()
+    count_cache.invalidate()
+    single_flight.invalidate()
+
+    yield
+
+
+@pytest.fixture
+def db(tables):
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client(tables):
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
@@ -0,0 +1,49 @@
+import threading
+
+from app.database.session import SessionLocal
+from app.models.task_statistics_model import TaskActionEnum, TaskStatistic
+from app.services.audit_buffer import AuditBuffer
+
+
+class UnavailableDatabase:
+    def execute(self, *args, **kwargs):
+        raise RuntimeError("database unavailable")
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_buffer_drops_the_oldest_entries_while_flushes_fail(tables):
+    buffer = AuditBuffer(UnavailableDatabase, max_size=10, max_age=60, max_pending=25)
+
+    for task_id in range(1, 41):
+        buffer.add([task_id], TaskActionEnum.modified)
+
+    assert len(buffer._entries) == 25
+    assert buffer._entries[0]['task_id'] == 16
+
+
+def test_writers_do_not_flush_when_the_thread_runs(tables):
+    flushed_on = []
+    buffer = AuditBuffer(SessionLocal, max_size=10, max_age=60)
+    flush = buffer.flush
+
+    def tracked_flush():
+        flushed_on.append(threading.current_thread())
+        return flush()
+
+    buffer.flush = tracked_flush
+    buffer.start()
+    for task_id in range(1, 21):
+        buffer.add([task_id], TaskActionEnum.created)
+    buffer.stop()
+
+    assert threading.current_thread() not in flushed_on[:-1]
+    db = SessionLocal()
+    try:
+        assert db.query(TaskStatistic).count() == 20
+    finally:
+        db.close()
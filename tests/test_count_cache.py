@@ -0,0 +1,29 @@
+from app.cache.count_cache import CountCache
+
+
+def test_count_is_cached_until_invalidated():
+    cache = CountCache(ttl=60)
+
+    assert cache.get_or_load("tasks", lambda: 1) == 1
+    assert cache.get_or_load("tasks", lambda: 2) == 1
+
+    cache.invalidate()
+    assert cache.get_or_load("tasks", lambda: 3) == 3
+
+
+def test_count_loaded_during_an_invalidation_is_not_stored():
+    cache = CountCache(ttl=60)
+
+    def load():
+        cache.invalidate()
+        return 1
+
+    assert cache.get_or_load("tasks", load) == 1
+    assert cache.get_or_load("tasks", lambda: 2) == 2
+
+
+def test_disabled_count_cache_always_loads():
+    cache = CountCache(ttl=0)
+
+    assert cache.get_or_load("tasks", lambda: 1) == 1
+    assert cache.get_or_load("tasks", lambda: 2) == 2
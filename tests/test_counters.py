@@ -0,0 +1,48 @@
+from app.models.task_counter_model import TaskCounter
+from app.schemas.task_schema import TaskCreate, TaskUpdate
+from app.services.counter_service import SUMMARY_ROW_ID, CounterService
+from app.services.task_service import TaskService
+
+
+def create_tasks(db, count: int):
+    return TaskService.bulk_create_tasks(db, [TaskCreate(title=f"Task {i}") for i in range(count)])
+
+
+def test_counters_follow_the_writes(db):
+    task_ids = create_tasks(db, 5)
+    TaskService.create_task(db, TaskCreate(title="Single task"))
+    TaskService.update_task(db, task_ids[0], TaskUpdate(title="Renamed"))
+    TaskService.delete_task(db, task_ids[1])
+    TaskService.bulk_complete_tasks(db, task_ids=task_ids[2:4])
+    TaskService.bulk_delete_tasks(db, task_ids[3:])
+
+    counters = CounterService.get(db)
+    assert counters == CounterService.count_base_tables(db)
+    assert counters.total_tasks == 3
+    assert counters.deleted_tasks == 3
+
+
+def test_deleted_task_is_not_counted_twice(db):
+    task_id = TaskService.create_task(db, TaskCreate(title="Task")).id
+
+    assert TaskService.delete_task(db, task_id)
+    assert not TaskService.delete_task(db, task_id)
+    assert TaskService.bulk_delete_tasks(db, [task_id]) == []
+
+    assert CounterService.get(db).deleted_tasks == 1
+
+
+def test_reconcile_repairs_drifted_counters(db):
+    create_tasks(db, 3)
+    counter = db.get(TaskCounter, SUMMARY_ROW_ID)
+    counter.total_tasks = 42
+    counter.deleted_tasks = -1
+    version = counter.version
+    db.commit()
+
+    reconciled = CounterService.reconcile(db)
+
+    assert reconciled.total_tasks == 3
+    assert reconciled.deleted_tasks == 0
+    assert reconciled.version == version + 1
+    assert CounterService.get(db) == CounterService.count_base_tables(db)
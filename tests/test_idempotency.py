@@ -0,0 +1,123 @@
+import asyncio
+import uuid
+
+import pytest
+
+from app.cache.backends import LRUCacheBackend
+from app.cache.idempotency_store import IdempotencyKeyConflictError, IdempotencyKeyInProgressError, IdempotencyStore
+from app.routes.idempotency import IDEMPOTENCY_HEADER, REPLAYED_HEADER
+from app.services.task_service import TaskService
+
+API = "/api/v1"
+
+
+@pytest.fixture
+def key():
+    return str(uuid.uuid4())
+
+
+def ndjson(count: int):
+    for i in range(count):
+        yield f'{{"title": "Task {i}"}}\n'.encode()
+
+
+def test_retry_is_replayed(client, key):
+    first = client.post(f"{API}/tasks/", json={"title": "Write the report"}, headers={IDEMPOTENCY_HEADER: key})
+    retry = client.post(f"{API}/tasks/", json={"title": "Write the report"}, headers={IDEMPOTENCY_HEADER: key})
+
+    assert retry.headers[REPLAYED_HEADER] == "true"
+    assert retry.content == first.content
+    assert client.get(f"{API}/statistics").json()['data']['total_tasks'] == 1
+
+
+def test_streamed_bulk_create_is_replayed(client, key):
+    headers = {IDEMPOTENCY_HEADER: key, "Content-Type": "application/x-ndjson"}
+
+    first = client.post(f"{API}/tasks/bulk", content=ndjson(3), headers=headers)
+    retry = client.post(f"{API}/tasks/bulk", content=ndjson(3), headers=headers)
+
+    assert first.json()['data']['created_ids'] == [1, 2, 3]
+    assert retry.headers[REPLAYED_HEADER] == "true"
+    assert retry.content == first.content
+
+
+def test_key_reused_with_another_body_is_rejected(client, key):
+    client.post(f"{API}/tasks/", json={"title": "a"}, headers={IDEMPOTENCY_HEADER: key})
+    response = client.post(f"{API}/tasks/", json={"title": "b"}, headers={IDEMPOTENCY_HEADER: key})
+
+    assert response.status_code == 422
+    assert client.get(f"{API}/statistics").json()['data']['total_tasks'] == 1
+
+
+def test_key_reused_on_another_route_is_rejected(client, key):
+    client.post(f"{API}/tasks/", json={"title": "a"}, headers={IDEMPOTENCY_HEADER: key})
+    response = client.put(f"{API}/tasks/1", json={"title": "a"}, headers={IDEMPOTENCY_HEADER: key})
+
+    assert response.status_code == 422
+
+
+def test_failed_execution_is_not_replayed(client, key, monkeypatch):
+    create_task = TaskService.create_task
+
+    def failing_create_task(db, task):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(TaskService, "create_task", staticmethod(failing_create_task))
+    failed = client.post(f"{API}/tasks/", json={"title": "a"}, headers={IDEMPOTENCY_HEADER: key})
+    monkeypatch.setattr(TaskService, "create_task", staticmethod(create_task))
+    retry = client.post(f"{API}/tasks/", json={"title": "a"}, headers={IDEMPOTENCY_HEADER: key})
+
+    assert failed.json()['error']['code'] == "internal_server_error"
+    assert REPLAYED_HEADER.lower() not in retry.headers
+    assert retry.json()['data']['title'] == "a"
+
+
+def test_duplicate_in_flight_waits_for_the_response():
+    store = IdempotencyStore(LRUCacheBackend())
+
+    async def scenario():
+        assert await store.begin("key", "fingerprint", timeout=5) is None
+        duplicate = asyncio.create_task(store.begin("key", "fingerprint", timeout=5))
+        await asyncio.sleep(0)
+
+        store.finish("key", {'fingerprint': "fingerprint", 'status': 200})
+        return await duplicate
+
+    assert asyncio.run(scenario()) == {'fingerprint': "fingerprint", 'status': 200}
+
+
+def test_duplicate_in_flight_executes_when_the_first_request_fails():
+    store = IdempotencyStore(LRUCacheBackend())
+
+    async def scenario():
+        await store.begin("key", "fingerprint", timeout=5)
+        duplicate = asyncio.create_task(store.begin("key", "fingerprint", timeout=5))
+        await asyncio.sleep(0)
+
+        store.finish("key", None)
+        return await duplicate
+
+    assert asyncio.run(scenario()) is None
+    assert store.is_in_flight("key")
+
+
+def test_duplicate_in_flight_times_out():
+    store = IdempotencyStore(LRUCacheBackend())
+
+    async def scenario():
+        await store.begin("key", "fingerprint", timeout=5)
+        await store.begin("key", "fingerprint", timeout=0.01)
+
+    with pytest.raises(IdempotencyKeyInProgressError):
+        asyncio.run(scenario())
+
+
+def test_different_request_in_flight_is_rejected():
+    store = IdempotencyStore(LRUCacheBackend())
+
+    async def scenario():
+        await store.begin("key", "fingerprint", timeout=5)
+        await store.begin("key", "other fingerprint", timeout=5)
+
+    with pytest.raises(IdempotencyKeyConflictError):
+        asyncio.run(scenario())
@@ -0,0 +1,170 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.cache.single_flight import SingleFlight
+
+KEY = ("test", 1)
+
+
+class ObservedSingleFlight(SingleFlight):
+    """
+    Single flight counting the callers that joined, so the tests know when
+    a follower waits on the flight of the leader
+    """
+
+    def __init__(self):
+        super().__init__(enabled=True)
+        self.joins = 0
+        self.joined = threading.Condition()
+
+    def _join(self, key, lead_only=False):
+        result = super()._join(key, lead_only)
+        with self.joined:
+            self.joins += 1
+            self.joined.notify_all()
+        return result
+
+    def wait_for_joins(self, count: int):
+        with self.joined:
+            assert self.joined.wait_for(lambda: self.joins >= count, timeout=5)
+
+
+class Interrupted(BaseException):
+    pass
+
+
+def run_in_thread(target):
+    outcome = {}
+
+    def run():
+        try:
+            outcome['result'] = target()
+        except BaseException as e:
+            outcome['error'] = e
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread, outcome
+
+
+def test_concurrent_callers_share_one_load():
+    flight = ObservedSingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def load():
+        calls.append(1)
+        release.wait(5)
+        return "result"
+
+    leader, leader_outcome = run_in_thread(lambda: flight.do(KEY, load))
+    flight.wait_for_joins(1)
+    follower, follower_outcome = run_in_thread(lambda: flight.do(KEY, load))
+    flight.wait_for_joins(2)
+
+    release.set()
+    leader.join()
+    follower.join()
+
+    assert leader_outcome == {'result': "result"}
+    assert follower_outcome == {'result': "result"}
+    assert len(calls) == 1
+
+
+def test_exception_is_shared_with_the_followers():
+    flight = ObservedSingleFlight()
+    release = threading.Event()
+
+    def load():
+        release.wait(5)
+        raise ValueError("load failed")
+
+    leader, leader_outcome = run_in_thread(lambda: flight.do(KEY, load))
+    flight.wait_for_joins(1)
+    follower, follower_outcome = run_in_thread(lambda: flight.do(KEY, lambda: "not executed"))
+    flight.wait_for_joins(2)
+
+    release.set()
+    leader.join()
+    follower.join()
+
+    assert isinstance(leader_outcome['error'], ValueError)
+    assert isinstance(follower_outcome['error'], ValueError)
+
+
+def test_caller_after_invalidate_does_not_join_older_flight():
+    flight = ObservedSingleFlight()
+    release = threading.Event()
+
+    leader, leader_outcome = run_in_thread(lambda: flight.do(KEY, lambda: release.wait(5) and "stale"))
+    flight.wait_for_joins(1)
+
+    flight.invalidate()
+    assert flight.do(KEY, lambda: "fresh") == "fresh"
+
+    release.set()
+    leader.join()
+    assert leader_outcome == {'result': "stale"}
+
+
+def test_interrupted_leader_hands_the_load_over_to_a_follower():
+    flight = ObservedSingleFlight()
+    release = threading.Event()
+
+    def interrupted_load():
+        release.wait(5)
+        raise Interrupted()
+
+    leader, leader_outcome = run_in_thread(lambda: flight.do(KEY, interrupted_load))
+    flight.wait_for_joins(1)
+    follower, follower_outcome = run_in_thread(lambda: flight.do(KEY, lambda: "follower"))
+    flight.wait_for_joins(2)
+
+    release.set()
+    leader.join()
+    follower.join()
+
+    assert isinstance(leader_outcome['error'], Interrupted)
+    assert follower_outcome == {'result': "follower"}
+
+
+def test_cancelled_async_leader_hands_the_load_over_to_a_follower():
+    flight = ObservedSingleFlight()
+
+    async def scenario():
+        blocked = asyncio.Event()
+
+        async def leader_load():
+            await blocked.wait()
+            return "leader"
+
+        async def follower_load():
+            return "follower"
+
+        leader = asyncio.create_task(flight.do_async(KEY, leader_load))
+        while flight.joins < 1:
+            await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do_async(KEY, follower_load))
+        while flight.joins < 2:
+            await asyncio.sleep(0)
+
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+        return await asyncio.wait_for(follower, 5)
+
+    assert asyncio.run(scenario()) == "follower"
+    assert flight._flights == {}
+
+
+def test_disabled_single_flight_always_loads():
+    flight = SingleFlight(enabled=False)
+    calls = []
+
+    for _ in range(3):
+        flight.do(KEY, lambda: calls.append(1))
+
+    assert len(calls) == 3
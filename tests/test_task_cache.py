@@ -0,0 +1,82 @@
+import threading
+
+import pytest
+
+from app.cache.backends import FakeRedis, LRUCacheBackend, RedisCacheBackend
+from app.cache.task_cache import TaskCache
+
+
+@pytest.fixture
+def cache():
+    return TaskCache(LRUCacheBackend(max_size=100, ttl=60))
+
+
+def test_value_is_cached_after_a_miss(cache):
+    assert cache.get_or_load(1, lambda: {'title': "a"}) == {'title': "a"}
+    assert cache.get_or_load(1, lambda: {'title': "b"}) == {'title': "a"}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_missing_task_is_not_cached(cache):
+    assert cache.get_or_load(1, lambda: None) is None
+    assert cache.get_or_load(1, lambda: {'title': "a"}) == {'title': "a"}
+
+
+def test_value_loaded_during_an_invalidation_is_not_stored(cache):
+    def load():
+        cache.invalidate([1])
+        return {'title': "old"}
+
+    assert cache.get_or_load(1, load) == {'title': "old"}
+    assert cache.get_or_load(1, lambda: {'title': "new"}) == {'title': "new"}
+
+
+def test_concurrent_loads_overlapping_an_invalidation_are_not_stored(cache):
+    started = [threading.Event(), threading.Event()]
+    release = threading.Event()
+    results = []
+
+    def load_in_thread(started_event):
+        def load():
+            started_event.set()
+            release.wait(5)
+            return {'title': "old"}
+        results.append(cache.get_or_load(1, load))
+
+    threads = [threading.Thread(target=load_in_thread, args=(event,)) for event in started]
+    for thread in threads:
+        thread.start()
+    for event in started:
+        assert event.wait(5)
+
+    cache.invalidate([1])
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == [{'title': "old"}, {'title': "old"}]
+    assert cache.get_or_load(1, lambda: {'title': "new"}) == {'title': "new"}
+
+
+def test_load_tracking_is_released(cache):
+    cache.invalidate(range(10000))
+    cache.get_or_load(1, lambda: {'title': "a"})
+    with pytest.raises(ZeroDivisionError):
+        cache.get_or_load(2, lambda: 1 / 0)
+
+    assert cache._loads == {}
+
+
+def test_stale_load_of_another_worker_is_not_served_from_redis():
+    client = FakeRedis()
+    worker_a = TaskCache(RedisCacheBackend(client))
+    worker_b = TaskCache(RedisCacheBackend(client))
+
+    def load_overlapping_a_write():
+        # the write and its invalidation happen on the other worker
+        worker_b.invalidate([1])
+        return {'title': "old"}
+
+    assert worker_a.get_or_load(1, load_overlapping_a_write) == {'title': "old"}
+    assert worker_b.get_or_load(1, lambda: {'title': "new"}) == {'title': "new"}
+    assert worker_a.get_or_load(1, lambda: {'title': "not loaded"}) == {'title': "new"}